@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from db_create import upgrade_database
+from src.models.configuration_file import export_configuration, import_configuration
+from src.models.database import create_database_engine
+
+
+def export_command(db_session, arguments):
+    """Save a configuration to a file."""
+    data = export_configuration(db_session, arguments.name)
+    with open(arguments.file, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    print(f"Configuration {arguments.name} exported to {arguments.file}")
+
+
+def import_command(db_session, arguments):
+    """Create a configuration from a file."""
+    with open(arguments.file, encoding="utf-8") as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Wrong format: {error}")
+
+    configuration = import_configuration(db_session, data, name=arguments.name)
+    db_session.commit()
+    print(f"Configuration {configuration.name} imported from {arguments.file}")
+
+
+def main():
+    """Import or export configurations without the graphical interface."""
+    parser = argparse.ArgumentParser(description="Import and export sensor configurations.")
+    parser.add_argument("--database", default="configurations.db", help="configurations database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="save a configuration to a JSON file")
+    export_parser.add_argument("name", help="configuration name")
+    export_parser.add_argument("file", help="output file name")
+    export_parser.set_defaults(handler=export_command)
+
+    import_parser = commands.add_parser("import", help="create a configuration from a JSON file")
+    import_parser.add_argument("file", help="input file name")
+    import_parser.add_argument("--name", help="name of the new configuration (default: name in the file)")
+    import_parser.set_defaults(handler=import_command)
+
+    arguments = parser.parse_args()
+
+    if not os.path.isfile(arguments.database):
+        print("Failed to open configurations database!", file=sys.stderr)
+        return 1
+
+    # upgrade databases created by older versions
+    try:
+        upgrade_database(arguments.database)
+    except sqlite3.Error as error:
+        print(f"Failed to upgrade configurations database: {error}", file=sys.stderr)
+        return 1
+
+    db_session = sessionmaker(bind=create_database_engine(arguments.database))()
+    try:
+        arguments.handler(db_session, arguments)
+    except (ValueError, OSError, SQLAlchemyError) as error:
+        db_session.rollback()
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        db_session.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
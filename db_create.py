@@ -1,6 +1,10 @@
 import datetime
+import re
 import sqlite3
 
+# version of the schema created by the current release, kept in PRAGMA user_version
+SCHEMA_VERSION = 6
+
 
 def create_tables(database):
     """Create database tables if they don't exist.
@@ -13,7 +17,8 @@ def create_tables(database):
                                              id integer PRIMARY KEY,
                                              name text NOT NULL UNIQUE,
                                              show_unknown_sensors integer NOT NULL DEFAULT 0,
-                                             active integer NOT NULL DEFAULT 0
+                                             active integer NOT NULL DEFAULT 0,
+                                             scalable_rendering integer NOT NULL DEFAULT 0
                                          );"""
 
     sql_create_sensor_table = """CREATE TABLE IF NOT EXISTS sensor (
@@ -23,7 +28,12 @@ def create_tables(database):
                                       name text NOT NULL,
                                       physical_value text NOT NULL,
                                       physical_unit text NOT NULL,
-                                      FOREIGN KEY (configuration_id) REFERENCES configurations (id) ON DELETE CASCADE
+                                      expression text NULL,
+                                      low_threshold real NULL,
+                                      high_threshold real NULL,
+                                      rate_limit real NULL,
+                                      hysteresis real NULL,
+                                      FOREIGN KEY (configuration_id) REFERENCES configuration (id) ON DELETE CASCADE
                                   );"""
 
     sql_create_tab_table = """CREATE TABLE IF NOT EXISTS tab (
@@ -32,8 +42,8 @@ def create_tables(database):
                                   name text NOT NULL,
                                   grid_width integer NOT NULL DEFAULT 2,
                                   grid_height integer NOT NULL DEFAULT 5,
-                                  FOREIGN KEY (configuration_id) REFERENCES configurations (id) 
-                                                                 ON DELETE CASCADE
+                                  FOREIGN KEY (configuration_id) REFERENCES configuration (id)
+                                                                ON DELETE CASCADE
                               );"""
 
     sql_create_cell_table = """CREATE TABLE IF NOT EXISTS cell (
@@ -44,6 +54,7 @@ def create_tables(database):
                                    rowspan integer NOT NULL DEFAULT 1,
                                    colspan integer NOT NULL DEFAULT 1,
                                    title text NULL,
+                                   display_mode text NOT NULL DEFAULT 'time',
                                    FOREIGN KEY (tab_id) REFERENCES tab (id) ON DELETE CASCADE
                                );"""
 
@@ -58,9 +69,25 @@ def create_tables(database):
     sql_create_address_table = """CREATE TABLE IF NOT EXISTS address (
                                       id integer PRIMARY KEY,
                                       ip_port text NOT NULL UNIQUE,
-                                      use_datetime text NOT NULL
+                                      use_datetime text NOT NULL,
+                                      protocol text NOT NULL DEFAULT 'json',
+                                      compression text NOT NULL DEFAULT 'none',
+                                      active integer NOT NULL DEFAULT 0
                                   );"""
 
+    sql_create_alarm_table = """CREATE TABLE IF NOT EXISTS alarm (
+                                    id integer PRIMARY KEY,
+                                    configuration_id integer NOT NULL,
+                                    sensor text NOT NULL,
+                                    kind text NOT NULL,
+                                    raised integer NOT NULL,
+                                    seconds real NOT NULL,
+                                    value real NOT NULL,
+                                    threshold real NOT NULL,
+                                    log_datetime text NOT NULL,
+                                    FOREIGN KEY (configuration_id) REFERENCES configuration (id) ON DELETE CASCADE
+                                );"""
+
     # execute SQL codes for table creation
     try:
         cursor = database.cursor()
@@ -70,10 +97,153 @@ def create_tables(database):
         cursor.execute(sql_create_cell_table)
         cursor.execute(sql_create_sensor_cell_table)
         cursor.execute(sql_create_address_table)
+        cursor.execute(sql_create_alarm_table)
     except sqlite3.Error:
         raise
 
 
+def upgrade_tables(database):
+    """Upgrade tables created by older versions to the current schema version.
+    :parameter database: Database connection object
+    :return: None
+    throws sqlite3.Error exception
+    """
+    cursor = database.cursor()
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+
+    # tables are rebuilt during the upgrade, so foreign keys
+    # must not be enforced; it cannot be changed inside a transaction
+    database.commit()
+    cursor.execute("PRAGMA foreign_keys")
+    foreign_keys = cursor.fetchone()[0]
+    cursor.execute("PRAGMA foreign_keys = OFF")
+
+    try:
+        cursor.execute("BEGIN")
+        for upgrade_version, upgrade in enumerate(UPGRADES, start=1):
+            if version < upgrade_version:
+                upgrade(cursor)
+                cursor.execute(f"PRAGMA user_version = {upgrade_version}")
+
+        database.commit()
+    except sqlite3.Error:
+        database.rollback()
+        raise
+    finally:
+        cursor.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+
+
+def upgrade_database(filename):
+    """Upgrade tables of a database file to the current schema version.
+    :parameter filename: Database file name
+    :return: None
+    throws sqlite3.Error exception
+    """
+    database = sqlite3.connect(filename)
+    try:
+        upgrade_tables(database)
+    finally:
+        database.close()
+
+
+def _add_columns(cursor):
+    """Add columns missing in tables created by the first release."""
+    # columns added after the first release: (table, column, definition)
+    added_columns = [
+        ("address", "protocol", "text NOT NULL DEFAULT 'json'"),
+        ("address", "active", "integer NOT NULL DEFAULT 0"),
+        ("address", "compression", "text NOT NULL DEFAULT 'none'"),
+    ]
+
+    for table, column, definition in added_columns:
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing_columns = [row[1] for row in cursor.fetchall()]
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _fix_constraints_and_add_indexes(cursor):
+    """Fix foreign keys of sensor and tab tables and add lookup indexes."""
+    # older versions referenced a non-existent table "configurations",
+    # SQLite cannot alter constraints, so the tables are rebuilt
+    for table in ("sensor", "tab"):
+        cursor.execute(f"PRAGMA foreign_key_list({table})")
+        if any(row[2] == "configurations" for row in cursor.fetchall()):
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            sql = cursor.fetchone()[0]
+            sql = re.sub(r"REFERENCES\s+configurations\s*\(", "REFERENCES configuration (", sql)
+            sql = re.sub(r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?\w+", f"CREATE TABLE {table}_new", sql)
+
+            cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_sensor_configuration_short_name "
+                   "ON sensor (configuration_id, short_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_tab_configuration_name ON tab (configuration_id, name)")
+    cursor.execute('CREATE INDEX IF NOT EXISTS ix_cell_tab_position ON cell (tab_id, row, "column")')
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_sensor_cell_cell ON sensor_cell (cell_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_sensor_cell_sensor ON sensor_cell (sensor_id)")
+
+
+def _add_rendering_mode(cursor):
+    """Add rendering mode of configurations."""
+    cursor.execute("PRAGMA table_info(configuration)")
+    if "scalable_rendering" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE configuration ADD COLUMN scalable_rendering integer NOT NULL DEFAULT 0")
+
+
+def _add_sensor_expressions(cursor):
+    """Add expressions of derived sensors."""
+    cursor.execute("PRAGMA table_info(sensor)")
+    if "expression" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE sensor ADD COLUMN expression text NULL")
+
+
+def _add_alarms(cursor):
+    """Add alarm thresholds of sensors and the alarm log."""
+    cursor.execute("PRAGMA table_info(sensor)")
+    existing_columns = [row[1] for row in cursor.fetchall()]
+    for column in ("low_threshold", "high_threshold", "rate_limit", "hysteresis"):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE sensor ADD COLUMN {column} real NULL")
+
+    cursor.execute("""CREATE TABLE IF NOT EXISTS alarm (
+                          id integer PRIMARY KEY,
+                          configuration_id integer NOT NULL,
+                          sensor text NOT NULL,
+                          kind text NOT NULL,
+                          raised integer NOT NULL,
+                          seconds real NOT NULL,
+                          value real NOT NULL,
+                          threshold real NOT NULL,
+                          log_datetime text NOT NULL,
+                          FOREIGN KEY (configuration_id) REFERENCES configuration (id) ON DELETE CASCADE
+                      );""")
+
+
+def _add_display_modes(cursor):
+    """Add display modes of cells."""
+    cursor.execute("PRAGMA table_info(cell)")
+    if "display_mode" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE cell ADD COLUMN display_mode text NOT NULL DEFAULT 'time'")
+
+
+# schema upgrades, the n-th function upgrades the schema from version n - 1 to n
+UPGRADES = [
+    _add_columns,
+    _fix_constraints_and_add_indexes,
+    _add_rendering_mode,
+    _add_sensor_expressions,
+    _add_alarms,
+    _add_display_modes,
+]
+
+
 def insert_default(database):
     """Insert default configuration values if they don't exist.
     :parameter database: Database connection object
@@ -88,8 +258,8 @@ def insert_default(database):
 
     if len(rows) == 0:  # Default configurations doesn't exist
         # insert default configurations and unknown sensor tab for the configurations
-        cursor.execute("""INSERT INTO configuration
-                          VALUES (NULL, 'Default', 1, 1);""")
+        cursor.execute("""INSERT INTO configuration (name, show_unknown_sensors, active)
+                          VALUES ('Default', 1, 1);""")
 
     # check if default address exists
     cursor.execute("SELECT id FROM address WHERE ip_port='127.0.0.1:64363'")
@@ -97,7 +267,8 @@ def insert_default(database):
 
     if len(rows) == 0:  # Default address doesn't exist
         # insert default IP address and port into address table
-        cursor.execute("INSERT INTO address VALUES (NULL, ?, ?)", ('127.0.0.1:64363', datetime.datetime.now()))
+        cursor.execute("INSERT INTO address (ip_port, use_datetime) VALUES (?, ?)",
+                       ('127.0.0.1:64363', datetime.datetime.now()))
 
     database.commit()
 
@@ -120,6 +291,14 @@ def main():
         database.close()  # in case of an error close the connection to the DB
         return  # and stop
 
+    # upgrade tables created by older versions
+    try:
+        upgrade_tables(database)
+    except sqlite3.Error as error:
+        print(error)
+        database.close()  # in case of an error close the connection to the DB
+        return  # and stop
+
     # add default configurations if it doesn't exist
     try:
         insert_default(database)
@@ -1,11 +1,13 @@
 import os
+import sqlite3
 import sys
 
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QApplication, QMessageBox, QMainWindow
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from db_create import upgrade_tables
+from src.models.database import create_database_engine
 from src.widgets.main_window import MainWindow
 
 
@@ -25,9 +27,20 @@ def main():
         return
 
     # connect to the database
-    engine = create_engine('sqlite:///configurations.db')
+    engine = create_database_engine('configurations.db')
     session_cls = sessionmaker(bind=engine)
 
+    # upgrade databases created by older versions
+    database = engine.raw_connection()
+    try:
+        upgrade_tables(database)
+    except sqlite3.Error:
+        QMessageBox.critical(None, "Error", "Critical Error!\nFailed to upgrade configurations database!",
+                             QMessageBox.Ok, QMessageBox.Ok)
+        return
+    finally:
+        database.close()
+
     app.setFont(QFont("Lato", 12, QFont.Normal))
 
     window = MainWindow(session_cls)
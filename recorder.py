@@ -0,0 +1,209 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sqlite3
+
+from sqlalchemy.orm import sessionmaker
+
+from db_create import upgrade_database
+from src.data.backoff import Backoff
+from src.data.protocols import create_decoder
+from src.data.recording import RecordWriter
+from src.data.validation import parse_line, expand_delta, is_delta, full_line
+from src.models.database import create_database_engine
+from src.models.models import Configuration, Address
+
+READ_SIZE = 1 << 16
+STATISTICS_INTERVAL = 60
+
+
+class SourceStatistics:
+    """Counters of a recorded data source."""
+
+    def __init__(self, ip_port):
+        """Create counters for the given source."""
+        self.ip_port = ip_port
+        self.recorded = 0
+        self.invalid = 0
+        self.reconnects = 0
+
+    def __str__(self):
+        """Create a string value of the counters."""
+        return f"{self.ip_port}: {self.recorded} recorded, {self.invalid} invalid, " \
+               f"{self.reconnects} reconnects"
+
+
+def load_sources(database):
+    """Load active configuration name and data source addresses from the database.
+    throws ValueError if there is no active configuration
+    """
+    engine = create_database_engine(database)
+    db_session = sessionmaker(bind=engine)()
+    try:
+        configuration = Configuration.load(db_session)
+        if configuration is None:
+            raise ValueError("There is no active configuration!")
+        addresses = db_session.query(Address).filter(Address.active == True) \
+            .order_by(Address.use_datetime.desc()).all()
+        # use the most recently used address if no sources are selected
+        if not addresses:
+            addresses = db_session.query(Address).order_by(Address.use_datetime.desc()).limit(1).all()
+
+        return configuration.name, [(address.ip_port, address.protocol, address.compression)
+                                    for address in addresses]
+    finally:
+        db_session.close()
+
+
+async def record_source(ip_port, protocol, compression, writer, statistics):
+    """Record data from a source, reconnecting when the connection is lost."""
+    ip, port = ip_port.split(':')
+    backoff = Backoff()
+
+    while True:
+        try:
+            reader, stream = await asyncio.open_connection(ip, int(port))
+        except OSError as error:
+            delay = backoff.next_delay()
+            logging.warning("%s: connection failed (%s), retrying in %.1f s", ip_port, error, delay)
+            await asyncio.sleep(delay)
+            continue
+
+        logging.info("%s: connected", ip_port)
+        backoff.reset()
+        decoder = create_decoder(protocol, compression)
+        last_values = {}  # last values of the source for completing delta lines
+
+        try:
+            while True:
+                try:
+                    received = await reader.read(READ_SIZE)
+                    if not received:
+                        break
+                    messages = decoder.feed(received)
+                except ValueError as error:
+                    logging.warning("%s: wrong format (%s)", ip_port, error)
+                    break
+                except OSError as error:
+                    # timeouts, unreachable hosts and lost connections end only this connection
+                    logging.warning("%s: %s", ip_port, error)
+                    break
+
+                for message in messages:
+                    if isinstance(message, str):
+                        # validate with the same rules as the application
+                        try:
+                            sample = parse_line(message)
+                        except ValueError:
+                            statistics.invalid += 1
+                            continue
+
+                        # recordings mix lines of all sources, so delta lines are saved completed
+                        delta = is_delta(sample)
+                        sample = expand_delta(sample, last_values)
+                        line = full_line(sample) if delta else message
+                    else:
+                        line = message.to_line()
+
+                    # errors of the recording file are not connection errors, they stop the recording
+                    writer.write(line)
+                    statistics.recorded += 1
+        finally:
+            stream.close()
+            try:
+                await stream.wait_closed()
+            except OSError:
+                pass
+
+        statistics.reconnects += 1
+        delay = backoff.next_delay()
+        logging.warning("%s: connection lost, reconnecting in %.1f s", ip_port, delay)
+        await asyncio.sleep(delay)
+
+
+async def flush_periodically(writer, statistics):
+    """Save buffered data to the disk and log counters periodically."""
+    elapsed = 0
+    while True:
+        await asyncio.sleep(1)
+        writer.flush()
+
+        elapsed += 1
+        if elapsed % STATISTICS_INTERVAL == 0:
+            for source_statistics in statistics:
+                logging.info("%s (file %s)", source_statistics, writer.filename)
+
+
+async def record(arguments):
+    """Record all data sources until interrupted."""
+    configuration_name, sources = load_sources(arguments.database)
+
+    max_bytes = arguments.rotate_size * 1024 * 1024 if arguments.rotate_size else None
+    max_seconds = arguments.rotate_interval * 60 if arguments.rotate_interval else None
+    writer = RecordWriter(arguments.output, configuration_name, max_bytes=max_bytes,
+                          max_seconds=max_seconds)
+    logging.info("recording configuration %s to %s", configuration_name, writer.filename)
+
+    statistics = [SourceStatistics(ip_port) for ip_port, _, _ in sources]
+    tasks = [asyncio.create_task(record_source(ip_port, protocol, compression, writer, source_statistics))
+             for (ip_port, protocol, compression), source_statistics in zip(sources, statistics)]
+    tasks.append(asyncio.create_task(flush_periodically(writer, statistics)))
+
+    # stop on interruption or termination
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except NotImplementedError:  # not available on Windows
+            pass
+
+    stop_task = asyncio.create_task(stop.wait())
+    try:
+        done, _ = await asyncio.wait(tasks + [stop_task], return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task is not stop_task:
+                task.result()  # raise errors of failed tasks
+    finally:
+        for task in tasks + [stop_task]:
+            task.cancel()
+        await asyncio.gather(*tasks, stop_task, return_exceptions=True)
+        writer.close()
+        for source_statistics in statistics:
+            logging.info("%s", source_statistics)
+
+
+def main():
+    """Record data sources without the graphical interface."""
+    parser = argparse.ArgumentParser(description="Record sensor data without the graphical interface.")
+    parser.add_argument("output", help="recording file name")
+    parser.add_argument("--database", default="configurations.db", help="configurations database")
+    parser.add_argument("--rotate-size", type=int, default=0,
+                        help="start a new file after this many megabytes (0 - never)")
+    parser.add_argument("--rotate-interval", type=int, default=0,
+                        help="start a new file after this many minutes (0 - never)")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if not os.path.isfile(arguments.database):
+        logging.critical("Failed to open configurations database!")
+        return
+
+    # upgrade databases created by older versions
+    try:
+        upgrade_database(arguments.database)
+    except sqlite3.Error as error:
+        logging.critical("Failed to upgrade configurations database: %s", error)
+        return
+
+    try:
+        asyncio.run(record(arguments))
+    except (OSError, ValueError) as error:
+        logging.critical("Recording failed: %s", error)
+
+
+if __name__ == '__main__':
+    main()
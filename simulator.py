@@ -0,0 +1,340 @@
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import random
+import signal
+import sqlite3
+import time
+import zlib
+
+import numpy as np
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from db_create import upgrade_database
+from src.data.protocols import seconds_to_timestamp, encode_dictionary, encode_samples
+from src.models.database import create_database_engine
+from src.models.models import Configuration, Address, Sensor
+
+# interval between sending batches of due samples in seconds
+TICK = 0.01
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# kinds of generated waveforms, sensors get them in turn
+WAVEFORMS = ("sine", "square", "sawtooth", "random walk", "spikes")
+
+# examples of lines the application must reject
+MALFORMED_LINES = (
+    '{"timestamp": "12:00:00.000", "sensors": {"S0": 1.0',
+    '{"sensors": {"S0": 1.0}}',
+    '{"timestamp": "12:00:00.000", "sensors": {"S0": "high"}}',
+    '{"timestamp": "12:00", "sensors": {"S0": 1.0}}',
+    '{"timestamp": "12:00:00.000", "sensors": [1.0, 2.0]}',
+    'not a JSON line',
+)
+
+
+class ClientStatistics:
+    """Counters of data sent to a client."""
+
+    def __init__(self, peer):
+        """Create counters for the given client."""
+        self.peer = peer
+        self.messages = 0
+        self.samples = 0
+        self.malformed = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+
+    def __str__(self):
+        """Create a string value of the counters."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return f"{self.peer}: {self.messages} messages ({self.messages / elapsed:.0f}/s), " \
+               f"{self.samples} samples ({self.samples / elapsed:.0f}/s), {self.malformed} malformed, " \
+               f"{self.bytes / 1024:.0f} KiB"
+
+
+class SignalGenerator:
+    """Realistic measurements of simulated sensors.
+    Every sensor gets a waveform with its own amplitude, frequency,
+    offset and noise; sensors can be sampled at different rates.
+    """
+
+    def __init__(self, names, rate, mixed_rates=False, seed=None):
+        """Create a generator of sensors sampled rate times per second.
+        With mixed rates every sensor is sampled at rate, rate / 2, rate / 3 or rate / 4.
+        """
+        self.names = list(names)
+        self.rate = rate
+        self._rng = np.random.default_rng(seed)
+        count = len(self.names)
+
+        self._kinds = np.arange(count) % len(WAVEFORMS)
+        self._divisors = np.arange(count) % 4 + 1 if mixed_rates else np.ones(count, dtype=int)
+        self._amplitudes = self._rng.uniform(0.5, 10.0, count)
+        self._frequencies = self._rng.uniform(0.05, 2.0, count)
+        self._phases = self._rng.uniform(0.0, 2 * np.pi, count)
+        self._offsets = self._rng.uniform(-5.0, 20.0, count)
+        self._noise = self._amplitudes * self._rng.uniform(0.01, 0.05, count)
+        self._walks = self._offsets.copy()  # current values of random walks
+
+    def generate(self, first, count, start_seconds):
+        """Generate samples first .. first + count - 1 since the start.
+        :return: list of (timestamp seconds, {sensor: value}) with sensors due at each sample
+        """
+        indexes = np.arange(first, first + count)
+        times = indexes / self.rate
+        phases = 2 * np.pi * np.outer(times, self._frequencies) + self._phases
+
+        values = np.empty((count, len(self.names)))
+        kinds = self._kinds
+        values[:, kinds == 0] = np.sin(phases[:, kinds == 0])
+        values[:, kinds == 1] = np.sign(np.sin(phases[:, kinds == 1]))
+        values[:, kinds == 2] = (phases[:, kinds == 2] / np.pi) % 2 - 1
+        values[:, kinds == 4] = self._rng.random((count, np.count_nonzero(kinds == 4))) < 0.01
+        values *= self._amplitudes
+        values += self._offsets
+        values += self._rng.normal(0.0, 1.0, values.shape) * self._noise
+
+        walks = kinds == 3
+        steps = self._rng.normal(0.0, 1.0, (count, np.count_nonzero(walks))) * self._noise[walks]
+        values[:, walks] = self._walks[walks] + np.cumsum(steps, axis=0)
+        if count:
+            self._walks[walks] = values[-1, walks]
+
+        due = indexes[:, None] % self._divisors == 0
+        names = self.names
+        return [(start_seconds + seconds, {names[column]: value for column, value in enumerate(row)
+                                           if row_due[column]})
+                for seconds, row, row_due in zip(times.tolist(), values.tolist(), due.tolist())]
+
+
+class Encoder:
+    """Encoder of samples into the protocol and compression of an address."""
+
+    def __init__(self, protocol, compression, names):
+        """Create an encoder, binary frames start with the sensor dictionary."""
+        self._protocol = protocol
+        self._ids = {name: sensor_id for sensor_id, name in enumerate(names)}
+        self._compressor = zlib.compressobj() if compression == "zlib" else None
+        self._header = encode_dictionary(names) if protocol == "binary" else b""
+
+    def encode(self, messages):
+        """Encode a list of samples or malformed lines (given as strings)."""
+        data = bytearray(self._header)
+        self._header = b""
+        for message in messages:
+            if isinstance(message, str):
+                data += message.encode("utf-8") + b"\n"
+            elif self._protocol == "binary":
+                seconds, sensors = message
+                data += encode_samples(seconds % SECONDS_PER_DAY,
+                                       [(self._ids[name], value) for name, value in sensors.items()])
+            else:
+                seconds, sensors = message
+                line = json.dumps({"timestamp": seconds_to_timestamp(seconds % SECONDS_PER_DAY),
+                                   "sensors": sensors})
+                data += line.encode("utf-8") + b"\n"
+
+        if self._compressor is not None:
+            # sync flush lets the client decompress everything sent so far
+            data = self._compressor.compress(bytes(data)) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return bytes(data)
+
+
+def load_address(database, address=None):
+    """Load the address to serve and names of measured sensors of the active configuration."""
+    engine = create_database_engine(database)
+    db_session = sessionmaker(bind=engine)()
+    try:
+        query = db_session.query(Address)
+        if address is not None:
+            query = query.filter(Address.ip_port == address)
+        selected = query.order_by(Address.active.desc(), Address.use_datetime.desc()).first()
+        if selected is None:
+            raise ValueError(f"Address {address} does not exist!")
+
+        # derived sensors are computed by the application and are not sent
+        configuration = db_session.query(Configuration).filter(Configuration.active == True).one_or_none()
+        names = []
+        if configuration is not None:
+            names = [short_name for short_name, in db_session.query(Sensor.short_name)
+                     .filter(Sensor.configuration_id == configuration.id)
+                     .filter(Sensor.expression == None)
+                     .order_by(Sensor.short_name)]
+
+        return selected.ip_port, selected.protocol, selected.compression, names
+    finally:
+        db_session.close()
+
+
+async def serve_client(reader, writer, arguments, names, protocol, compression, statistics):
+    """Send generated samples to a connected client until it disconnects or the simulator stops."""
+    client_statistics = ClientStatistics("{}:{}".format(*writer.get_extra_info("peername")[:2]))
+    statistics.append(client_statistics)
+    logging.info("%s: connected", client_statistics.peer)
+
+    generator = SignalGenerator(names, arguments.rate, arguments.mixed_rates, arguments.seed)
+    encoder = Encoder(protocol, compression, names)
+    malformed = random.Random(arguments.seed)
+
+    # timestamps continue from the current time of the day
+    now = datetime.datetime.now()
+    start_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+    started = time.monotonic()
+    sent = 0
+
+    try:
+        while True:
+            await asyncio.sleep(TICK)
+            elapsed = time.monotonic() - started
+
+            # during a burst pause nothing is sent, the backlog follows at once
+            if arguments.burst_interval and elapsed % arguments.burst_interval < arguments.burst_pause:
+                continue
+
+            due = int(elapsed * arguments.rate) + 1 - sent
+            if due <= 0:
+                continue
+            samples = generator.generate(sent, due, start_seconds)
+            sent += due
+
+            messages = []
+            for sample in samples:
+                if not sample[1]:
+                    continue
+                if protocol == "json" and arguments.malformed and malformed.random() < arguments.malformed:
+                    messages.append(malformed.choice(MALFORMED_LINES))
+                    client_statistics.malformed += 1
+                else:
+                    messages.append(sample)
+                    client_statistics.samples += len(sample[1])
+            client_statistics.messages += len(messages)
+
+            data = encoder.encode(messages)
+            writer.write(data)
+            client_statistics.bytes += len(data)
+            await writer.drain()
+    except OSError:
+        pass  # the client disconnected or the connection failed
+    except asyncio.CancelledError:
+        logging.info("%s: simulator stopped", client_statistics.peer)
+        raise  # the writer is closed below
+    finally:
+        writer.close()
+        statistics.remove(client_statistics)
+        logging.info("disconnected, sent to %s", client_statistics)
+
+
+async def report_periodically(statistics, interval):
+    """Log counters of connected clients periodically."""
+    while True:
+        await asyncio.sleep(interval)
+        for client_statistics in statistics:
+            logging.info("%s", client_statistics)
+
+
+async def simulate(arguments):
+    """Serve simulated data until interrupted or the duration passes."""
+    if arguments.address is not None and arguments.protocol is not None:
+        ip_port, protocol, compression, names = arguments.address, arguments.protocol, arguments.compression, []
+    else:
+        ip_port, protocol, compression, names = load_address(arguments.database, arguments.address)
+        protocol = arguments.protocol or protocol
+        compression = arguments.compression or compression
+    compression = compression or "none"
+    if arguments.sensors or not names:
+        names = [f"S{number}" for number in range(arguments.sensors or 10)]
+
+    statistics = []
+    clients = set()  # tasks serving connected clients, cancelled on shutdown
+
+    def connect_client(reader, writer):
+        """Serve a connected client in a task of its own."""
+        client = asyncio.create_task(serve_client(reader, writer, arguments, names, protocol, compression,
+                                                  statistics))
+        clients.add(client)
+        client.add_done_callback(clients.discard)
+
+    ip, port = ip_port.split(':')
+    server = await asyncio.start_server(connect_client, ip, int(port))
+    logging.info("serving %d sensors at %s Hz on %s (%s, compression %s)", len(names), arguments.rate, ip_port,
+                 protocol, compression)
+
+    # stop on interruption, termination or after the duration
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except NotImplementedError:  # not available on Windows
+            pass
+    if arguments.duration:
+        loop.call_later(arguments.duration, stop.set)
+
+    report_task = asyncio.create_task(report_periodically(statistics, arguments.report_interval))
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        report_task.cancel()
+        server.close()
+
+        # clients are disconnected before the server finishes closing
+        for client in list(clients):
+            client.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        await server.wait_closed()
+
+
+def main():
+    """Serve simulated sensor data for testing without real hardware."""
+    parser = argparse.ArgumentParser(description="Serve simulated sensor data on a data source address.")
+    parser.add_argument("--database", default="configurations.db", help="configurations database")
+    parser.add_argument("--address", help="IP address and port to serve (default: the most recently used)")
+    parser.add_argument("--protocol", choices=["json", "binary"], help="protocol (default: of the address)")
+    parser.add_argument("--compression", choices=["none", "zlib"], help="compression (default: of the address)")
+    parser.add_argument("--sensors", type=int, default=0,
+                        help="number of sensors S0, S1, ... (default: sensors of the active configuration)")
+    parser.add_argument("--rate", type=float, default=10.0, help="samples per second")
+    parser.add_argument("--mixed-rates", action="store_true",
+                        help="sample sensors at the rate divided by 1, 2, 3 or 4")
+    parser.add_argument("--burst-interval", type=float, default=0,
+                        help="every this many seconds pause and then send the backlog at once (0 - never)")
+    parser.add_argument("--burst-pause", type=float, default=1.0, help="length of pauses before bursts, s")
+    parser.add_argument("--malformed", type=float, default=0.0,
+                        help="fraction of JSON lines replaced with malformed ones")
+    parser.add_argument("--duration", type=float, default=0, help="stop after this many seconds (0 - never)")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="seconds between reports")
+    parser.add_argument("--seed", type=int, help="seed of the random generators")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if not arguments.rate > 0 or not 0 <= arguments.malformed <= 1:
+        logging.critical("Rate must be positive and the malformed fraction must be between 0 and 1!")
+        return
+
+    if not (arguments.address and arguments.protocol):
+        if not os.path.isfile(arguments.database):
+            logging.critical("Failed to open configurations database!")
+            return
+
+        # upgrade databases created by older versions
+        try:
+            upgrade_database(arguments.database)
+        except sqlite3.Error as error:
+            logging.critical("Failed to upgrade configurations database: %s", error)
+            return
+
+    try:
+        asyncio.run(simulate(arguments))
+    except (OSError, ValueError, SQLAlchemyError) as error:
+        logging.critical("Simulation failed: %s", error)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+from collections import namedtuple
+
+import numpy as np
+
+# change of an alarm state, raised is False when the alarm is cleared
+AlarmEvent = namedtuple("AlarmEvent", ["sensor", "seconds", "kind", "value", "limit", "raised"])
+
+# kinds of alarms
+LOW = "low"
+HIGH = "high"
+RATE = "rate"
+
+
+class _SensorAlarms:
+    """Thresholds and alarm states of one sensor."""
+    __slots__ = ("low", "high", "rate_limit", "hysteresis", "active", "last_time", "last_value")
+
+    def __init__(self, low, high, rate_limit, hysteresis):
+        """Create alarms of a sensor, thresholds set to None are not checked."""
+        self.low = low
+        self.high = high
+        self.rate_limit = rate_limit
+        self.hysteresis = hysteresis or 0.0
+        self.active = {LOW: False, HIGH: False, RATE: False}
+
+        # last checked value, the rate of change of the next batch starts from it
+        self.last_time = None
+        self.last_value = None
+
+
+class AlarmEngine:
+    """Checks batches of sensor values against thresholds.
+    Values are compared as whole arrays, only the few values where
+    an alarm changes its state are processed one by one.
+    An alarm is raised when a value gets below the low or above the high
+    threshold and cleared when it gets back by more than the hysteresis,
+    a rate alarm is raised while the value changes faster than the rate limit.
+    """
+
+    def __init__(self, thresholds):
+        """Create an engine from {sensor: (low, high, rate limit, hysteresis)}."""
+        self._sensors = {sensor: _SensorAlarms(*limits) for sensor, limits in thresholds.items()
+                         if any(limit is not None for limit in limits[:3])}
+
+        # names of sensors with thresholds
+        self.sensors = frozenset(self._sensors)
+
+        # sensors with at least one active alarm
+        self.active_sensors = set()
+
+        # increased on every change of alarm states
+        self.revision = 0
+
+    def check(self, sensor, x, y):
+        """Check values of a sensor measured at times x, NaN values are skipped.
+        :return: list of alarm events in order of time
+        """
+        alarms = self._sensors.get(sensor)
+        if alarms is None:
+            return []
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        finite = np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+        if not len(y):
+            return []
+
+        events = []
+        if alarms.low is not None:
+            self._switch(sensor, alarms, LOW, alarms.low, x, y,
+                         y < alarms.low, y >= alarms.low + alarms.hysteresis, events)
+        if alarms.high is not None:
+            self._switch(sensor, alarms, HIGH, alarms.high, x, y,
+                         y > alarms.high, y <= alarms.high - alarms.hysteresis, events)
+        if alarms.rate_limit is not None:
+            # rate of change of every value from the previous one
+            if alarms.last_time is None:
+                times, values = x, y
+            else:
+                times, values = np.concatenate(([alarms.last_time], x)), np.concatenate(([alarms.last_value], y))
+            with np.errstate(all="ignore"):
+                rates = np.abs(np.diff(values) / np.diff(times))
+            self._switch(sensor, alarms, RATE, alarms.rate_limit, times[1:], rates,
+                         rates > alarms.rate_limit, rates <= alarms.rate_limit, events)
+
+        alarms.last_time, alarms.last_value = x[-1], y[-1]
+
+        if events:
+            events.sort(key=lambda event: event.seconds)
+            if any(alarms.active.values()):
+                self.active_sensors.add(sensor)
+            else:
+                self.active_sensors.discard(sensor)
+            self.revision += 1
+
+        return events
+
+    @staticmethod
+    def _switch(sensor, alarms, kind, limit, x, y, raising, clearing, events):
+        """Find where an alarm is raised or cleared and add the events."""
+        active = alarms.active[kind]
+        # values within limits do not change an inactive alarm
+        if not len(y) or not active and not raising.any():
+            return
+
+        # state after every value is set by the latest raising or clearing value
+        switches = np.where(raising, 1, np.where(clearing, 0, -1))
+        positions = np.arange(len(switches))
+        latest = np.maximum.accumulate(np.where(switches >= 0, positions, -1))
+        states = np.where(latest >= 0, switches[np.maximum(latest, 0)], int(active)).astype(bool)
+
+        previous = np.concatenate(([active], states[:-1]))
+        for index in np.flatnonzero(states != previous):
+            events.append(AlarmEvent(sensor, float(x[index]), kind, float(y[index]), limit, bool(states[index])))
+        alarms.active[kind] = bool(states[-1])
+
+    def clear(self):
+        """Reset all alarms."""
+        for alarms in self._sensors.values():
+            alarms.active = {LOW: False, HIGH: False, RATE: False}
+            alarms.last_time = None
+            alarms.last_value = None
+        self.active_sensors.clear()
+        self.revision += 1
+
+
+def describe(event):
+    """Create a message about an alarm event."""
+    if not event.raised:
+        return f"Alarm cleared: {event.sensor} {event.kind} at {event.seconds:.3f} s, value {event.value:.4g}"
+    if event.kind == LOW:
+        condition = f"is below {event.limit:.4g}"
+    elif event.kind == HIGH:
+        condition = f"is above {event.limit:.4g}"
+    else:
+        condition = f"changes faster than {event.limit:.4g} per second"
+    return f"Alarm: {event.sensor} {condition} at {event.seconds:.3f} s, value {event.value:.4g}"
@@ -0,0 +1,28 @@
+import random
+
+
+class Backoff:
+    """Exponential backoff with jitter for reconnection attempts."""
+
+    def __init__(self, initial_delay=0.5, maximal_delay=30.0, factor=2.0, jitter=0.5):
+        """Create backoff.
+        Delays grow from initial to maximal delay by the factor,
+        each delay is randomly reduced by up to the jitter share.
+        """
+        self._initial_delay = initial_delay
+        self._maximal_delay = maximal_delay
+        self._factor = factor
+        self._jitter = jitter
+
+        self.attempts = 0
+
+    def next_delay(self):
+        """Get delay in seconds before the next attempt."""
+        # exponent is limited to avoid overflow during long outages
+        delay = min(self._maximal_delay, self._initial_delay * self._factor ** min(self.attempts, 64))
+        self.attempts += 1
+        return delay * random.uniform(1 - self._jitter, 1)
+
+    def reset(self):
+        """Start over after a successful attempt."""
+        self.attempts = 0
@@ -0,0 +1,187 @@
+import datetime
+import time
+
+from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtNetwork import QTcpSocket, QAbstractSocket
+
+from src.data.backoff import Backoff
+from src.data.protocols import create_decoder
+
+
+class DataSource(QObject):
+    """TCP connection to a single data source (gateway)."""
+
+    # emitted with a list of decoded messages (lines or sample frames)
+    received = Signal(list)
+    # emitted with the error description when the stream is malformed
+    malformed = Signal(str)
+    # emitted when connection is established for the first time
+    connected = Signal()
+    # emitted once when an established connection is lost
+    connection_lost = Signal()
+    # emitted with the delay in seconds before each reconnection attempt
+    reconnecting = Signal(float)
+    # emitted when connection is established again
+    reconnected = Signal()
+
+    # data read at once before giving other sources their turn
+    MAX_READ_SIZE = 1 << 16
+    # data buffered by the socket, when it is full
+    # the sender is slowed down by TCP flow control
+    READ_BUFFER_SIZE = 1 << 22
+
+    def __init__(self, address, parent=None):
+        """Create a data source for the given address."""
+        super().__init__(parent)
+
+        self.ip_port = address.ip_port
+        self._protocol = address.protocol
+        self._compression = address.compression
+        self._decoder = create_decoder(self._protocol, self._compression)
+
+        self.socket = QTcpSocket(self)
+        self.socket.setReadBufferSize(self.READ_BUFFER_SIZE)
+        self.socket.readyRead.connect(self._schedule_read)
+        self._read_scheduled = False
+        self._paused = False
+
+        # reconnection supervision
+        self.socket.stateChanged.connect(self._handle_state_change)
+        self._backoff = Backoff()
+        self._reconnect_timer = QTimer(self)
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self.connect_to_host)
+        self._closing = False
+        self._lost = False
+        self.was_connected = False
+
+        # sensors received from this source
+        self.sensors = set()
+        # last values of sensors for expanding delta lines
+        self.last_values = {}
+
+        # throughput and lag counters
+        self.bytes_received = 0
+        self.messages_received = 0
+        self._last_timestamp = None
+        self._rate_messages = 0
+        self._rate_time = time.monotonic()
+        self.rate = 0.0
+
+    def __str__(self):
+        """Create a string value of a data source."""
+        return self.ip_port
+
+    def connect_to_host(self):
+        """Connect to the data source."""
+        self._closing = False
+        self.socket.abort()
+        self._decoder = create_decoder(self._protocol, self._compression)
+        ip, port = self.ip_port.split(':')
+        print("connecting to " + ip + ":" + str(port))
+        self.socket.connectToHost(ip, int(port))
+
+    def disconnect_from_host(self):
+        """Disconnect from the data source."""
+        self._closing = True
+        self._reconnect_timer.stop()
+        self.socket.disconnectFromHost()
+
+    def _handle_state_change(self, state):
+        """Reconnect when an established connection is lost."""
+        if state == QAbstractSocket.SocketState.ConnectedState:
+            self._backoff.reset()
+            if self._lost:
+                self._lost = False
+                self.reconnected.emit()
+            elif not self.was_connected:
+                self.connected.emit()
+            self.was_connected = True
+        elif state == QAbstractSocket.SocketState.UnconnectedState \
+                and self.was_connected and not self._closing and not self._reconnect_timer.isActive():
+            if not self._lost:
+                self._lost = True
+                self.connection_lost.emit()
+
+            delay = self._backoff.next_delay()
+            self._reconnect_timer.start(int(delay * 1000))
+            self.reconnecting.emit(delay)
+
+    def pause(self):
+        """Stop reading received data."""
+        self._paused = True
+
+    def resume(self):
+        """Continue reading received data."""
+        if self._paused:
+            self._paused = False
+            if self.socket.bytesAvailable():
+                self._schedule_read()
+
+    def _schedule_read(self):
+        """Schedule reading so that all sources get their turn."""
+        if not self._paused and not self._read_scheduled:
+            self._read_scheduled = True
+            QTimer.singleShot(0, self._read)
+
+    def _read(self):
+        """Read and decode a limited amount of available data."""
+        self._read_scheduled = False
+        if self._paused:
+            return
+
+        data = self.socket.read(self.MAX_READ_SIZE).data()
+        if not data:
+            return
+
+        try:
+            messages = self._decoder.feed(data)
+        except ValueError as error:
+            # binary stream cannot be resynchronized after an error
+            self.malformed.emit(str(error))
+            self.socket.abort()
+            return
+
+        self.bytes_received += len(data)
+        self.messages_received += len(messages)
+
+        # leave the rest of the data for the next turn
+        if self.socket.bytesAvailable():
+            self._schedule_read()
+
+        if messages:
+            self.received.emit(messages)
+
+    def record_timestamp(self, seconds):
+        """Remember timestamp of the last processed sample for lag calculation."""
+        self._last_timestamp = seconds
+
+    def last_timestamp(self):
+        """Get timestamp of the last processed sample in seconds."""
+        return self._last_timestamp
+
+    def lag(self):
+        """Get difference between local time and the last received timestamp in seconds."""
+        if self._last_timestamp is None:
+            return None
+        now = datetime.datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return (now - midnight).total_seconds() - self._last_timestamp
+
+    def update_rate(self):
+        """Update received messages per second since the last update."""
+        now = time.monotonic()
+        if now > self._rate_time:
+            self.rate = (self.messages_received - self._rate_messages) / (now - self._rate_time)
+        self._rate_messages = self.messages_received
+        self._rate_time = now
+
+    def status(self):
+        """Get a short description of the source state and counters."""
+        lag = self.lag()
+        lag_text = "-" if lag is None else f"{lag:.1f} s"
+        paused_text = ", paused" if self._paused else ""
+        if self._lost:
+            return f"{self.ip_port}: reconnecting (attempt {self._backoff.attempts})"
+        return f"{self.ip_port}: {self.rate:.0f} msg/s, " \
+               f"{self.socket.bytesAvailable()} B queued, lag {lag_text}{paused_text}"
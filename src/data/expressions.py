@@ -0,0 +1,183 @@
+import ast
+import operator
+
+import numpy as np
+
+# maximal length of an expression of a derived sensor
+MAX_EXPRESSION_LENGTH = 200
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# functions available in expressions, all of them work on whole arrays
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+CONSTANTS = {
+    "pi": np.pi,
+    "e": np.e,
+}
+
+
+class Expression:
+    """Arithmetic expression over sensor short names evaluated on NumPy arrays.
+    The expression is parsed once and only numbers, sensor names, arithmetic
+    operators and known functions are accepted, so nothing else can be run.
+    """
+
+    def __init__(self, text):
+        """Parse an expression.
+        throws ValueError if the expression is not valid
+        """
+        if not text.strip():
+            raise ValueError("Expression cannot be empty!")
+        if len(text) > MAX_EXPRESSION_LENGTH:
+            raise ValueError(f"Expression should be not longer than {MAX_EXPRESSION_LENGTH} characters!")
+
+        try:
+            tree = ast.parse(text.strip(), mode="eval")
+        except SyntaxError:
+            raise ValueError("Expression has wrong syntax!")
+
+        self.text = text
+        self.sensors = set()  # short names of sensors used in the expression
+        self._evaluate = self._compile(tree.body)
+        if not self.sensors:
+            raise ValueError("Expression should use at least one sensor!")
+
+    def _compile(self, node):
+        """Turn an expression tree node into a function of sensor values."""
+        # constants are NumPy numbers, so errors of constant subexpressions follow np.errstate
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = np.float64(node.value)
+            return lambda values: value
+
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                value = np.float64(CONSTANTS[node.id])
+                return lambda values: value
+            name = node.id
+            self.sensors.add(name)
+            return lambda values: values[name]
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            function = _BINARY_OPERATORS[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda values: function(left(values), right(values))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            function = _UNARY_OPERATORS[type(node.op)]
+            operand = self._compile(node.operand)
+            return lambda values: function(operand(values))
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+                and not node.keywords:
+            function = FUNCTIONS[node.func.id]
+            arguments = [self._compile(argument) for argument in node.args]
+            if function.nin != len(arguments):
+                raise ValueError(f"Function {node.func.id} takes {function.nin} argument(s)!")
+            return lambda values: function(*[argument(values) for argument in arguments])
+
+        raise ValueError("Expression can contain only numbers, sensor short names, operators + - * / % **, "
+                         "and functions " + ", ".join(FUNCTIONS) + "!")
+
+    def evaluate(self, values):
+        """Evaluate the expression for arrays of sensor values of the same length.
+        Results which are not finite numbers (division by zero etc.) are NaN.
+        """
+        length = len(next(iter(values.values()))) if values else 0
+        try:
+            with np.errstate(all="ignore"):
+                result = np.array(np.broadcast_to(self._evaluate(values), (length,)), dtype=float)
+        except ArithmeticError:
+            return np.full(length, np.nan)
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+
+class DerivedSensors:
+    """Values of derived sensors computed from each batch of samples.
+    Every sample changing an input of a derived sensor gets a value of it
+    computed from the latest known values of all inputs; until every
+    input has a value, the derived value is NaN.
+    """
+
+    def __init__(self, expressions):
+        """Create derived sensors from {short name: expression text}."""
+        self._expressions = {short_name: Expression(text) for short_name, text in expressions.items()}
+        self._inputs = set().union(*[expression.sensors for expression in self._expressions.values()])
+        self._last_values = {}  # last known value of each input
+
+    def __contains__(self, sensor):
+        """Check if a sensor is derived."""
+        return sensor in self._expressions
+
+    def add_to(self, samples):
+        """Add values of derived sensors to a batch of (timestamp, sensor values, line) samples.
+        Sensor values of samples changing inputs of a derived sensor get its value,
+        values of derived sensors received from data sources are replaced.
+        """
+        if not self._expressions:
+            return
+
+        # samples with inputs, as rows of the batch
+        rows = []
+        for sample in samples:
+            sensors = sample[1]
+            for short_name in self._expressions.keys() & sensors.keys():
+                del sensors[short_name]  # derived values are computed, not received
+            if not self._inputs.isdisjoint(sensors):
+                rows.append(sensors)
+        if not rows:
+            return
+        positions = np.arange(len(rows))
+
+        # align inputs on rows, carrying the last known value forward
+        values = {}
+        present = {}  # rows with a value of each input
+        for sensor in self._inputs:
+            column = np.array([sensors.get(sensor, np.nan) for sensors in rows], dtype=float)
+            present[sensor] = np.fromiter((sensor in sensors for sensors in rows), dtype=bool, count=len(rows))
+
+            # index of the latest row with a value of the sensor, -1 before the first one
+            latest = np.maximum.accumulate(np.where(present[sensor], positions, -1))
+            aligned = column[np.maximum(latest, 0)]
+            aligned[latest < 0] = self._last_values.get(sensor, np.nan)
+            values[sensor] = aligned
+
+            self._last_values[sensor] = aligned[-1]
+
+        for short_name, expression in self._expressions.items():
+            # only rows changing the sensor's inputs get new values
+            changed = np.logical_or.reduce([present[sensor] for sensor in expression.sensors])
+            if not changed.any():
+                continue
+
+            result = expression.evaluate({sensor: values[sensor][changed] for sensor in expression.sensors})
+            for row, value in zip(np.flatnonzero(changed).tolist(), result.tolist()):
+                rows[row][short_name] = value
+
+    def clear(self):
+        """Forget last known values of inputs."""
+        self._last_values.clear()
@@ -0,0 +1,58 @@
+from collections import deque
+from itertools import islice
+
+# names of overflow policies and their descriptions
+POLICIES = {
+    "block": "Block the reader",
+    "drop_oldest": "Drop oldest samples",
+    "decimate": "Decimate evenly",
+}
+
+
+class IngestQueue:
+    """Bounded queue of samples between data sources and visualization."""
+
+    def __init__(self, capacity=20000, policy="drop_oldest"):
+        """Create an empty queue."""
+        self.capacity = capacity
+        self.policy = policy
+        self._samples = deque()
+
+        # number of samples dropped because of overflow
+        self.dropped = 0
+
+    def __len__(self):
+        """Get number of queued samples."""
+        return len(self._samples)
+
+    def is_full(self):
+        """Check if the queue reached its capacity."""
+        return len(self._samples) >= self.capacity
+
+    def put(self, sample):
+        """Add a sample applying the overflow policy.
+        With the blocking policy samples are always accepted,
+        readers are expected to stop while the queue is full.
+        """
+        if self.is_full():
+            if self.policy == "drop_oldest":
+                self._samples.popleft()
+                self.dropped += 1
+            elif self.policy == "decimate":
+                # keep every second sample, so that queued
+                # data still covers the same time span
+                kept = deque(islice(self._samples, 0, None, 2))
+                self.dropped += len(self._samples) - len(kept)
+                self._samples = kept
+
+        self._samples.append(sample)
+
+    def take(self, count):
+        """Remove and return up to count oldest samples."""
+        count = min(count, len(self._samples))
+        return [self._samples.popleft() for _ in range(count)]
+
+    def clear(self):
+        """Remove all samples and reset counters."""
+        self._samples.clear()
+        self.dropped = 0
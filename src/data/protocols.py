@@ -0,0 +1,246 @@
+import json
+import math
+import struct
+import zlib
+
+import numpy as np
+
+# names of supported wire protocols and their descriptions
+PROTOCOLS = {
+    "json": "JSON lines",
+    "binary": "Binary frames",
+}
+
+# names of supported stream compressions and their descriptions
+COMPRESSIONS = {
+    "none": "None",
+    "zlib": "zlib stream",
+}
+
+# binary frame layout (all values in network byte order):
+# frame      := length:uint32 payload[length]
+# payload    := type:uint8 body
+# dictionary := count:uint16 (id:uint16 name_length:uint8 name[name_length])*count
+# samples    := timestamp:float64 (id:uint16 value:float32|float64)*
+# timestamp is given in seconds since midnight
+FRAME_HEADER = struct.Struct(">I")
+FRAME_TYPE = struct.Struct(">B")
+DICTIONARY_HEADER = struct.Struct(">H")
+DICTIONARY_ENTRY = struct.Struct(">HB")
+SAMPLES_HEADER = struct.Struct(">d")
+
+FRAME_DICTIONARY = 0x01
+FRAME_SAMPLES_FLOAT32 = 0x02
+FRAME_SAMPLES_FLOAT64 = 0x03
+
+SAMPLE_TYPES = {
+    FRAME_SAMPLES_FLOAT32: np.dtype([("id", ">u2"), ("value", ">f4")]),
+    FRAME_SAMPLES_FLOAT64: np.dtype([("id", ">u2"), ("value", ">f8")]),
+}
+
+MAX_FRAME_LENGTH = 1 << 20
+
+
+def timestamp_to_seconds(timestamp):
+    """Turns string timestamp into seconds"""
+    # timestamp format:
+    # HH:MM:SS.mmm
+    h, m, s_and_ms = timestamp.split(":")
+    s, ms = s_and_ms.split(".")
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def seconds_to_timestamp(seconds):
+    """Turns seconds into string timestamp (HH:MM:SS.mmm)."""
+    milliseconds = int(round(seconds * 1000))
+    s, ms = divmod(milliseconds, 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+
+class SampleFrame:
+    """Samples of a binary frame sharing a single timestamp."""
+
+    def __init__(self, seconds, names, samples):
+        """Create a frame from a timestamp, sensor names and decoded samples."""
+        self.seconds = seconds
+        self._names = names
+        self._samples = samples
+        self._sensors = None
+
+    def __len__(self):
+        """Get number of samples in the frame."""
+        return len(self._samples)
+
+    @property
+    def sensors(self):
+        """Get sensor values of the frame by sensor short name."""
+        if self._sensors is None:
+            names = self._names
+            self._sensors = {names.get(sensor_id, f"#{sensor_id}"): value
+                             for sensor_id, value in zip(self._samples["id"].tolist(),
+                                                         self._samples["value"].tolist())}
+        return self._sensors
+
+    def to_line(self):
+        """Convert the frame to a JSON line as sent by the JSON lines protocol.
+        JSON has no representation of non-finite numbers, such values are left out.
+        """
+        sensors = self.sensors
+        if not np.isfinite(self._samples["value"]).all():
+            sensors = {sensor: value for sensor, value in sensors.items() if math.isfinite(value)}
+        return json.dumps({"timestamp": seconds_to_timestamp(self.seconds), "sensors": sensors},
+                          allow_nan=False)
+
+
+class JsonLineDecoder:
+    """Decoder of newline-delimited JSON data."""
+
+    # lines longer than this are passed on unfinished
+    # so that a missing newline cannot exhaust memory
+    MAX_LINE_LENGTH = 1 << 16
+
+    def __init__(self):
+        """Create a JSON lines decoder."""
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and return complete lines."""
+        self._buffer += data
+        *lines, rest = self._buffer.split(b"\n")
+        if len(rest) > self.MAX_LINE_LENGTH:
+            lines.append(rest)
+            rest = b""
+        self._buffer = bytearray(rest)
+
+        return [line.decode("utf-8", errors="replace").strip() for line in lines
+                if line.strip()]
+
+
+class BinaryFrameDecoder:
+    """Decoder of length-prefixed binary frames."""
+
+    def __init__(self):
+        """Create a binary frames decoder."""
+        self._pending = b""
+        self._names = {}
+
+    def feed(self, data):
+        """Add received bytes and return decoded sample frames.
+        Sample values are NumPy views into received data.
+        throws ValueError if data is malformed
+        """
+        data = self._pending + bytes(data) if self._pending else bytes(data)
+        view = memoryview(data)
+
+        frames = []
+        offset = 0
+        while len(view) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(view, offset)
+            if not 0 < length <= MAX_FRAME_LENGTH:
+                self._pending = b""
+                raise ValueError(f"Invalid frame length: {length}")
+
+            end = offset + FRAME_HEADER.size + length
+            if end > len(view):
+                break  # wait for the rest of the frame
+
+            try:
+                frame = self._decode_payload(view[offset + FRAME_HEADER.size:end])
+            except struct.error as error:
+                self._pending = b""
+                raise ValueError(f"Malformed frame: {error}") from error
+            if frame is not None:
+                frames.append(frame)
+            offset = end
+
+        self._pending = bytes(view[offset:])
+        return frames
+
+    def _decode_payload(self, payload):
+        """Decode one frame payload."""
+        (frame_type,) = FRAME_TYPE.unpack_from(payload)
+        body = payload[FRAME_TYPE.size:]
+
+        if frame_type == FRAME_DICTIONARY:
+            self._names = self._decode_dictionary(body)
+            return None
+
+        if frame_type in SAMPLE_TYPES:
+            if len(body) < SAMPLES_HEADER.size:
+                raise ValueError("Sample frame is too short!")
+            sample_type = SAMPLE_TYPES[frame_type]
+            if (len(body) - SAMPLES_HEADER.size) % sample_type.itemsize:
+                raise ValueError("Sample frame is truncated!")
+
+            (seconds,) = SAMPLES_HEADER.unpack_from(body)
+            samples = np.frombuffer(body, dtype=sample_type, offset=SAMPLES_HEADER.size)
+            return SampleFrame(seconds, self._names, samples)
+
+        raise ValueError(f"Unknown frame type: {frame_type}")
+
+    @staticmethod
+    def _decode_dictionary(body):
+        """Decode sensor-id dictionary."""
+        (count,) = DICTIONARY_HEADER.unpack_from(body)
+        offset = DICTIONARY_HEADER.size
+
+        names = {}
+        for _ in range(count):
+            sensor_id, name_length = DICTIONARY_ENTRY.unpack_from(body, offset)
+            offset += DICTIONARY_ENTRY.size
+            names[sensor_id] = bytes(body[offset:offset + name_length]).decode("utf-8")
+            offset += name_length
+
+        return names
+
+
+class ZlibStreamDecoder:
+    """Decoder of a zlib compressed stream passing data to another decoder."""
+
+    def __init__(self, decoder):
+        """Create a decompressing decoder."""
+        self._decoder = decoder
+        self._decompressor = zlib.decompressobj()
+
+    def feed(self, data):
+        """Decompress received bytes and decode them.
+        throws ValueError if data is malformed
+        """
+        try:
+            data = self._decompressor.decompress(bytes(data))
+        except zlib.error as error:
+            raise ValueError(f"Malformed compressed stream: {error}") from error
+        return self._decoder.feed(data)
+
+
+def encode_dictionary(names):
+    """Encode sensor-id dictionary frame from a list of sensor names."""
+    body = bytearray(FRAME_TYPE.pack(FRAME_DICTIONARY))
+    body += DICTIONARY_HEADER.pack(len(names))
+    for sensor_id, name in enumerate(names):
+        encoded_name = name.encode("utf-8")
+        body += DICTIONARY_ENTRY.pack(sensor_id, len(encoded_name))
+        body += encoded_name
+    return FRAME_HEADER.pack(len(body)) + bytes(body)
+
+
+def encode_samples(seconds, values, double_precision=False):
+    """Encode sample frame from a timestamp and a list of (sensor id, value) pairs."""
+    frame_type = FRAME_SAMPLES_FLOAT64 if double_precision else FRAME_SAMPLES_FLOAT32
+    samples = np.array(values, dtype=SAMPLE_TYPES[frame_type])
+    body = FRAME_TYPE.pack(frame_type) + SAMPLES_HEADER.pack(seconds) + samples.tobytes()
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def create_decoder(protocol, compression="none"):
+    """Create a decoder for the given protocol and compression names."""
+    if protocol == "binary":
+        decoder = BinaryFrameDecoder()
+    else:
+        decoder = JsonLineDecoder()
+
+    if compression == "zlib":
+        decoder = ZlibStreamDecoder(decoder)
+    return decoder
@@ -0,0 +1,85 @@
+import json
+import os
+import time
+
+
+class RecordWriter:
+    """Buffered writer of recording files with optional rotation.
+    Data is flushed and synced to disk at most once per flush interval
+    instead of after every line.
+    """
+
+    BUFFER_SIZE = 1 << 16
+
+    def __init__(self, filename, configuration_name, flush_interval=1.0, max_bytes=None,
+                 max_seconds=None):
+        """Create a recording file.
+        throws OSError if the file cannot be created
+        """
+        self._base_filename = filename
+        self._configuration_name = configuration_name
+        self._flush_interval = flush_interval
+
+        # rotation limits, None means no limit
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+
+        self._part = 0
+        self._file = None
+        self.lines_written = 0
+        self._open(filename)
+
+    @property
+    def filename(self):
+        """Get name of the file currently written."""
+        return self._file.name
+
+    def _open(self, filename):
+        """Open a new file and write the configuration header."""
+        self._file = open(filename, 'w', buffering=self.BUFFER_SIZE)
+        self._opened_time = time.monotonic()
+        self._last_flush = self._opened_time
+        self._bytes = 0
+        self._file.write(json.dumps({"configuration": self._configuration_name}) + "\n")
+
+    def write(self, line):
+        """Write a line to the recording.
+        throws OSError if writing fails
+        """
+        self._file.write(line + "\n")
+        self._bytes += len(line) + 1
+        self.lines_written += 1
+
+        now = time.monotonic()
+        if (self._max_bytes is not None and self._bytes >= self._max_bytes) \
+                or (self._max_seconds is not None and now - self._opened_time >= self._max_seconds):
+            self.rotate()
+        elif now - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Save buffered data to the disk.
+        throws OSError if writing fails
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def rotate(self):
+        """Close the current file and continue in the next one.
+        throws OSError if writing fails
+        """
+        self.close()
+        self._part += 1
+        stem, extension = os.path.splitext(self._base_filename)
+        self._open(f"{stem}_{self._part:03d}{extension}")
+
+    def close(self):
+        """Save buffered data and close the file.
+        throws OSError if writing fails
+        """
+        if not self._file.closed:
+            try:
+                self.flush()
+            finally:
+                self._file.close()
@@ -0,0 +1,118 @@
+import csv
+
+import numpy as np
+
+# ways of taking values of a sensor at grid times
+MODES = {
+    "last": "Last Value",
+    "linear": "Linear Interpolation",
+    "mean": "Mean Per Interval",
+}
+
+# grids with more points are not created
+MAX_GRID_POINTS = 10_000_000
+
+
+def time_grid(start, end, step):
+    """Create times from start to end (inclusive) with the given step.
+    throws ValueError if the step is not positive or the grid is too large
+    """
+    if not step > 0:
+        raise ValueError("Time step must be positive!")
+    points = int(np.floor((end - start) / step + 1e-9)) + 1 if end >= start else 0
+    if points > MAX_GRID_POINTS:
+        raise ValueError(f"Time grid would have more than {MAX_GRID_POINTS} points, increase the time step!")
+    return start + step * np.arange(points)
+
+
+def resample(x, y, grid, mode="last"):
+    """Get values of a series measured at times x at the grid times.
+    last - the latest value measured at or before a grid time,
+    linear - interpolation between the measurements around a grid time,
+    mean - mean of the values measured from a grid time until the next one.
+    Grid times without a value are NaN, NaN values of the series mark gaps.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    result = np.full(len(grid), np.nan)
+    if not len(x) or not len(grid):
+        return result
+
+    # measurements of several sources can be slightly out of order
+    if np.any(x[1:] < x[:-1]):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+
+    if mode == "last":
+        previous = np.searchsorted(x, grid, side="right") - 1
+        measured = previous >= 0
+
+        # gap markers have the time of the last value before the gap,
+        # at that very time the value is taken instead of the marker
+        finite = np.isfinite(y)
+        if not finite.all():
+            latest_finite = np.maximum.accumulate(np.where(finite, np.arange(len(y)), -1))
+            candidates = latest_finite[np.maximum(previous, 0)]
+            exact = measured & (candidates >= 0) & ~finite[np.maximum(previous, 0)]
+            exact[exact] = x[candidates[exact]] == grid[exact]
+            previous = np.where(exact, candidates, previous)
+
+        result[measured] = y[previous[measured]]
+    elif mode == "linear":
+        following = np.searchsorted(x, grid, side="left")
+        inside = (following < len(x)) & ((following > 0) | (x[0] == grid))
+        following = following[inside]
+        previous = np.maximum(following - 1, 0)
+        x0, x1 = x[previous], x[following]
+        y0, y1 = y[previous], y[following]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(x1 > x0, (grid[inside] - x0) / (x1 - x0), 1.0)
+            # a measurement exactly at a grid time is taken as it is
+            result[inside] = np.where(weight == 1.0, y1, y0 + (y1 - y0) * weight)
+    elif mode == "mean":
+        # intervals are [grid[k], grid[k + 1]), the last one has the width of the previous
+        width = grid[-1] - grid[-2] if len(grid) > 1 else np.inf
+        edges = np.searchsorted(x, np.append(grid, grid[-1] + width), side="left")
+
+        finite = np.isfinite(y)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(finite, y, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(finite)))
+        interval_counts = counts[edges[1:]] - counts[edges[:-1]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = (sums[edges[1:]] - sums[edges[:-1]]) / interval_counts
+        result[interval_counts == 0] = np.nan
+    else:
+        raise ValueError(f"Unknown resampling mode {mode}!")
+
+    return result
+
+
+def align(series_store, sensors, step, mode="last", start=None, end=None):
+    """Resample sensors of a series store to a shared time grid.
+    The grid covers all measurements of the sensors unless start or end are given.
+    :return: grid times and {sensor: values at grid times}
+    throws ValueError if the grid cannot be created
+    """
+    series = {sensor: series_store.series(sensor) for sensor in sensors}
+    measured = [x for x, _ in series.values() if len(x)]
+    if start is None:
+        start = min((np.min(x) for x in measured), default=0.0)
+    if end is None:
+        end = max((np.max(x) for x in measured), default=start - step)
+
+    grid = time_grid(start, end, step)
+    return grid, {sensor: resample(x, y, grid, mode) for sensor, (x, y) in series.items()}
+
+
+def export_csv(filename, grid, columns):
+    """Write aligned sensor values to a CSV file, missing values are left empty.
+    throws OSError if the file cannot be written
+    """
+    names = list(columns)
+    table = np.column_stack([grid] + [columns[name] for name in names]) if len(grid) else []
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["time"] + names)
+        for row in table:
+            writer.writerow([f"{row[0]:.6f}"] + ["" if value != value else f"{value:.10g}" for value in row[1:]])
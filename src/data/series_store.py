@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class _Series:
+    """Timestamps and values of one sensor."""
+    __slots__ = ("x", "y", "length")
+
+    def __init__(self, capacity):
+        """Create an empty series."""
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.length = 0
+
+    def append(self, x, y):
+        """Add points, the arrays grow by doubling when they are full."""
+        end = self.length + len(x)
+        if end > len(self.x):
+            capacity = max(2 * len(self.x), end)
+            for name in ("x", "y"):
+                array = np.empty(capacity)
+                array[:self.length] = getattr(self, name)[:self.length]
+                setattr(self, name, array)
+
+        self.x[self.length:end] = x
+        self.y[self.length:end] = y
+        self.length = end
+
+
+class SeriesStore:
+    """Measurements of all sensors received during a session.
+    Graphs read their data from the store instead of keeping own copies,
+    so hidden graphs can be redrawn later without losing any points.
+    """
+
+    # number of points a new series has room for
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        """Create an empty store."""
+        self._series = {}
+
+    def __contains__(self, sensor):
+        """Check if the store has measurements of a sensor."""
+        return sensor in self._series
+
+    def sensors(self):
+        """Get names of sensors in the store."""
+        return list(self._series)
+
+    def append(self, sensor, x, y):
+        """Add measurements of a sensor."""
+        series = self._series.get(sensor)
+        if series is None:
+            series = self._series[sensor] = _Series(max(self.INITIAL_CAPACITY, len(x)))
+        series.append(x, y)
+
+    def length(self, sensor):
+        """Get number of points of a sensor."""
+        series = self._series.get(sensor)
+        return series.length if series is not None else 0
+
+    def series(self, sensor):
+        """Get timestamps and values of a sensor.
+        The arrays are views of the store, they must not be modified.
+        """
+        series = self._series.get(sensor)
+        if series is None:
+            return np.empty(0), np.empty(0)
+        return series.x[:series.length], series.y[:series.length]
+
+    def clear(self):
+        """Remove all measurements."""
+        self._series.clear()
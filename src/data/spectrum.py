@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class Spectrum:
+    """Power spectral density of the most recent values of a series.
+    The recent values are split into overlapping segments, every segment
+    is multiplied by a Hann window and transformed with a real FFT,
+    the power of all segments is averaged (Welch's method, a single
+    segment gives a windowed FFT). The window and the buffers are
+    allocated once and reused for every calculation.
+    """
+
+    def __init__(self, segment_length=256, segments=8, overlap=0.5):
+        """Create a spectrum of segments of segment_length values."""
+        self.segment_length = segment_length
+        self.segments = segments
+        self._step = max(1, int(segment_length * (1 - overlap)))
+
+        # number of recent values the spectrum is calculated from
+        self.length = segment_length + (segments - 1) * self._step
+
+        # periodic Hann window, the last point of the symmetric one is left out
+        self._window = np.hanning(segment_length + 1)[:-1]
+        self._window_power = np.sum(self._window ** 2)
+        self._frequencies = np.fft.rfftfreq(segment_length)  # in cycles per sample
+
+        self._segments = np.empty((segments, segment_length))
+        self._power = np.empty((segments, segment_length // 2 + 1))
+        self._density = np.empty(segment_length // 2 + 1)
+
+    def calculate(self, x, y):
+        """Calculate the spectrum of the recent values y measured at times x.
+        NaN values marking gaps in data are skipped.
+        :return: frequencies in Hz and power spectral density,
+                 empty arrays if there are not enough values
+        """
+        x, y = x[-self.length:], y[-self.length:]
+        finite = np.isfinite(y)
+        if not finite.all():
+            x, y = x[finite], y[finite]
+        if len(y) < self.segment_length or x[-1] <= x[0]:
+            return np.empty(0), np.empty(0)
+
+        # sampling rate is estimated from timestamps, values are assumed to be evenly spaced
+        sampling_rate = (len(x) - 1) / (x[-1] - x[0])
+
+        segments = min(self.segments, (len(y) - self.segment_length) // self._step + 1)
+        windows = np.lib.stride_tricks.sliding_window_view(y, self.segment_length)[::self._step][-segments:]
+
+        # remove the mean of every segment and apply the window in the reused buffer
+        buffer = self._segments[:segments]
+        np.subtract(windows, windows.mean(axis=1, keepdims=True), out=buffer)
+        np.multiply(buffer, self._window, out=buffer)
+
+        power = self._power[:segments]
+        np.abs(np.fft.rfft(buffer, axis=1), out=power)
+        np.square(power, out=power)
+        np.mean(power, axis=0, out=self._density)
+
+        # one-sided density, DC and Nyquist frequency are not doubled
+        self._density /= sampling_rate * self._window_power
+        self._density[1:-1 if self.segment_length % 2 == 0 else None] *= 2
+
+        return self._frequencies * sampling_rate, self._density.copy()
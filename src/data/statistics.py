@@ -0,0 +1,201 @@
+import math
+from collections import deque
+
+# lengths of statistics windows in seconds, 0 stands for the whole session
+WINDOWS = (0, 10, 60, 300)
+
+
+def window_name(window):
+    """Get readable name of a statistics window."""
+    if not window:
+        return "Session"
+    if window % 60 == 0:
+        return f"Last {window // 60} min"
+    return f"Last {window} s"
+
+
+class RunningStatistics:
+    """Statistics of all values of a sensor.
+    Mean and variance are updated with Welford's algorithm,
+    so every value is processed in constant time and memory.
+    """
+
+    def __init__(self):
+        """Create empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._first_time = None
+        self._last_time = None
+
+    def add(self, times, values):
+        """Add values measured at the times."""
+        if not values:
+            return
+
+        count, mean, m2 = self.count, self.mean, self._m2
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+        self.count, self.mean, self._m2 = count, mean, m2
+
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+
+        if self._first_time is None:
+            self._first_time = times[0]
+        self._last_time = times[-1]
+
+    @property
+    def std(self):
+        """Get sample standard deviation."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+    @property
+    def rate(self):
+        """Get number of values per second."""
+        return _rate(self.count, self._first_time, self._last_time)
+
+
+class WindowStatistics:
+    """Statistics of values of a sensor measured during the last window seconds.
+    Values leaving the window are removed from the mean and variance by
+    reversed Welford's updates, minimum and maximum are kept at the front
+    of monotonic deques, so every value is added and removed in amortized
+    constant time.
+    """
+
+    def __init__(self, window):
+        """Create empty statistics of a window."""
+        self.window = window
+
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+
+        self._values = deque()  # (time, value) of values in the window
+        self._minimums = deque()  # increasing values, candidates for the minimum
+        self._maximums = deque()  # decreasing values, candidates for the maximum
+
+    def add(self, times, values):
+        """Add values measured at the times and forget values older than the window."""
+        if not values:
+            return
+
+        count, mean, m2 = self.count, self.mean, self._m2
+        minimums, maximums = self._minimums, self._maximums
+        for sample in zip(times, values):
+            value = sample[1]
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+
+            # later smaller value makes bigger earlier values useless and vice versa
+            while minimums and minimums[-1][1] >= value:
+                minimums.pop()
+            minimums.append(sample)
+            while maximums and maximums[-1][1] <= value:
+                maximums.pop()
+            maximums.append(sample)
+        self.count, self.mean, self._m2 = count, mean, m2
+
+        self._values.extend(zip(times, values))
+        self._expire(times[-1] - self.window)
+
+    def _expire(self, oldest_time):
+        """Remove values measured at or before the oldest time."""
+        while self._values and self._values[0][0] <= oldest_time:
+            _, value = self._values.popleft()
+            self.count -= 1
+            if self.count:
+                delta = value - self.mean
+                self.mean -= delta / self.count
+                self._m2 -= delta * (value - self.mean)
+            else:
+                self.mean = 0.0
+                self._m2 = 0.0
+
+        while self._minimums and self._minimums[0][0] <= oldest_time:
+            self._minimums.popleft()
+        while self._maximums and self._maximums[0][0] <= oldest_time:
+            self._maximums.popleft()
+
+    @property
+    def minimum(self):
+        """Get minimal value in the window."""
+        return self._minimums[0][1] if self._minimums else math.inf
+
+    @property
+    def maximum(self):
+        """Get maximal value in the window."""
+        return self._maximums[0][1] if self._maximums else -math.inf
+
+    @property
+    def std(self):
+        """Get sample standard deviation."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+    @property
+    def rate(self):
+        """Get number of values per second."""
+        if not self._values:
+            return 0.0
+        return _rate(self.count, self._values[0][0], self._values[-1][0])
+
+
+def _rate(count, first_time, last_time):
+    """Calculate number of values per second."""
+    if count < 2 or last_time <= first_time:
+        return 0.0
+    return (count - 1) / (last_time - first_time)
+
+
+class StatisticsEngine:
+    """Statistics of all sensors over the whole session and sliding windows."""
+
+    def __init__(self, windows=WINDOWS):
+        """Create an engine keeping statistics for the given windows."""
+        self.windows = windows
+        self._statistics = {}  # sensor -> statistics in the order of windows
+
+    def add(self, sensor, x, y):
+        """Add values of a sensor measured at times x.
+        NaN values marking gaps in data are skipped.
+        """
+        sensor_statistics = self._statistics.get(sensor)
+        if sensor_statistics is None:
+            sensor_statistics = self._statistics[sensor] = [
+                WindowStatistics(window) if window else RunningStatistics() for window in self.windows]
+
+        # NaN is the only value not equal to itself
+        if any(value != value for value in y):
+            kept = [index for index, value in enumerate(y) if value == value]
+            x = [x[index] for index in kept]
+            y = [y[index] for index in kept]
+
+        for statistics in sensor_statistics:
+            statistics.add(x, y)
+
+    def get(self, sensor, window=0):
+        """Get statistics of a sensor for a window or None if there are no values."""
+        sensor_statistics = self._statistics.get(sensor)
+        if sensor_statistics is None:
+            return None
+        return sensor_statistics[self.windows.index(window)]
+
+    def sensors(self):
+        """Get names of sensors with statistics."""
+        return list(self._statistics)
+
+    def clear(self):
+        """Remove all statistics."""
+        self._statistics.clear()
@@ -0,0 +1,68 @@
+import json
+import re
+
+# longer lines are not processed
+MAX_LINE_LENGTH = 6000
+
+TIMESTAMP_FORMAT = re.compile(r'^[0-9]{2}:[0-9]{2}:[0-9]{2}\.[0-9]{3}$')
+
+
+def check_correctness(data):
+    """Check if decoded data contains a timestamp and numeric sensor values."""
+    # check if obligatory fields are in data
+    if not isinstance(data, dict) or "timestamp" not in data or "sensors" not in data \
+            or not isinstance(data["sensors"], dict):
+        return False
+
+    # check if timestamp format is correct
+    if not isinstance(data["timestamp"], str) or not TIMESTAMP_FORMAT.match(data["timestamp"]):
+        return False
+
+    # check if values of sensors are numbers
+    for sensor_value in data["sensors"].values():
+        if not (isinstance(sensor_value, int) or isinstance(sensor_value, float)):
+            return False
+
+    return True
+
+
+def parse_line(line):
+    """Parse and validate a JSON data line.
+    throws ValueError if the line is too long or has wrong format
+    """
+    if len(line) > MAX_LINE_LENGTH:
+        raise ValueError("Line is too long: " + line[:MAX_LINE_LENGTH] + "...")
+
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        raise ValueError("Wrong format: " + line)
+
+    if not check_correctness(data):
+        raise ValueError("Wrong format: " + line)
+
+    return data
+
+
+def is_delta(data):
+    """Check if decoded data is a delta line."""
+    return data.get("delta") is True
+
+
+def full_line(data):
+    """Create a JSON line with all sensor values of decoded data, without the delta flag."""
+    return json.dumps({"timestamp": data["timestamp"], "sensors": data["sensors"]})
+
+
+def expand_delta(data, last_values):
+    """Complete sensor values of a delta line with last known values.
+    Lines with "delta": true carry only changed sensors, other lines
+    carry all sensors and replace the last known values.
+    """
+    if is_delta(data):
+        last_values.update(data["sensors"])
+        data["sensors"] = dict(last_values)
+    else:
+        last_values.clear()
+        last_values.update(data["sensors"])
+    return data
@@ -0,0 +1,94 @@
+class CellGrid:
+    """In-memory model of cells placed in a tab grid.
+    Cells are any objects with row, column, rowspan and colspan
+    attributes, they are indexed by their upper left position
+    and by every atomic (1x1) position they cover.
+    """
+
+    def __init__(self, cells=()):
+        """Create a grid model of the given cells."""
+        self.cells = {}
+        self._occupancy = {}  # cells covering atomic positions
+        for cell in cells:
+            self.add(cell)
+
+    @property
+    def width(self):
+        """Get column count of the grid."""
+        return max((cell.column + cell.colspan for cell in self.cells.values()), default=0)
+
+    @property
+    def height(self):
+        """Get row count of the grid."""
+        return max((cell.row + cell.rowspan for cell in self.cells.values()), default=0)
+
+    @staticmethod
+    def bounds(cells):
+        """Get upper left and lower right (exclusive) corners of the rectangle spanned by cells."""
+        top = min(cell.row for cell in cells)
+        left = min(cell.column for cell in cells)
+        bottom = max(cell.row + cell.rowspan for cell in cells)
+        right = max(cell.column + cell.colspan for cell in cells)
+        return (top, left), (bottom, right)
+
+    def cell_at(self, row, column):
+        """Get the cell covering an atomic position or None."""
+        return self._occupancy.get((row, column))
+
+    def add(self, cell):
+        """Add a cell to the grid."""
+        self.cells[cell.row, cell.column] = cell
+        for position in self._area(cell):
+            self._occupancy[position] = cell
+
+    def remove(self, cell):
+        """Remove a cell from the grid."""
+        del self.cells[cell.row, cell.column]
+        for position in self._area(cell):
+            del self._occupancy[position]
+
+    def move(self, cell, row, column, rowspan=1, colspan=1):
+        """Change position and span of a cell."""
+        self.remove(cell)
+        cell.row, cell.column, cell.rowspan, cell.colspan = row, column, rowspan, colspan
+        self.add(cell)
+
+    def is_rectangle(self, cells):
+        """Check if cells cover a rectangle without gaps.
+        Cells of the grid never overlap, so they cover the rectangle
+        they span exactly when their areas sum up to its area.
+        """
+        (top, left), (bottom, right) = self.bounds(cells)
+        return sum(cell.rowspan * cell.colspan for cell in cells) == (bottom - top) * (right - left)
+
+    def resize(self, width, height):
+        """Calculate changes needed to resize the grid.
+        Cells outside of the new grid are removed, cells crossing its
+        border are split into atomic (1x1) cells and the new space
+        is filled with atomic cells. The grid itself is not changed.
+        :return: cells to remove, cells to make atomic, positions of new atomic cells
+        """
+        removed = []
+        split = set()
+        for (row, column), cell in self.cells.items():
+            if row >= height or column >= width:
+                removed.append(cell)
+            elif row + cell.rowspan > height or column + cell.colspan > width:
+                split.add(cell)
+
+        # fill uncovered positions and the parts of split cells
+        added = []
+        for row in range(height):
+            for column in range(width):
+                cell = self.cell_at(row, column)
+                if cell is None or cell in split and (row != cell.row or column != cell.column):
+                    added.append((row, column))
+
+        return removed, list(split), added
+
+    @staticmethod
+    def _area(cell):
+        """Get atomic positions covered by a cell."""
+        return [(row, column)
+                for row in range(cell.row, cell.row + cell.rowspan)
+                for column in range(cell.column, cell.column + cell.colspan)]
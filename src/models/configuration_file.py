@@ -0,0 +1,232 @@
+import math
+import re
+
+from sqlalchemy import insert, select
+
+from src.models.editing_context import MAX_CELL_SENSORS
+from src.models.limits import configuration_limits
+from src.models.models import Configuration, Sensor, Tab, Cell, SensorCell, DISPLAY_MODES
+
+# version of the configuration file format
+FORMAT_VERSION = 1
+
+# fields of alarm thresholds of sensors
+THRESHOLD_FIELDS = ("low_threshold", "high_threshold", "rate_limit", "hysteresis")
+
+# cell titles follow the rule of the cell editor: 1-50 characters, not starting with a space
+CELL_TITLE_FORMAT = re.compile(r"[^ ].{0,49}")
+
+
+def export_configuration(db_session, name):
+    """Create a serializable description of a configuration.
+    throws ValueError if the configuration does not exist
+    """
+    layout = Configuration.load(db_session, name=name)
+    if layout is None:
+        raise ValueError(f"Configuration {name} does not exist!")
+
+    sensors = db_session.query(Sensor).filter(Sensor.configuration_id == layout.id) \
+        .order_by(Sensor.short_name).all()
+
+    return {
+        "format": FORMAT_VERSION,
+        "name": layout.name,
+        "show_unknown_sensors": layout.show_unknown_sensors,
+        "scalable_rendering": layout.scalable_rendering,
+        "sensors": [{"short_name": sensor.short_name, "name": sensor.name,
+                     "physical_value": sensor.physical_value, "physical_unit": sensor.physical_unit,
+                     "expression": sensor.expression, "low_threshold": sensor.low_threshold,
+                     "high_threshold": sensor.high_threshold, "rate_limit": sensor.rate_limit,
+                     "hysteresis": sensor.hysteresis}
+                    for sensor in sensors],
+        "tabs": [{"name": tab.name, "grid_width": tab.grid_width, "grid_height": tab.grid_height,
+                  "cells": [{"row": cell.row, "column": cell.column, "rowspan": cell.rowspan,
+                             "colspan": cell.colspan, "title": cell.title, "display_mode": cell.display_mode,
+                             "sensors": [sensor.short_name for sensor in cell.sensors]}
+                            for cell in tab.cells]}
+                 for tab in layout.tabs],
+    }
+
+
+def import_configuration(db_session, data, name=None):
+    """Create a configuration from its serializable description.
+    Everything is validated before inserting, rows are inserted in bulk
+    in the current transaction, committing is left to the caller.
+    throws ValueError with all found errors if the description is not valid
+    """
+    if not isinstance(data, dict) or data.get("format") != FORMAT_VERSION:
+        raise ValueError("Unsupported configuration file format!")
+
+    if name is None:
+        name = data.get("name", "")
+
+    # limits depend on the rendering mode, so the configuration is created first
+    configuration = Configuration(name=name, show_unknown_sensors=bool(data.get("show_unknown_sensors")),
+                                  scalable_rendering=bool(data.get("scalable_rendering")))
+
+    try:
+        sensors = data["sensors"]
+        tabs = data["tabs"]
+        errors = _validate(db_session, configuration, sensors, tabs)
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError("Configuration file has wrong structure!")
+
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    db_session.add(configuration)
+    db_session.flush()  # get id of the new configuration
+
+    if sensors:
+        db_session.execute(insert(Sensor), [
+            {"configuration_id": configuration.id, "short_name": sensor["short_name"], "name": sensor["name"],
+             "physical_value": sensor["physical_value"], "physical_unit": sensor["physical_unit"],
+             "expression": sensor.get("expression") or None, "low_threshold": sensor.get("low_threshold"),
+             "high_threshold": sensor.get("high_threshold"), "rate_limit": sensor.get("rate_limit"),
+             "hysteresis": sensor.get("hysteresis")}
+            for sensor in sensors])
+    if tabs:
+        db_session.execute(insert(Tab), [
+            {"configuration_id": configuration.id, "name": tab["name"],
+             "grid_width": tab["grid_width"], "grid_height": tab["grid_height"]}
+            for tab in tabs])
+
+    # map names to ids of inserted rows
+    sensor_ids = dict(db_session.execute(
+        select(Sensor.short_name, Sensor.id).where(Sensor.configuration_id == configuration.id)).all())
+    tab_ids = dict(db_session.execute(
+        select(Tab.name, Tab.id).where(Tab.configuration_id == configuration.id)).all())
+
+    cells = [{"tab_id": tab_ids[tab["name"]], "row": cell["row"], "column": cell["column"],
+              "rowspan": cell.get("rowspan", 1), "colspan": cell.get("colspan", 1), "title": cell.get("title"),
+              "display_mode": cell.get("display_mode", "time")}
+             for tab in tabs for cell in tab["cells"]]
+    if cells:
+        db_session.execute(insert(Cell), cells)
+
+    cell_ids = {(tab_id, row, column): cell_id for cell_id, tab_id, row, column in db_session.execute(
+        select(Cell.id, Cell.tab_id, Cell.row, Cell.column)
+        .join(Tab, Cell.tab_id == Tab.id)
+        .where(Tab.configuration_id == configuration.id)).all()}
+
+    sensor_cells = [{"sensor_id": sensor_ids[short_name],
+                     "cell_id": cell_ids[tab_ids[tab["name"]], cell["row"], cell["column"]]}
+                    for tab in tabs for cell in tab["cells"] for short_name in cell.get("sensors", [])]
+    if sensor_cells:
+        db_session.execute(insert(SensorCell), sensor_cells)
+
+    # relationships of the new object were created empty
+    db_session.expire(configuration, ["sensors", "tabs"])
+
+    return configuration
+
+
+def _validate(db_session, configuration, sensors, tabs):
+    """Get a list of errors of a configuration description."""
+    errors = []
+    limits = configuration_limits(configuration)
+
+    def check(prefix, validate, *arguments):
+        """Run model validation and collect its error."""
+        try:
+            validate(*arguments)
+        except ValueError as error:
+            errors.append(f"{prefix}{error}")
+
+    check("", Configuration.validate, configuration.name, True, db_session)
+
+    # duplicates are checked in memory, the configuration is new
+    sensor_types = {}
+    for sensor in sensors:
+        short_name = sensor["short_name"]
+        check(f"Sensor {short_name}: ", Sensor.validate, None, short_name, sensor["name"],
+              sensor["physical_value"], sensor["physical_unit"], False)
+        thresholds = [sensor.get(field) for field in THRESHOLD_FIELDS]
+        if all(value is None or (type(value) in (int, float) and math.isfinite(value)) for value in thresholds):
+            check(f"Sensor {short_name}: ", Sensor.validate_thresholds, *thresholds)
+        else:
+            errors.append(f"Sensor {short_name}: alarm thresholds should be numbers!")
+        if short_name in sensor_types:
+            errors.append(f"Sensor {short_name}: a sensor with such short name already exists!")
+        sensor_types[short_name] = (sensor["physical_value"], sensor["physical_unit"])
+
+    # expressions can use sensors defined later in the file
+    expressions = {sensor["short_name"]: sensor.get("expression") for sensor in sensors}
+    for sensor in sensors:
+        if sensor.get("expression"):
+            check(f"Sensor {sensor['short_name']}: ", Sensor.validate_expression, sensor["expression"],
+                  sensor["short_name"], None, None, expressions)
+
+    if len(sensors) > limits.sensors:
+        errors.append(f"Sensor count limit of {limits.sensors} is exceeded!")
+
+    tab_names = set()
+    graphs = 0
+    for tab in tabs:
+        tab_name = tab["name"]
+        check(f"Tab {tab_name}: ", Tab.validate, configuration, tab_name, tab["grid_width"], tab["grid_height"],
+              False)
+        if tab_name in tab_names:
+            errors.append(f"Tab {tab_name}: a tab with such name already exists!")
+        tab_names.add(tab_name)
+
+        errors.extend(_validate_cells(tab, sensor_types))
+        graphs += sum(len(cell.get("sensors", [])) for cell in tab["cells"])
+
+    if graphs > limits.graphs:
+        errors.append(f"Graph count limit of {limits.graphs} is exceeded!")
+
+    return errors
+
+
+def _validate_cells(tab, sensor_types):
+    """Get a list of errors of cells of a tab description."""
+    errors = []
+    prefix = f"Tab {tab['name']}: "
+    width, height = tab["grid_width"], tab["grid_height"]
+
+    # cells must cover the whole grid without overlapping
+    covered = set()
+    for cell in tab["cells"]:
+        row, column = cell["row"], cell["column"]
+        rowspan, colspan = cell.get("rowspan", 1), cell.get("colspan", 1)
+        cell_prefix = f"{prefix}Cell({row}, {column}): "
+
+        if rowspan < 1 or colspan < 1 or row < 0 or column < 0 \
+                or row + rowspan > height or column + colspan > width:
+            errors.append(cell_prefix + "cell is outside of the grid!")
+            continue
+
+        area = {(r, c) for r in range(row, row + rowspan) for c in range(column, column + colspan)}
+        if covered & area:
+            errors.append(cell_prefix + "cell overlaps another cell!")
+        covered |= area
+
+        if cell.get("display_mode", "time") not in DISPLAY_MODES:
+            errors.append(cell_prefix + "unknown display mode!")
+
+        cell_sensors = cell.get("sensors", [])
+        # empty cells can be left without a title
+        title = cell.get("title")
+        if title is None or title == "":
+            if cell_sensors:
+                errors.append(cell_prefix + "a cell with sensors should have a title!")
+        elif not isinstance(title, str) or not CELL_TITLE_FORMAT.fullmatch(title):
+            errors.append(cell_prefix + "title should be 1 to 50 characters long and cannot start with a space!")
+
+        if len(cell_sensors) > MAX_CELL_SENSORS:
+            errors.append(cell_prefix + f"sensor count limit of {MAX_CELL_SENSORS} is exceeded!")
+        if len(set(cell_sensors)) != len(cell_sensors):
+            errors.append(cell_prefix + "a sensor is assigned more than once!")
+
+        unknown = [short_name for short_name in cell_sensors if short_name not in sensor_types]
+        if unknown:
+            errors.append(cell_prefix + "unknown sensors " + ", ".join(unknown) + "!")
+        elif len({sensor_types[short_name] for short_name in cell_sensors}) > 1:
+            errors.append(cell_prefix + "only sensors with the same physical value and units "
+                                        "can be assigned to the same cell!")
+
+    if len(covered) != width * height:
+        errors.append(prefix + "cells do not cover the whole grid!")
+
+    return errors
@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, event
+
+# page cache of every connection in kibibytes
+CACHE_SIZE = 16384
+
+
+def create_database_engine(database="configurations.db"):
+    """Create an engine for the configurations database."""
+    engine = create_engine(f'sqlite:///{database}')
+    event.listen(engine, "connect", _set_pragmas)
+    event.listen(engine, "begin", _begin)
+    return engine
+
+
+def _set_pragmas(dbapi_connection, connection_record):
+    """Set up a new database connection."""
+    # let SQLAlchemy emit BEGIN itself, the driver's own transaction
+    # handling does not work with savepoints used by the editors
+    dbapi_connection.isolation_level = None
+
+    cursor = dbapi_connection.cursor()
+    # readers are not blocked by a writer in write-ahead log mode
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.execute(f"PRAGMA cache_size = -{CACHE_SIZE}")
+    cursor.close()
+
+
+def _begin(connection):
+    """Start a transaction."""
+    connection.exec_driver_sql("BEGIN")
@@ -0,0 +1,103 @@
+from sqlalchemy import func, inspect
+
+from src.models.limits import configuration_limits
+from src.models.models import Sensor, SensorCell
+
+# maximal number of sensors in a cell, there is a line color for each of them
+MAX_CELL_SENSORS = 10
+
+
+class ConfigurationEditingContext:
+    """Sensors and their cell assignments of a configuration being edited.
+    Everything is loaded once and updated incrementally, so that
+    assigning a sensor to a cell does not query all assignments again.
+    """
+
+    def __init__(self, db_session, configuration):
+        """Load sensors of the configuration."""
+        self._db_session = db_session
+        self._configuration = configuration
+        self._limits = configuration_limits(configuration)
+
+        self.sensors = {sensor.short_name: sensor for sensor in db_session.query(Sensor)
+                        .filter(Sensor.configuration == configuration)
+                        .order_by(Sensor.short_name)}
+
+        self._cell_sensors = {}  # cell -> {short name: sensor cell}, loaded on demand
+        self._graph_count = None  # loaded on demand
+
+    def cell_sensors(self, cell):
+        """Get sensors assigned to a cell sorted by short name."""
+        assignments = self._assignments(cell)
+        return [assignments[short_name].sensor for short_name in sorted(assignments)]
+
+    def unassigned_sensors(self, cell):
+        """Get sensors of the configuration not assigned to a cell sorted by short name."""
+        assignments = self._assignments(cell)
+        return [sensor for short_name, sensor in self.sensors.items() if short_name not in assignments]
+
+    def graph_count(self):
+        """Get number of sensor assignments in the configuration."""
+        if self._graph_count is None:
+            self._graph_count = self._db_session.query(func.count(SensorCell.id)) \
+                .join(Sensor) \
+                .filter(Sensor.configuration == self._configuration) \
+                .scalar()
+        return self._graph_count
+
+    def check_assignment(self, cell, sensor):
+        """Check if a sensor can be assigned to a cell.
+        throws ValueError if the assignment breaks a rule
+        """
+        assignments = self._assignments(cell)
+
+        if sensor.short_name in assignments:
+            raise ValueError("This sensor is already assigned to this cell!")
+
+        if len(assignments) >= MAX_CELL_SENSORS:
+            raise ValueError(f"Sensor count limit of {MAX_CELL_SENSORS} is reached for this cell!")
+
+        if self.graph_count() >= self._limits.graphs:
+            raise ValueError(f"Graph count limit of {self._limits.graphs} is reached for this configuration!")
+
+        # sensor type has to conform already assigned sensors
+        if assignments:
+            assigned_sensor = next(iter(assignments.values())).sensor
+            if assigned_sensor.physical_value != sensor.physical_value \
+                    or assigned_sensor.physical_unit != sensor.physical_unit:
+                raise ValueError("Only sensors with the same physical value and units can be "
+                                 "assigned to the same cell!")
+
+    def assign(self, cell, sensor):
+        """Assign a sensor to a cell."""
+        self._assignments(cell)[sensor.short_name] = SensorCell(sensor=sensor, cell=cell)
+        if self._graph_count is not None:
+            self._graph_count += 1
+
+    def unassign(self, cell, sensor):
+        """Remove a sensor assignment from a cell."""
+        sensor_cell = self._assignments(cell).pop(sensor.short_name, None)
+        if sensor_cell is not None:
+            if inspect(sensor_cell).pending:
+                self._db_session.flush()  # only persisted objects can be deleted
+            self._db_session.delete(sensor_cell)
+            if self._graph_count is not None:
+                self._graph_count -= 1
+
+    def cells_removed(self, cells):
+        """Forget assignments of deleted cells."""
+        for cell in cells:
+            assignments = self._cell_sensors.pop(cell, None)
+            if assignments is None:
+                # assignments are unknown, count them again when needed
+                self._graph_count = None
+            elif self._graph_count is not None:
+                self._graph_count -= len(assignments)
+
+    def _assignments(self, cell):
+        """Get sensor cells of a cell by sensor short name."""
+        if cell not in self._cell_sensors:
+            self._cell_sensors[cell] = {sensor_cell.sensor.short_name: sensor_cell
+                                        for sensor_cell in self._db_session.query(SensorCell)
+                                        .filter(SensorCell.cell == cell)}
+        return self._cell_sensors[cell]
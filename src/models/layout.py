@@ -0,0 +1,108 @@
+from collections import namedtuple
+
+
+class SensorLayout(namedtuple("SensorLayout", ["short_name", "name", "physical_value", "physical_unit",
+                                               "expression", "low_threshold", "high_threshold", "rate_limit",
+                                               "hysteresis"])):
+    """Immutable snapshot of a sensor."""
+    __slots__ = ()
+
+    def __str__(self):
+        """Create a string value of a sensor snapshot."""
+        return self.short_name
+
+
+class CellLayout(namedtuple("CellLayout", ["row", "column", "rowspan", "colspan", "title", "display_mode",
+                                           "sensors"])):
+    """Immutable snapshot of a cell with its sensors."""
+    __slots__ = ()
+
+
+class TabLayout(namedtuple("TabLayout", ["name", "grid_width", "grid_height", "cells"])):
+    """Immutable snapshot of a tab with its cells."""
+    __slots__ = ()
+
+    def __str__(self):
+        """Create a string value of a tab snapshot."""
+        return self.name
+
+
+class ConfigurationLayout(namedtuple("ConfigurationLayout", ["id", "name", "show_unknown_sensors",
+                                                             "scalable_rendering", "tabs", "derived_sensors",
+                                                             "alarm_sensors"])):
+    """Immutable snapshot of a configuration layout, detached from the database."""
+    __slots__ = ()
+
+    def __str__(self):
+        """Create a string value of a configuration snapshot."""
+        return self.name
+
+
+def _build_sensor_layout(sensor):
+    """Create a snapshot of a sensor."""
+    return SensorLayout(sensor.short_name, sensor.name, sensor.physical_value, sensor.physical_unit,
+                        sensor.expression, sensor.low_threshold, sensor.high_threshold, sensor.rate_limit,
+                        sensor.hysteresis)
+
+
+def build_layout(configuration):
+    """Create a layout snapshot of a configuration with loaded relationships."""
+    tabs = []
+    for tab in configuration.tabs:
+        cells = []
+        for cell in tab.cells:
+            sensors = tuple(_build_sensor_layout(sensor_cell.sensor) for sensor_cell in cell.cell_sensors)
+            cells.append(CellLayout(cell.row, cell.column, cell.rowspan, cell.colspan, cell.title,
+                                    cell.display_mode, sensors))
+        tabs.append(TabLayout(tab.name, tab.grid_width, tab.grid_height, tuple(cells)))
+
+    # derived sensors are computed even if they are not shown on any tab
+    derived_sensors = tuple(_build_sensor_layout(sensor) for sensor in configuration.sensors if sensor.expression)
+
+    # sensors with alarm thresholds
+    alarm_sensors = tuple(_build_sensor_layout(sensor) for sensor in configuration.sensors
+                          if sensor.low_threshold is not None or sensor.high_threshold is not None
+                          or sensor.rate_limit is not None)
+
+    return ConfigurationLayout(configuration.id, configuration.name, bool(configuration.show_unknown_sensors),
+                               bool(configuration.scalable_rendering), tuple(tabs), derived_sensors,
+                               alarm_sensors)
+
+
+class LayoutCache:
+    """Process-wide cache of configuration layouts.
+    Every configuration has a version counter which is increased
+    when the configuration or its tabs, cells or sensors change,
+    layouts stored for an older version are not returned.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._versions = {}
+        self._layouts = {}
+
+    def version(self, configuration_id):
+        """Get current version of a configuration."""
+        return self._versions.get(configuration_id, 0)
+
+    def get(self, configuration_id):
+        """Get a cached layout of the current configuration version or None."""
+        cached = self._layouts.get(configuration_id)
+        if cached is None or cached[0] != self.version(configuration_id):
+            return None
+        return cached[1]
+
+    def put(self, layout):
+        """Store a layout for the current configuration version."""
+        self._layouts[layout.id] = (self.version(layout.id), layout)
+
+    def invalidate(self, configuration_id):
+        """Mark cached layout of a configuration as outdated."""
+        if configuration_id is None:  # not saved yet, nothing is cached
+            return
+        self._versions[configuration_id] = self.version(configuration_id) + 1
+        self._layouts.pop(configuration_id, None)
+
+
+# layouts shared by all windows of the application
+layout_cache = LayoutCache()
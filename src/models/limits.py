@@ -0,0 +1,24 @@
+from collections import namedtuple
+
+
+class Limits(namedtuple("Limits", ["sensors", "graphs", "grid_width", "grid_height", "cells", "unknown_sensors"])):
+    """Size limits of a configuration."""
+    __slots__ = ()
+
+
+# every graph is a separate plot widget
+STANDARD_LIMITS = Limits(sensors=100, graphs=200, grid_width=10, grid_height=20, cells=100, unknown_sensors=100)
+
+# graphs of a tab are items of one shared canvas
+SCALABLE_LIMITS = Limits(sensors=1000, graphs=2000, grid_width=20, grid_height=50, cells=400,
+                         unknown_sensors=1000)
+
+
+def rendering_limits(scalable_rendering):
+    """Get limits of a rendering mode."""
+    return SCALABLE_LIMITS if scalable_rendering else STANDARD_LIMITS
+
+
+def configuration_limits(configuration):
+    """Get limits of a configuration according to its rendering mode."""
+    return rendering_limits(configuration is not None and configuration.scalable_rendering)
@@ -1,10 +1,22 @@
 import re
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, DateTime, insert, select, \
+    literal, func
+from sqlalchemy.orm import declarative_base, relationship, selectinload, aliased
+
+from src.data.expressions import Expression
+from src.models.layout import build_layout
+from src.models.limits import configuration_limits, rendering_limits
 
 Base = declarative_base()
 
+# how graphs of cells show their sensors
+DISPLAY_MODES = {
+    "time": "Time",
+    "fft": "Spectrum (FFT)",
+    "welch": "Spectrum (Welch PSD)",
+}
+
 
 class Configuration(Base):
     """Configuration model."""
@@ -15,6 +27,8 @@ class Configuration(Base):
     name = Column(String, nullable=False)
     show_unknown_sensors = Column(Boolean, nullable=False, default=False)
     active = Column(Boolean, nullable=False, default=False)
+    # draw graphs of a tab on one shared canvas, allows larger configurations
+    scalable_rendering = Column(Boolean, nullable=False, default=False)
 
     def __repr__(self):
         """Create string representation of a configuration object."""
@@ -41,21 +55,60 @@ class Configuration(Base):
 
         return True
 
+    @staticmethod
+    def validate_limits(db_session, configuration, scalable_rendering):
+        """Check if sensors, tabs and graphs of a configuration fit limits of a rendering mode."""
+        limits = rendering_limits(scalable_rendering)
+
+        sensor_count = db_session.query(func.count(Sensor.id)) \
+            .filter(Sensor.configuration == configuration).scalar()
+        if sensor_count > limits.sensors:
+            raise ValueError(f"Sensor count should be not more than {limits.sensors}!")
+
+        for tab in db_session.query(Tab).filter(Tab.configuration == configuration):
+            if tab.grid_width > limits.grid_width or tab.grid_height > limits.grid_height \
+                    or tab.grid_width * tab.grid_height > limits.cells:
+                raise ValueError(f"Grid of tab {tab.name} is too large, at most {limits.grid_width} columns, "
+                                 f"{limits.grid_height} rows and {limits.cells} cells are allowed!")
+
+        graph_count = db_session.query(func.count(SensorCell.id)).join(Sensor) \
+            .filter(Sensor.configuration == configuration).scalar()
+        if graph_count > limits.graphs:
+            raise ValueError(f"Graph count should be not more than {limits.graphs}!")
+
+        return True
+
     @staticmethod
     def load(db_session, name=None):
-        """Load active or selected configuration from DB."""
+        """Load layout of active or selected configuration from DB.
+        Tabs, cells and sensors are loaded in a constant number of queries
+        and returned as an immutable snapshot detached from the session.
+        """
+        # load the whole layout tree with one query per level
+        query = db_session.query(Configuration).options(
+            selectinload(Configuration.tabs)
+            .selectinload(Tab.cells)
+            .selectinload(Cell.cell_sensors)
+            .selectinload(SensorCell.sensor),
+            selectinload(Configuration.sensors)
+        )
+
         if name is None:
-            configuration = db_session.query(Configuration) \
-                .filter(Configuration.active == True).one_or_none()
+            configuration = query.filter(Configuration.active == True).one_or_none()
 
             if not configuration:
-                configuration = db_session.query(Configuration).filter(Configuration.name == "Default").one_or_none()
+                configuration = query.filter(Configuration.name == "Default").one_or_none()
+                if configuration is None:
+                    return None
                 configuration.active = True
                 db_session.commit()
+                configuration = query.filter(Configuration.id == configuration.id).one()
         else:
-            configuration = db_session.query(Configuration) \
-                .filter(Configuration.name == name).one_or_none()
-        return configuration
+            configuration = query.filter(Configuration.name == name).one_or_none()
+
+        if configuration is None:
+            return None
+        return build_layout(configuration)
 
     @staticmethod
     def activate(db_session, name):
@@ -74,6 +127,71 @@ class Configuration(Base):
         """Finds a configuration with a given name."""
         return db_session.query(Configuration).filter(Configuration.name == name).one_or_none()
 
+    @staticmethod
+    def copy(db_session, source_configuration, name):
+        """Create a copy of a configuration with all its sensors, tabs and cells.
+        Rows are copied with one INSERT ... SELECT statement per table
+        in the current transaction, committing is left to the caller.
+        throws ValueError if the name is not valid
+        """
+        Configuration.validate(name, db_session=db_session, check_for_duplicates=True)
+
+        configuration = Configuration(name=name, show_unknown_sensors=source_configuration.show_unknown_sensors,
+                                      scalable_rendering=source_configuration.scalable_rendering)
+        db_session.add(configuration)
+        db_session.flush()  # get id of the new configuration
+
+        source_id = source_configuration.id
+        new_id = literal(configuration.id)
+
+        db_session.execute(insert(Sensor).from_select(
+            ["configuration_id", "short_name", "name", "physical_value", "physical_unit", "expression",
+             "low_threshold", "high_threshold", "rate_limit", "hysteresis"],
+            select(new_id, Sensor.short_name, Sensor.name, Sensor.physical_value, Sensor.physical_unit,
+                   Sensor.expression, Sensor.low_threshold, Sensor.high_threshold, Sensor.rate_limit,
+                   Sensor.hysteresis)
+            .where(Sensor.configuration_id == source_id)
+        ))
+
+        db_session.execute(insert(Tab).from_select(
+            ["configuration_id", "name", "grid_width", "grid_height"],
+            select(new_id, Tab.name, Tab.grid_width, Tab.grid_height)
+            .where(Tab.configuration_id == source_id)
+        ))
+
+        # new tabs, cells and sensors are matched to the source
+        # ones by tab name, cell position and sensor short name
+        new_tab = aliased(Tab)
+        db_session.execute(insert(Cell).from_select(
+            ["tab_id", "row", "column", "rowspan", "colspan", "title", "display_mode"],
+            select(new_tab.id, Cell.row, Cell.column, Cell.rowspan, Cell.colspan, Cell.title, Cell.display_mode)
+            .join(Tab, Cell.tab_id == Tab.id)
+            .join(new_tab, (new_tab.configuration_id == configuration.id) & (new_tab.name == Tab.name))
+            .where(Tab.configuration_id == source_id)
+        ))
+
+        new_cell = aliased(Cell)
+        new_sensor = aliased(Sensor)
+        db_session.execute(insert(SensorCell).from_select(
+            ["sensor_id", "cell_id"],
+            select(new_sensor.id, new_cell.id)
+            .select_from(SensorCell)
+            .join(Cell, SensorCell.cell_id == Cell.id)
+            .join(Tab, Cell.tab_id == Tab.id)
+            .join(Sensor, SensorCell.sensor_id == Sensor.id)
+            .join(new_sensor, (new_sensor.configuration_id == configuration.id)
+                  & (new_sensor.short_name == Sensor.short_name))
+            .join(new_tab, (new_tab.configuration_id == configuration.id) & (new_tab.name == Tab.name))
+            .join(new_cell, (new_cell.tab_id == new_tab.id) & (new_cell.row == Cell.row)
+                  & (new_cell.column == Cell.column))
+            .where(Tab.configuration_id == source_id)
+        ))
+
+        # relationships of the new object were created empty
+        db_session.expire(configuration, ["sensors", "tabs"])
+
+        return configuration
+
 
 class SensorCell(Base):
     """Cell and Sensors NxM relationship model."""
@@ -105,6 +223,13 @@ class Sensor(Base):
     name = Column(String, nullable=False)
     physical_value = Column(String, nullable=False)
     physical_unit = Column(String, nullable=False)
+    # derived sensors are computed from other sensors by the expression instead of being measured
+    expression = Column(String, nullable=True)
+    # alarm thresholds, thresholds which are not set are not checked
+    low_threshold = Column(Float, nullable=True)
+    high_threshold = Column(Float, nullable=True)
+    rate_limit = Column(Float, nullable=True)  # maximal change of the value per second
+    hysteresis = Column(Float, nullable=True)  # margin the value has to get back by to clear an alarm
 
     configuration = relationship("Configuration", back_populates="sensors")
     cell_sensors = relationship("SensorCell", cascade="all,delete", back_populates="sensor")
@@ -119,8 +244,10 @@ class Sensor(Base):
 
     @staticmethod
     def validate(configuration, short_name, name, physical_value, physical_unit, check_for_duplicates=True,
-                 db_session=None):
-        """Check if given fields are valid."""
+                 db_session=None, expression=None):
+        """Check if given fields are valid.
+        Sensors used in the expression are checked only if db_session is given.
+        """
 
         # short name length
         if not 1 <= len(short_name) <= 10:
@@ -156,6 +283,82 @@ class Sensor(Base):
         if physical_unit and not physical_value:
             raise ValueError("Physical value cannot be empty while physical unit is set!")
 
+        if expression:
+            Sensor.validate_expression(expression, short_name, configuration, db_session)
+
+        return True
+
+    @staticmethod
+    def validate_expression(expression, short_name, configuration=None, db_session=None, sensors=None):
+        """Check if an expression of a derived sensor is valid.
+        Used sensors have to be measured sensors of the configuration,
+        they are looked up in the sensors dictionary {short name: expression}
+        or in the database if the dictionary is not given.
+        """
+        inputs = Expression(expression).sensors
+
+        if short_name in inputs:
+            raise ValueError("Expression cannot use the sensor itself!")
+
+        if sensors is None and db_session is not None:
+            sensors = dict(db_session.query(Sensor.short_name, Sensor.expression)
+                           .filter(Sensor.configuration == configuration)
+                           .filter(Sensor.short_name.in_(inputs)))
+        if sensors is None:
+            return True
+
+        unknown = sorted(inputs - set(sensors))
+        if unknown:
+            raise ValueError("Expression uses unknown sensors " + ", ".join(unknown) + "!")
+        if any(sensors[sensor] for sensor in inputs):
+            raise ValueError("Expression can use only measured sensors, not derived ones!")
+
+        return True
+
+    @staticmethod
+    def validate_dependents(db_session, sensor, short_name=None, expression=None):
+        """Check if derived sensors using a sensor stay valid after it is changed
+        to the given short name and expression, or deleted if short_name is None.
+        """
+        if sensor.id is None:
+            return True  # new sensors are not used yet
+
+        derived = db_session.query(Sensor.short_name, Sensor.expression) \
+            .filter(Sensor.configuration_id == sensor.configuration_id) \
+            .filter(Sensor.expression != None) \
+            .filter(Sensor.id != sensor.id).all()
+        dependents = []
+        for derived_name, derived_expression in derived:
+            try:
+                if sensor.short_name in Expression(derived_expression).sensors:
+                    dependents.append(derived_name)
+            except ValueError:
+                continue  # invalid expressions do not use any sensor
+        if not dependents:
+            return True
+
+        used_by = "Sensor is used by derived sensors " + ", ".join(sorted(dependents))
+        if short_name is None:
+            raise ValueError(used_by + ", it cannot be deleted!")
+        if short_name != sensor.short_name:
+            raise ValueError(used_by + ", its short name cannot be changed!")
+        if expression:
+            raise ValueError(used_by + ", it cannot be derived itself!")
+
+        return True
+
+    @staticmethod
+    def validate_thresholds(low_threshold, high_threshold, rate_limit, hysteresis):
+        """Check if alarm thresholds are valid, None means that a threshold is not set."""
+        if low_threshold is not None and high_threshold is not None and low_threshold >= high_threshold:
+            raise ValueError("Low threshold should be less than high threshold!")
+
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("Rate limit should be positive!")
+
+        if hysteresis is not None and hysteresis < 0:
+            raise ValueError("Hysteresis cannot be negative!")
+
         return True
 
 
@@ -208,16 +411,19 @@ class Tab(Base):
         if not 1 <= len(name) <= 30:
             raise ValueError("Name should be 1 to 30 characters long!")
 
+        # grid size depends on the rendering mode of the configuration
+        limits = configuration_limits(configuration)
+
         # grid width value
-        if not 1 <= grid_width <= 10:
-            raise ValueError("Column count should be an integer between 1 and 10!")
+        if not 1 <= grid_width <= limits.grid_width:
+            raise ValueError(f"Column count should be an integer between 1 and {limits.grid_width}!")
 
         # grid height value
-        if not 1 <= grid_height <= 20:
-            raise ValueError("Row count should be an integer between 1 and 10!")
+        if not 1 <= grid_height <= limits.grid_height:
+            raise ValueError(f"Row count should be an integer between 1 and {limits.grid_height}!")
 
-        if int(grid_height) * int(grid_width) > 100:
-            raise ValueError("Cell count should be not more than 100!")
+        if int(grid_height) * int(grid_width) > limits.cells:
+            raise ValueError(f"Cell count should be not more than {limits.cells}!")
 
         return True
 
@@ -238,6 +444,7 @@ class Cell(Base):
     rowspan = Column(Integer, nullable=False, default=1)
     colspan = Column(Integer, nullable=False, default=1)
     title = Column(String, nullable=True)
+    display_mode = Column(String, nullable=False, default="time")
 
     tab = relationship("Tab", back_populates="cells")
     cell_sensors = relationship("SensorCell", cascade="all,delete", back_populates="cell")
@@ -257,6 +464,39 @@ SensorCell.sensor = relationship("Sensor", back_populates="cell_sensors")
 SensorCell.cell = relationship("Cell", back_populates="cell_sensors")
 
 
+class Alarm(Base):
+    """Alarm log model."""
+    __tablename__ = 'alarm'
+
+    # table fields
+    id = Column(Integer, primary_key=True)
+    configuration_id = Column(Integer, ForeignKey('configuration.id', ondelete='CASCADE'),
+                              nullable=False)
+    sensor = Column(String, nullable=False)  # short name, the log outlives sensors
+    kind = Column(String, nullable=False)
+    raised = Column(Boolean, nullable=False)
+    seconds = Column(Float, nullable=False)  # timestamp of the value
+    value = Column(Float, nullable=False)
+    threshold = Column(Float, nullable=False)
+    log_datetime = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        """Create string representation of an alarm object."""
+        return f'Alarm({self.sensor}, {self.kind}, {self.raised})'
+
+    @staticmethod
+    def log(db_session, configuration_id, events, log_datetime):
+        """Add alarm events to the log with one bulk INSERT statement.
+        Committing is left to the caller.
+        """
+        if events:
+            db_session.execute(insert(Alarm), [
+                {"configuration_id": configuration_id, "sensor": event.sensor, "kind": event.kind,
+                 "raised": event.raised, "seconds": event.seconds, "value": event.value,
+                 "threshold": event.limit, "log_datetime": log_datetime}
+                for event in events])
+
+
 class Address(Base):
     """Adress model."""
     __tablename__ = 'address'
@@ -265,6 +505,9 @@ class Address(Base):
     id = Column(Integer, primary_key=True)
     ip_port = Column(String, nullable=False, unique=True)
     use_datetime = Column(DateTime, nullable=False)
+    protocol = Column(String, nullable=False, default="json")
+    compression = Column(String, nullable=False, default="none")
+    active = Column(Boolean, nullable=False, default=False)
 
     def __repr__(self):
         """Create string representation of an address object."""
@@ -0,0 +1,39 @@
+from bisect import bisect_left
+
+
+class PrefixSearchIndex:
+    """Names searchable by a case insensitive prefix.
+    Names are kept sorted by their lowercase form, so names starting
+    with the same prefix are neighbours and every search is just two
+    binary searches. A search extending the previous prefix (typing)
+    only looks inside the range found for the previous one.
+    """
+
+    def __init__(self, names=()):
+        """Create an index of names."""
+        pairs = sorted((name.lower(), name) for name in names)
+        self._keys = [key for key, name in pairs]
+        self.names = [name for key, name in pairs]
+
+        self._prefix = ""
+        self._range = (0, len(self.names))
+
+    def search(self, prefix):
+        """Find names starting with the prefix.
+        :return: range of positions of found names in the names list
+        """
+        prefix = prefix.lower()
+
+        if prefix.startswith(self._prefix):
+            low, high = self._range  # names of a longer prefix are among the previous ones
+        else:
+            low, high = 0, len(self.names)
+
+        if prefix:
+            low = bisect_left(self._keys, prefix, low, high)
+            # keys starting with the prefix are lower than the prefix with its last character incremented
+            high = bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), low, high)
+
+        self._prefix = prefix
+        self._range = (low, high)
+        return range(low, high)
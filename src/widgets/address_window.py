@@ -3,8 +3,9 @@ import datetime
 from PySide6.QtCore import Qt, QMargins, QRegularExpression
 from PySide6.QtGui import QFont, QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QHBoxLayout, QPushButton, \
-    QVBoxLayout, QComboBox, QMessageBox
+    QVBoxLayout, QComboBox, QMessageBox, QListWidget, QListWidgetItem
 
+from src.data.protocols import PROTOCOLS, COMPRESSIONS
 from src.models.models import Address
 
 
@@ -62,6 +63,30 @@ class AddressWindow(QWidget):
             )
         )
 
+        # create protocol field display
+        self._protocol_line = QComboBox()
+        for protocol, description in PROTOCOLS.items():
+            self._protocol_line.addItem(description, protocol)
+
+        # create compression field display
+        self._compression_line = QComboBox()
+        for compression, description in COMPRESSIONS.items():
+            self._compression_line.addItem(description, compression)
+
+        # show protocol of the selected address
+        self._address_line.currentTextChanged.connect(self._update_protocol)
+        self._update_protocol()
+
+        # create a list of sources used together in a session
+        self._sources_list = QListWidget()
+        self._sources_list.setAlternatingRowColors(True)
+        self._sources_list.setToolTip("Checked sources are connected at the same time.\n"
+                                      "If none is checked, the last saved source is used.")
+        for address in self._db_session.query(Address).order_by(Address.ip_port).all():
+            address_item = QListWidgetItem(str(address), self._sources_list)
+            address_item.setFlags(address_item.flags() | Qt.ItemIsUserCheckable)
+            address_item.setCheckState(Qt.Checked if address.active else Qt.Unchecked)
+
         # section of buttons
         self._buttons_layout = QHBoxLayout()
         self._buttons_layout.setContentsMargins(QMargins(10, 0, 10, 0))
@@ -83,6 +108,9 @@ class AddressWindow(QWidget):
         # add configuration data
         self._form_layout.addRow(self._title)
         self._form_layout.addRow("IP address:port", self._address_line)
+        self._form_layout.addRow("Protocol", self._protocol_line)
+        self._form_layout.addRow("Compression", self._compression_line)
+        self._form_layout.addRow("Session sources", self._sources_list)
         self._layout.addLayout(self._form_layout)
 
         self._layout.addStretch(1)  # move buttons to the bottom
@@ -90,10 +118,20 @@ class AddressWindow(QWidget):
         # add buttons
         self._layout.addLayout(self._buttons_layout)
 
+    def _update_protocol(self):
+        """Show protocol and compression used by the selected address."""
+        address = self._db_session.query(Address) \
+            .filter(Address.ip_port == self._address_line.currentText()).one_or_none()
+        if address:
+            self._protocol_line.setCurrentIndex(self._protocol_line.findData(address.protocol))
+            self._compression_line.setCurrentIndex(self._compression_line.findData(address.compression))
+
     def _save(self):
         """Create a sensor from data in the form."""
         # get data from the form
         new_address = self._address_line.currentText()
+        protocol = self._protocol_line.currentData()
+        compression = self._compression_line.currentData()
 
         # check if data is valid
         validation_passed = False
@@ -109,8 +147,22 @@ class AddressWindow(QWidget):
             address = self._db_session.query(Address).filter(Address.ip_port == new_address).one_or_none()
             if address:
                 address.use_datetime = datetime.datetime.now()
+                address.protocol = protocol
+                address.compression = compression
             else:
-                self._db_session.add(Address(ip_port=new_address, use_datetime=datetime.datetime.now()))
+                self._db_session.add(Address(ip_port=new_address, use_datetime=datetime.datetime.now(),
+                                             protocol=protocol, compression=compression))
+
+            # save which sources are used in a session;
+            # saved address is always one of them
+            active_addresses = {new_address}
+            for row in range(self._sources_list.count()):
+                address_item = self._sources_list.item(row)
+                if address_item.checkState() == Qt.Checked:
+                    active_addresses.add(address_item.text())
+
+            for address in self._db_session.query(Address).all():
+                address.active = address.ip_port in active_addresses
 
             self._db_session.commit()  # save changes
 
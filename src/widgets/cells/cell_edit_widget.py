@@ -3,16 +3,17 @@ from PySide6.QtGui import QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QVBoxLayout, \
     QLineEdit, QComboBox, QListWidget, QListWidgetItem, QMessageBox
 
-from src.models.models import Sensor, SensorCell
+from src.models.layout import layout_cache
+from src.models.models import DISPLAY_MODES
 
 
 class CellEditWidget(QWidget):
     """Widget for editing a cell."""
 
-    def __init__(self, db_session, cell):
+    def __init__(self, context, cell):
         """Create cell editing widget."""
         super().__init__()
-        self._db_session = db_session
+        self._context = context
         self._cell = cell
         self._configuration = cell.tab.configuration
 
@@ -32,11 +33,7 @@ class CellEditWidget(QWidget):
         self._title_line.setPlaceholderText("Title")
 
         # get sensors that are assigned to the cell
-        cell_sensors = self._db_session.query(Sensor) \
-            .join(SensorCell) \
-            .filter(SensorCell.cell == self._cell) \
-            .order_by(Sensor.short_name) \
-            .all()
+        cell_sensors = self._context.cell_sensors(self._cell)
 
         # make title editable if cell represents a sensor group
         self._title_line.setReadOnly(len(cell_sensors) <= 1)
@@ -48,6 +45,14 @@ class CellEditWidget(QWidget):
             QRegularExpressionValidator(QRegularExpression(r'[^ ].{0,49}'))
         )
 
+        # create display mode selection
+        self._display_mode_box = QComboBox()
+        for mode, mode_name in DISPLAY_MODES.items():
+            self._display_mode_box.addItem(mode_name, mode)
+        self._display_mode_box.setCurrentIndex(self._display_mode_box.findData(self._cell.display_mode))
+        self._display_mode_box.setToolTip("Spectra are calculated from the recent measurements.")
+        self._display_mode_box.currentIndexChanged.connect(self._update_display_mode)
+
         # create sensor search combo box
         self._sensors_search = QComboBox()
         self._sensors_search.setEditable(True)
@@ -87,6 +92,7 @@ class CellEditWidget(QWidget):
 
         # add widgets to layout
         self._layout.addWidget(self._title_line)
+        self._layout.addWidget(self._display_mode_box)
         self._layout.addWidget(self._sensors_search)
         self._layout.addWidget(self._sensors_list)
         self._layout.addLayout(self._buttons_layout)
@@ -99,34 +105,12 @@ class CellEditWidget(QWidget):
         self._sensors_list.clear()
         self._sensors_search.clear()
 
-        # get sensors that are assigned to the cell
-        cell_sensors = self._db_session.query(Sensor) \
-            .join(SensorCell) \
-            .filter(SensorCell.cell == self._cell) \
-            .order_by(Sensor.short_name) \
-            .all()
-
-        # add found sensors to the list
-        for sensor in cell_sensors:
-            sensor_item = QListWidgetItem(str(sensor), self._sensors_list)
-            sensor_item.setToolTip(f"Short Name: {sensor.short_name}\nName: {sensor.name}\n"
-                                   f"Physical Value: {sensor.physical_value}\n"
-                                   f"Physical Unit: {sensor.physical_unit}"
-                                   )
-
-        # get sensors of the configuration that are not in the cell
-        unassigned_sensors = self._db_session.query(Sensor) \
-            .filter(Sensor.configuration == self._configuration) \
-            .except_(
-            self._db_session.query(Sensor)
-                .join(SensorCell)
-                .filter(SensorCell.cell == self._cell)
-            ) \
-            .order_by(Sensor.short_name) \
-            .all()
-
-        # add found sensors to the search drop list
-        for sensor in unassigned_sensors:
+        # add sensors that are assigned to the cell to the list
+        for sensor in self._context.cell_sensors(self._cell):
+            self._add_list_item(sensor)
+
+        # add sensors of the configuration that are not in the cell to the search drop list
+        for sensor in self._context.unassigned_sensors(self._cell):
             self._sensors_search.addItem(str(sensor))
 
         self._sensors_search.setCurrentIndex(-1)
@@ -135,32 +119,61 @@ class CellEditWidget(QWidget):
         self._sensors_search.currentIndexChanged.connect(
             self._add_sensor)  # enable when done editing search list
 
+    def _add_list_item(self, sensor):
+        """Add a sensor to the cell sensors' list."""
+        sensor_item = QListWidgetItem(str(sensor), self._sensors_list)
+        sensor_item.setToolTip(f"Short Name: {sensor.short_name}\nName: {sensor.name}\n"
+                               f"Physical Value: {sensor.physical_value}\n"
+                               f"Physical Unit: {sensor.physical_unit}"
+                               )
+        self._sensors_list.sortItems()
+
+    def _clear_search(self, removed_sensor=None, inserted_sensor=None):
+        """Clear the search text without adding a sensor,
+        remove or insert a sensor in the search drop list if given."""
+        self._sensors_search.currentIndexChanged.disconnect(self._add_sensor)
+
+        if removed_sensor:
+            self._sensors_search.removeItem(self._sensors_search.findText(str(removed_sensor)))
+        if inserted_sensor:
+            # keep the list sorted by short name
+            index = 0
+            while index < self._sensors_search.count() \
+                    and self._sensors_search.itemText(index) < str(inserted_sensor):
+                index += 1
+            self._sensors_search.insertItem(index, str(inserted_sensor))
+
+        self._sensors_search.setCurrentIndex(-1)
+        self._sensors_search.setCurrentText("")
+        self._sensors_search.currentIndexChanged.connect(self._add_sensor)
+
     def _update_title(self):
         """Update cell title in the grid representation."""
         if self._title_line.text() != self._cell.title:
             # change empty title to [Sensor Type] Group
-            if self._title_line.text() == "":
+            cell_sensors = self._context.cell_sensors(self._cell)
+            if self._title_line.text() == "" and cell_sensors:
                 # get assigned sensor
-                assigned_sensor = self._db_session.query(Sensor) \
-                    .join(SensorCell) \
-                    .filter(SensorCell.cell == self._cell) \
-                    .first()
+                assigned_sensor = cell_sensors[0]
 
                 self._title_line.setText(assigned_sensor.physical_value + " Group")
 
             self._cell.title = self._title_line.text()
+            layout_cache.invalidate(self._configuration.id)
             self.parentWidget().update_cell_title(self._cell)
 
+    def _update_display_mode(self):
+        """Set how the graph of the cell shows its sensors."""
+        self._cell.display_mode = self._display_mode_box.currentData()
+        layout_cache.invalidate(self._configuration.id)
+
     def _add_sensor(self):
         """ Add the selected sensor to the cell """
         # get the short name of the sensor
         sensor_short_name = self._sensors_search.currentText()
 
-        # find the sensor in the DB
-        sensor = self._db_session.query(Sensor) \
-            .filter(Sensor.configuration == self._configuration) \
-            .filter(Sensor.short_name == sensor_short_name) \
-            .one_or_none()
+        # find the sensor in the configuration
+        sensor = self._context.sensors.get(sensor_short_name)
 
         # if sensor not found
         if not sensor:
@@ -170,69 +183,37 @@ class CellEditWidget(QWidget):
                                  "configuration!",
                                  QMessageBox.Ok, QMessageBox.Ok)
 
-            self._update_lists()  # clear changes to search combobox
+            self._clear_search()  # clear changes to search combobox
             return
 
-        # check if sensor is already assigned to the cell
-        assigned = self._db_session.query(SensorCell).filter(SensorCell.cell == self._cell) \
-            .filter(SensorCell.sensor == sensor).one_or_none()
-
-        if assigned:
+        # check cell and configuration limits and sensor type
+        cell_sensors = self._context.cell_sensors(self._cell)
+        try:
+            self._context.check_assignment(self._cell, sensor)
+        except ValueError as error:
             # show error message
-            QMessageBox.critical(self, "Error!", "This sensor is already assigned to this cell!",
-                                 QMessageBox.Ok, QMessageBox.Ok)
+            QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok, QMessageBox.Ok)
+            self._clear_search()
             return
 
-        # check for 10 sensor per cell limit
-        sensors_in_cell = self._db_session.query(SensorCell).filter(SensorCell.cell == self._cell).all()
-        if len(sensors_in_cell) >= 10:
-            # show error message
-            QMessageBox.critical(self, "Error!", "Sensor count limit of 10 is reached for this cell!",
-                                 QMessageBox.Ok, QMessageBox.Ok)
-            return
-
-        # check for 200 graphs in the configuration
-        total_graphs = self._db_session.query(SensorCell) \
-            .join(Sensor) \
-            .filter(Sensor.configuration == self._cell.tab.configuration) \
-            .all()
-        if len(total_graphs) >= 200:
-            # show error message
-            QMessageBox.critical(self, "Error!", "Graph count limit of 200 is reached for this configuration!",
-                                 QMessageBox.Ok, QMessageBox.Ok)
-            return
+        # create a SensorCell relationship object
+        self._context.assign(self._cell, sensor)
+        layout_cache.invalidate(self._configuration.id)
 
-        # check if sensor type conforms already assigned sensors
-        assigned_sensor = self._db_session.query(Sensor) \
-            .join(SensorCell) \
-            .filter(SensorCell.cell == self._cell) \
-            .first()
+        # set cell title
+        if cell_sensors:
+            # set title for sensor group
+            self._title_line.setText(f"{sensor.physical_value} Group")
 
-        # if there is a sensor assigned to the cell
-        # and its' type differs from the new sensor's type
-        if assigned_sensor and (assigned_sensor.physical_value != sensor.physical_value
-                                or assigned_sensor.physical_unit != sensor.physical_unit):
-            # show error message
-            QMessageBox.critical(self, "Error!",
-                                 "Only sensors with the same physical value and units can be "
-                                 "assigned to the same cell!",
-                                 QMessageBox.Ok, QMessageBox.Ok)
+            # allow title editing
+            self._title_line.setReadOnly(False)
         else:
-            # create a SensorCell relationship object
-            SensorCell(sensor=sensor, cell=self._cell)
-
-            # set cell title
-            if assigned_sensor:
-                # set title for sensor group
-                self._title_line.setText(f"{sensor.physical_value} Group")
+            # set title for single sensor
+            self._title_line.setText(sensor.name)
 
-                # allow title editing
-                self._title_line.setReadOnly(False)
-            else:
-                # set title for single sensor
-                self._title_line.setText(sensor.name)
-
-        self._update_lists()
+        # move the sensor from the search list to the cell sensors' list
+        self._clear_search(removed_sensor=sensor)
+        self._add_list_item(sensor)
 
     def _split_cell(self):
         """Split selected cell into atomic (1x1) cells."""
@@ -247,34 +228,25 @@ class CellEditWidget(QWidget):
             # sensor to delete is the first and only selected item
             sensor_short_name = selected_items[0].data(0)
             # get the sensor that is being removed
-            sensor = self._db_session.query(Sensor) \
-                .filter(Sensor.configuration == self._configuration) \
-                .filter(Sensor.short_name == sensor_short_name) \
-                .one_or_none()
-
-            # find SensorCell object to remove
-            sensor_cell_to_delete = self._db_session.query(SensorCell) \
-                .filter(SensorCell.cell == self._cell) \
-                .filter(SensorCell.sensor == sensor) \
-                .one_or_none()
+            sensor = self._context.sensors.get(sensor_short_name)
+            if sensor is None:
+                return
 
             # remove sensor assignment to the cell
-            if sensor_cell_to_delete:
-                self._db_session.delete(sensor_cell_to_delete)
-
-                # get sensors that are assigned to the cell
-                cell_sensors = self._db_session.query(Sensor) \
-                    .join(SensorCell) \
-                    .filter(SensorCell.cell == self._cell) \
-                    .order_by(Sensor.short_name) \
-                    .all()
-
-                # if cell represents a single sensor
-                if len(cell_sensors) == 1:
-                    # set cell title to sensor name
-                    self._title_line.setText(cell_sensors[0].name)
-                    self._title_line.setReadOnly(True)
-                elif len(cell_sensors) == 0:  # if cell has no sensors
-                    self._title_line.setText("")  # remove cell title
-
-                self._update_lists()
+            self._context.unassign(self._cell, sensor)
+            layout_cache.invalidate(self._configuration.id)
+
+            # get sensors that are assigned to the cell
+            cell_sensors = self._context.cell_sensors(self._cell)
+
+            # if cell represents a single sensor
+            if len(cell_sensors) == 1:
+                # set cell title to sensor name
+                self._title_line.setText(cell_sensors[0].name)
+                self._title_line.setReadOnly(True)
+            elif len(cell_sensors) == 0:  # if cell has no sensors
+                self._title_line.setText("")  # remove cell title
+
+            # move the sensor back to the search list
+            self._sensors_list.takeItem(self._sensors_list.row(selected_items[0]))
+            self._clear_search(inserted_sensor=sensor)
@@ -1,6 +1,10 @@
 from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QScrollArea, QGridLayout, \
     QSizePolicy, QMessageBox
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
 
+from src.models.cell_grid import CellGrid
+from src.models.editing_context import ConfigurationEditingContext
 from src.models.models import Cell, SensorCell
 from src.widgets.cells.cell_edit_widget import CellEditWidget
 
@@ -17,6 +21,10 @@ class CellGridManagementWidget(QWidget):
 
         self._selected_cells = set()  # set of selected cells
         self._cells = {}  # dictionary for buttons
+        self._grid = CellGrid()  # model of the cells
+
+        # sensors and their assignments shared by cell editing widgets
+        self._context = ConfigurationEditingContext(db_session, self._configuration)
 
         self._init_ui()  # initialize UI
 
@@ -43,55 +51,135 @@ class CellGridManagementWidget(QWidget):
         self._layout.addWidget(self._scroll_area)
         self._layout.addWidget(self._right_widget)
 
-    def update_grid(self):
-        """Update grid representation."""
-        self._clear_grid()  # clear the grid
-        self._fill_grid()  # and fill it according to DB session data
-
-    def _clear_grid(self):
-        """Delete all elements from grid layout."""
-        self._cells.clear()
-        self._selected_cells = set()
-        for i in range(self._grid_layout.count() - 1, -1, -1):
-            self._grid_layout.takeAt(i).widget().deleteLater()
-        self._grid_layout.deleteLater()
-        self._grid_widget.deleteLater()
-
-        self._grid_layout = QGridLayout()
-        self._grid_widget = QWidget()
-        self._grid_widget.setLayout(self._grid_layout)
-        self._scroll_area.setWidget(self._grid_widget)
-
     def _fill_grid(self):
         """Fill grid with cells."""
         cells = self._db_session.query(Cell).filter(Cell.tab == self._tab) \
             .order_by(Cell.row).order_by(Cell.column).all()
 
+        self._grid = CellGrid(cells)
         for cell in cells:
-            cell_button = QPushButton()
-            cell_button.setText(cell.title)
-            cell_button.setCheckable(True)
-            self._cells[(cell.row, cell.column)] = (cell_button, cell)
-
-            cell_button.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding))
-            cell_button.setMinimumSize(80, 40)
-            self._grid_layout.addWidget(cell_button, cell.row, cell.column, cell.rowspan,
-                                        cell.colspan)
-
-            # add cell selection management on button click
-            cell_button.toggled.connect(
-                (
-                    lambda cell_row, cell_column: lambda: self._press_cell_button(cell_row,
-                                                                                  cell_column)
-                )(cell.row, cell.column)
-            )
-
-        # set minimum height for rows
+            self._add_button(cell)
+
+        self._update_stretch()
+
+    def _add_button(self, cell):
+        """Add a button representing the cell to the grid."""
+        cell_button = QPushButton()
+        cell_button.setText(cell.title)
+        cell_button.setCheckable(True)
+        self._cells[(cell.row, cell.column)] = (cell_button, cell)
+
+        cell_button.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding))
+        cell_button.setMinimumSize(80, 40)
+        self._grid_layout.addWidget(cell_button, cell.row, cell.column, cell.rowspan,
+                                    cell.colspan)
+
+        # add cell selection management on button click
+        cell_button.toggled.connect(
+            (
+                lambda cell_row, cell_column: lambda: self._press_cell_button(cell_row,
+                                                                              cell_column)
+            )(cell.row, cell.column)
+        )
+
+    def _remove_button(self, cell):
+        """Remove the button representing the cell."""
+        cell_button, _ = self._cells.pop((cell.row, cell.column))
+        self._grid_layout.removeWidget(cell_button)
+        cell_button.deleteLater()
+
+    def _update_button_span(self, cell):
+        """Place the button of the cell according to its span."""
+        cell_button = self._cells[cell.row, cell.column][0]
+        self._grid_layout.removeWidget(cell_button)
+        self._grid_layout.addWidget(cell_button, cell.row, cell.column, cell.rowspan,
+                                    cell.colspan)
+
+    def _update_stretch(self):
+        """Stretch rows and columns of the grid, hide rows and columns beyond it."""
+        # the layout keeps row and column count after widgets are removed
+        height, width = self._grid.height, self._grid.width
         for row in range(self._grid_layout.rowCount()):
-            self._grid_layout.setRowMinimumHeight(row, 40)
-            self._grid_layout.setRowStretch(row, 1)
+            self._grid_layout.setRowMinimumHeight(row, 40 if row < height else 0)
+            self._grid_layout.setRowStretch(row, 1 if row < height else 0)
         for column in range(self._grid_layout.columnCount()):
-            self._grid_layout.setColumnStretch(column, 1)
+            self._grid_layout.setColumnStretch(column, 1 if column < width else 0)
+
+    def _clear_selection(self):
+        """Deselect all cells and remove the cell editing widget."""
+        for position in self._selected_cells:
+            cell_button = self._cells[position][0]
+            cell_button.blockSignals(True)
+            cell_button.setChecked(False)
+            cell_button.blockSignals(False)
+        self._selected_cells = set()
+
+        self._layout.removeWidget(self._right_widget)
+        self._right_widget.deleteLater()
+        self._right_widget = QWidget()
+        self._right_widget.setMinimumWidth(250)
+        self._right_widget.setMaximumWidth(250)
+        self._layout.addWidget(self._right_widget)
+
+    def resize(self, width, height):
+        """Resize the grid.
+        Changes are calculated by the grid model and applied with
+        batched delete and insert statements, only buttons
+        of affected cells are updated.
+        """
+        removed, split, added = self._grid.resize(width, height)
+        if not (removed or split or added):
+            return
+
+        self._clear_selection()
+
+        self._delete_cells(removed)
+
+        for cell in split:
+            self._grid.move(cell, cell.row, cell.column)
+            self._update_button_span(cell)
+
+        self._insert_cells(added)
+
+        self._update_stretch()
+
+    def _delete_cells(self, cells):
+        """Delete cells with their buttons."""
+        if not cells:
+            return
+
+        # load sensor assignments of all deleted cells at once,
+        # deletes are sent in one batch on the next flush
+        self._db_session.flush()  # assign ids to new cells
+        self._db_session.query(Cell).options(selectinload(Cell.cell_sensors)) \
+            .filter(Cell.id.in_([cell.id for cell in cells])).all()
+
+        for cell in cells:
+            self._remove_button(cell)
+            self._grid.remove(cell)
+            self._db_session.delete(cell)
+        self._context.cells_removed(cells)
+
+    def _insert_cells(self, positions):
+        """Create atomic cells at given positions with their buttons."""
+        if not positions:
+            return
+
+        self._db_session.flush()  # assign ids to new cells
+        known_ids = [cell.id for cell in self._grid.cells.values()]
+        self._db_session.execute(insert(Cell), [
+            {"tab_id": self._tab.id, "row": row, "column": column, "rowspan": 1, "colspan": 1}
+            for row, column in positions
+        ])
+
+        new_cells = self._db_session.query(Cell).filter(Cell.tab_id == self._tab.id) \
+            .filter(Cell.id.notin_(known_ids)).all()
+        for cell in new_cells:
+            self._grid.add(cell)
+            self._add_button(cell)
+
+        # cells of the tab were added bypassing the relationship
+        self._db_session.expire(self._tab, ["cells"])
 
     def _press_cell_button(self, row, column):
         """Manages cell selection when pressing cell buttons."""
@@ -116,7 +204,7 @@ class CellGridManagementWidget(QWidget):
 
             # get selected cell's coordinates
             row, column = next(iter(self._selected_cells))
-            self._right_widget = CellEditWidget(self._db_session, self._cells[(row, column)][1])
+            self._right_widget = CellEditWidget(self._context, self._cells[(row, column)][1])
         else:
             # set a cell merging widget
             self._set_cell_merging_widget()
@@ -138,80 +226,14 @@ class CellGridManagementWidget(QWidget):
 
     def _merge_selected_cells(self):
         """Merge selected cells if they are forming a rectangle."""
-
-        def is_rectangular_selection(selected_cells, all_cells, grid_size):
-            """Check if selected cells form a rectangle."""
-            # create empty grid selection
-            grid = [[False for column in range(grid_size[1])] for row in range(grid_size[0])]
-
-            def fill_cell(row, column, rowspan, colspan):
-                """Fill grid with selected cell as atomic cells."""
-                for i in range(row, row + rowspan):
-                    for j in range(column, column + colspan):
-                        grid[i][j] = True
-
-            def is_spanning_rectangle(grid, upper_left_cell, lower_right_cell):
-                """Check if selected cells create a rectangle
-                with given left upper and right lower corners."""
-                spanning_rectangle = True
-                for row in range(len(grid)):
-                    for column in range(len(grid[0])):
-                        # if cell is inside the spanning rectangle
-                        if upper_left_cell[0] <= row <= lower_right_cell[0] \
-                                and upper_left_cell[1] <= column <= lower_right_cell[1]:
-
-                            # it should be marked as selected
-                            # otherwise it's not a spanning rectangle
-                            if not grid[row][column]:
-                                spanning_rectangle = False
-                                break
-                        else:  # if it's outside the spanning rectangle
-                            # it should be marked as not selected
-                            # otherwise it's not a spanning rectangle
-                            if grid[row][column]:
-                                spanning_rectangle = False
-                                break
-
-                    if not spanning_rectangle:
-                        break  # stop if contradiction was found
-
-                return spanning_rectangle
-
-            # fill the grid of atomic cells (1 x 1) -
-            # are these cells in selection or not
-            for cell_position in selected_cells:
-                cell = all_cells[cell_position][1]
-                fill_cell(cell.row, cell.column, cell.rowspan, cell.colspan)
-
-            # find upper left atomic (1x1) cell
-            upper_left_corners = sorted(selected_cells)
-            upper_left_cell = upper_left_corners[0]
-
-            # find lower right atomic (1x1) cell
-            lower_right_corners = []
-            for cell_position in selected_cells:
-                cell = self._cells[cell_position][1]
-                # append lower right corner of each cell
-                lower_right_corners.append((cell.row + cell.rowspan, cell.column + cell.colspan))
-
-            lower_right_corners.sort()
-
-            # corner by 1 further from selection in each direction
-            lower_right_cell = lower_right_corners[-1]
-
-            # selected corner
-            lower_right_cell = lower_right_cell[0] - 1, lower_right_cell[1] - 1
-
-            return is_spanning_rectangle(grid, upper_left_cell, lower_right_cell)
-
         if len(self._selected_cells) < 2:
             # show error message
             QMessageBox.critical(self, "Error!", "Can merge only two or more cells!",
                                  QMessageBox.Ok, QMessageBox.Ok)
             return
 
-        if is_rectangular_selection(self._selected_cells, self._cells,
-                                    (self._tab.grid_height, self._tab.grid_width)):
+        cells = [self._cells[cell_coordinates][1] for cell_coordinates in self._selected_cells]
+        if self._grid.is_rectangle(cells):
             self._merge_cell_rectangle()
         else:
             QMessageBox.critical(self, "Error!", "Can merge only cells that form a rectangle!",
@@ -219,56 +241,32 @@ class CellGridManagementWidget(QWidget):
 
     def _merge_cell_rectangle(self):
         """Merge selected rectangle of cells into one cell."""
-        selected_cells = sorted(self._selected_cells)
-
-        # select a cell to be the one after merging (main cell)
-        for cell_coordinates in selected_cells:
-            cell = self._cells[cell_coordinates][1]
-            # check if cell contains sensors
-            has_sensor_assigned = self._db_session.query(SensorCell) \
-                .filter(SensorCell.cell == cell) \
-                .first()
-
-            # set the upper left cell with sensors as the main cell
-            if has_sensor_assigned:
-                main_cell = cell
-                break
-        else:  # if no such main cell is found,
-            # set left upper selected cell to be main cell
-            main_cell = self._cells[selected_cells[0]][1]
+        cells = [self._cells[cell_coordinates][1] for cell_coordinates in sorted(self._selected_cells)]
 
-        # calculate new (main) cell coordinates and span
-        upper_left_cell_coordinates = selected_cells[0]
-
-        # calculate lower right corner of the selection
-        lower_right_borders = []
-        for cell_coordinates in selected_cells:
-            cell = self._cells[cell_coordinates][1]
-            lower_right_borders.append((cell.row + cell.rowspan, cell.column + cell.colspan))
-        lower_right_borders.sort()
+        # find selected cells with sensors in one query
+        self._db_session.flush()  # assign ids to new cells
+        cells_with_sensors = {cell_id for cell_id, in self._db_session.query(SensorCell.cell_id)
+                              .filter(SensorCell.cell_id.in_([cell.id for cell in cells]))
+                              .distinct()}
 
-        lower_right_border = lower_right_borders[-1]
+        # select a cell to be the one after merging (main cell):
+        # the upper left cell with sensors or the upper left cell
+        main_cell = next((cell for cell in cells if cell.id in cells_with_sensors), cells[0])
 
-        rowspan = lower_right_border[0] - upper_left_cell_coordinates[0]
-        colspan = lower_right_border[1] - upper_left_cell_coordinates[1]
+        # calculate new (main) cell coordinates and span
+        (top, left), (bottom, right) = self._grid.bounds(cells)
 
-        # set main cell to span over all selected cells
-        main_cell.row = upper_left_cell_coordinates[0]
-        main_cell.column = upper_left_cell_coordinates[1]
-        main_cell.rowspan = rowspan
-        main_cell.colspan = colspan
+        self._clear_selection()
 
         # delete all selected cells except the main cell
-        self._db_session.query(Cell) \
-            .filter(Cell.tab == self._tab) \
-            .filter(Cell.row >= main_cell.row) \
-            .filter(Cell.row < main_cell.row + main_cell.rowspan) \
-            .filter(Cell.column >= main_cell.column) \
-            .filter(Cell.column < main_cell.column + main_cell.colspan) \
-            .filter(Cell.id != main_cell.id) \
-            .delete()
-
-        self.update_grid()
+        self._delete_cells([cell for cell in cells if cell is not main_cell])
+
+        # set main cell to span over all selected cells,
+        # its button is recreated at the new position
+        self._remove_button(main_cell)
+        self._grid.move(main_cell, top, left, bottom - top, right - left)
+        self._add_button(main_cell)
+
         self._cells[main_cell.row, main_cell.column][0].toggle()
 
     def split_selected_cell(self):
@@ -291,21 +289,20 @@ class CellGridManagementWidget(QWidget):
                                  QMessageBox.Ok)
             return
 
+        # remove cell selection
+        self._cells[cell.row, cell.column][0].toggle()
+
         # create all others atomic cells
-        for row in range(cell.row, cell.row + cell.rowspan):
-            for column in range(cell.column, cell.column + cell.colspan):
-                if row != cell.row or column != cell.column:
-                    # create an atomic cell
-                    Cell(tab=self._tab, row=row, column=column)
+        positions = [(row, column)
+                     for row in range(cell.row, cell.row + cell.rowspan)
+                     for column in range(cell.column, cell.column + cell.colspan)
+                     if row != cell.row or column != cell.column]
 
         # set upper left cell's rowspan and colspan to 1
-        cell.rowspan = 1
-        cell.colspan = 1
-
-        # remove cell selection
-        self._cells[cell.row, cell.column][0].toggle()
+        self._grid.move(cell, cell.row, cell.column)
+        self._update_button_span(cell)
 
-        self.update_grid()
+        self._insert_cells(positions)
 
     def update_cell_title(self, cell):
         """Update cell title in it's grid representation."""
@@ -2,7 +2,7 @@ from PySide6.QtCore import QMargins
 from PySide6.QtWidgets import QWidget, QVBoxLayout, \
     QLineEdit, QListWidget, QListWidgetItem, QLabel
 
-from src.models.models import Sensor, SensorCell
+from src.models.models import Sensor, SensorCell, DISPLAY_MODES
 
 
 class CellViewWidget(QWidget):
@@ -32,6 +32,11 @@ class CellViewWidget(QWidget):
         self._title_line.setReadOnly(True)
         self._title_line.setToolTip("Title can be set manually only for group of sensors.")
 
+        # create display mode field display
+        self._display_mode_line = QLineEdit()
+        self._display_mode_line.setText(DISPLAY_MODES.get(self._cell.display_mode, self._cell.display_mode))
+        self._display_mode_line.setReadOnly(True)
+
         # create added sensors' list
         self._sensors_list_label = QLabel("Sensors:")
         self._sensors_list = QListWidget()
@@ -54,5 +59,6 @@ class CellViewWidget(QWidget):
 
         # add widgets to layout
         self._layout.addWidget(self._title_line)
+        self._layout.addWidget(self._display_mode_line)
         self._layout.addWidget(self._sensors_list_label)
         self._layout.addWidget(self._sensors_list)
@@ -1,6 +1,7 @@
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 
+from src.models.layout import layout_cache
 from src.widgets.configurations.configuration_create_edit_widget import \
     ConfigurationCreateEditWidget
 from src.widgets.configurations.configuration_create_widget import ConfigurationCreateWidget
@@ -59,6 +60,7 @@ class ConfigurationSettingsWindow(QWidget):
 
         # commit tab and sensor changes if there are any
         self._db_session.commit()
+        layout_cache.invalidate(configuration.id)
 
         # show selected configuration;
         # set central widget to configuration view widget
@@ -3,7 +3,7 @@ from PySide6.QtGui import QFont, QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QComboBox, QMessageBox
 
-from src.models.models import Configuration, Tab, Sensor, Cell, SensorCell
+from src.models.models import Configuration
 
 
 class ConfigurationCreateCopyWidget(QWidget):
@@ -80,53 +80,6 @@ class ConfigurationCreateCopyWidget(QWidget):
         # add buttons
         self._layout.addLayout(self._buttons_layout)
 
-    def _copy_sensors(self, configuration, source_configuration):
-        """Copy sensors from the source to the new configuration."""
-        sensors = self._db_session.query(Sensor).filter(
-            Sensor.configuration == source_configuration).all()
-        for source_sensor in sensors:
-            Sensor(configuration=configuration, short_name=source_sensor.short_name,
-                   name=source_sensor.name,
-                   physical_value=source_sensor.physical_value,
-                   physical_unit=source_sensor.physical_unit)
-
-    def _copy_sensor_cells(self, cell, source_cell):
-        """Copy all data about sensors assigned to the cell
-        from source cell to the new cell."""
-        sensor_cells = self._db_session.query(SensorCell).filter(
-            SensorCell.cell == source_cell).all()
-
-        for sensor_cell in sensor_cells:
-            source_sensor = sensor_cell.sensor
-            # get the same sensor from new configuration
-            new_sensor = self._db_session.query(Sensor) \
-                .filter(Sensor.configuration == cell.tab.configuration) \
-                .filter(Sensor.short_name == source_sensor.short_name) \
-                .one_or_none()
-
-            if new_sensor:
-                SensorCell(sensor=new_sensor, cell=cell)
-
-    def _copy_cells(self, tab, source_tab):
-        """Copy all cells from source tab to the new tab."""
-        cells = self._db_session.query(Cell).filter(Cell.tab == source_tab).all()
-        for source_cell in cells:
-            cell = Cell(tab=tab, row=source_cell.row, column=source_cell.column,
-                        rowspan=source_cell.rowspan,
-                        colspan=source_cell.colspan, title=source_cell.title)
-
-            self._copy_sensor_cells(cell, source_cell)
-
-    def _copy_tabs(self, configuration, source_configuration):
-        """Copy all tabs from the source to the new configuration."""
-        tabs = self._db_session.query(Tab).filter(Tab.configuration == source_configuration).all()
-        for source_tab in tabs:
-            tab = Tab(configuration=configuration, name=source_tab.name,
-                      grid_width=source_tab.grid_width,
-                      grid_height=source_tab.grid_height)
-
-            self._copy_cells(tab, source_tab)
-
     def _save(self):
         """Create a new configuration based on
         chosen name and source configuration."""
@@ -145,38 +98,24 @@ class ConfigurationCreateCopyWidget(QWidget):
                                  QMessageBox.Ok, QMessageBox.Ok)  # show error message
             return
 
-        # check if data is valid
-        validation_passed = False
+        # create a new configuration with data
+        # copied from the source configuration
         try:
-            validation_passed = Configuration.validate(name, db_session=self._db_session,
-                                                       check_for_duplicates=True)
+            Configuration.copy(self._db_session, source_configuration, name)
         except ValueError as error:
             QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok,
                                  QMessageBox.Ok)  # show error message
+            return
 
-        if validation_passed:  # if data is valid
-            # create a new configuration with data
-            # copied from the source configuration
-            configuration = Configuration(
-                name=name, show_unknown_sensors=source_configuration.show_unknown_sensors)
-
-            # add manually, everything else
-            # gets added automatically due to FK
-            self._db_session.add(configuration)
-
-            # copy all data
-            self._copy_tabs(configuration, source_configuration)
-            self._copy_sensors(configuration, source_configuration)
-
-            # show success message
-            QMessageBox.information(self, "Success!",
-                                    f'Configuration {name} created successfully!',
-                                    QMessageBox.Ok, QMessageBox.Ok)
+        # show success message
+        QMessageBox.information(self, "Success!",
+                                f'Configuration {name} created successfully!',
+                                QMessageBox.Ok, QMessageBox.Ok)
 
-            self._db_session.commit()
+        self._db_session.commit()
 
-            # redirect to configuration index
-            self._return_to_configurations()
+        # redirect to configuration index
+        self._return_to_configurations()
 
     def _cancel(self):
         """Revert changes and open back
@@ -3,6 +3,7 @@ from PySide6.QtGui import QFont, QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QMessageBox, QCheckBox
 
+from src.models.layout import layout_cache
 from src.models.models import Configuration, Tab, Sensor
 from src.widgets.sensors.sensor_index_widget import SensorIndexWidget
 from src.widgets.tabs.tab_index_widget import TabIndexWidget
@@ -26,7 +27,7 @@ class ConfigurationCreateEditWidget(QWidget):
             self._edit_mode = True
         else:
             # create a new configuration to edit it later
-            self._configuration = Configuration(name="", show_unknown_sensors=False)
+            self._configuration = Configuration(name="", show_unknown_sensors=False, scalable_rendering=False)
             self._db_session.add(self._configuration)
             self._edit_mode = False
 
@@ -67,6 +68,12 @@ class ConfigurationCreateEditWidget(QWidget):
 
         self._show_unknown_sensors.clicked.connect(self._update_showing_unknown_sensors)
 
+        self._scalable_rendering = QCheckBox()
+        self._scalable_rendering.setChecked(self._configuration.scalable_rendering)
+        self._scalable_rendering.setToolTip("Draw graphs of a tab on one canvas, allows larger configurations")
+
+        self._scalable_rendering.clicked.connect(self._update_scalable_rendering)
+
         # create sensors and tabs display
         if self._edit_mode and not self._returned_to_creation:
             page = "edit"
@@ -102,6 +109,7 @@ class ConfigurationCreateEditWidget(QWidget):
         # add widgets to layout
         self._form_layout.addRow("Name:", self._name_line)
         self._form_layout.addRow("Show unknown sensors:", self._show_unknown_sensors)
+        self._form_layout.addRow("Scalable rendering:", self._scalable_rendering)
         self._layout.addLayout(self._form_layout)
         self._layout.addLayout(self._sensors_and_tabs_layout)
 
@@ -118,11 +126,17 @@ class ConfigurationCreateEditWidget(QWidget):
         show = self._show_unknown_sensors.isChecked()
         self._configuration.show_unknown_sensors = show
 
+    def _update_scalable_rendering(self):
+        """Update rendering mode, it changes limits of tabs being edited."""
+        scalable = self._scalable_rendering.isChecked()
+        self._configuration.scalable_rendering = scalable
+
     def _save(self):
         """Save configuration from data in the form."""
         # get data from the form
         name = self._name_line.text()
         include_unknown_sensor_tab = self._show_unknown_sensors.isChecked()
+        scalable_rendering = self._scalable_rendering.isChecked()
 
         # check for duplicates is needed
         # only when configuration name gets changed
@@ -145,6 +159,15 @@ class ConfigurationCreateEditWidget(QWidget):
                                      QMessageBox.Ok)
                 validation_passed = False
 
+        if validation_passed:
+            # a standard configuration cannot keep what only fits the scalable one
+            try:
+                Configuration.validate_limits(self._db_session, self._configuration, scalable_rendering)
+            except ValueError as error:
+                QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok,
+                                     QMessageBox.Ok)  # show error message
+                validation_passed = False
+
         if validation_passed:
             sensors = self._db_session.query(Sensor).filter(Sensor.configuration == self._configuration).all()
             if not sensors:
@@ -156,6 +179,7 @@ class ConfigurationCreateEditWidget(QWidget):
             # set data to created/edited configuration object
             self._configuration.name = name
             self._configuration.show_unknown_sensors = include_unknown_sensor_tab
+            self._configuration.scalable_rendering = scalable_rendering
 
             # set message according to selected mode (create or edit)
             if self._edit_mode and not self._returned_to_creation:
@@ -168,6 +192,7 @@ class ConfigurationCreateEditWidget(QWidget):
                                     QMessageBox.Ok, QMessageBox.Ok)
 
             self._db_session.commit()
+            layout_cache.invalidate(self._configuration.id)
 
             # redirect to configuration index
             self._return_to_configurations()
@@ -1,9 +1,9 @@
 from PySide6.QtCore import Qt, QMargins
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLineEdit, \
-    QLabel, QHBoxLayout, QPushButton
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QHBoxLayout, QPushButton
 
 from src.models.models import Configuration
+from src.widgets.search_list_view import SearchListView
 
 
 class ConfigurationIndexWidget(QWidget):
@@ -34,20 +34,12 @@ class ConfigurationIndexWidget(QWidget):
         self._search_line_edit.setPlaceholderText("Search")
         self._search_line_edit.textChanged.connect(self._search)
 
-        # create a list widget for configurations
-        self._configurations_list = QListWidget()
-        self._configurations_list.setAlternatingRowColors(True)
-
-        # get all configurations from DB
-        all_configurations = self._db_session.query(Configuration) \
-            .order_by(Configuration.name).all()
-
-        # add configurations to the list widget
-        for configuration in all_configurations:
-            QListWidgetItem(str(configuration), self._configurations_list)
+        # create a list of names of all configurations from DB
+        configuration_names = [name for name, in self._db_session.query(Configuration.name)]
+        self._configurations_list = SearchListView(configuration_names)
 
         # show selected configuration on double click
-        self._configurations_list.itemDoubleClicked.connect(self._show_list_item_configuration)
+        self._configurations_list.doubleClicked.connect(self._show_list_item_configuration)
 
         # section of buttons
         self._buttons_layout = QHBoxLayout()
@@ -78,16 +70,8 @@ class ConfigurationIndexWidget(QWidget):
 
     def _search(self, search_string):
         """Filter configurations by the search string."""
-
-        # get configurations which name starts with the search_string
-        search_string = "{}%".format(search_string)
-        filtered_configurations = self._db_session.query(Configuration).filter(
-            Configuration.name.like(search_string)).order_by(Configuration.name).all()
-
-        # clear current list and fill it with filtered configurations
-        self._configurations_list.clear()
-        for configuration in filtered_configurations:
-            QListWidgetItem(str(configuration), self._configurations_list)
+        # show configurations which name starts with the search_string
+        self._configurations_list.search(search_string)
 
     def _create_configuration(self):
         """Open configuration creation page."""
@@ -95,25 +79,22 @@ class ConfigurationIndexWidget(QWidget):
 
     def _load_selected_configuration(self):
         """Set selected configuration as active and load it."""
-        # get selected items
-        selected_items = self._configurations_list.selectedItems()
-        if selected_items:
-            # take the first and only item
-            configuration_name = selected_items[0].data(0)
+        configuration_name = self._configurations_list.selected_name()
+        if configuration_name is not None:
             self.parentWidget().activate_configuration(configuration_name)
 
     def _show_selected_configuration(self):
         """Open view page for the selected configuration."""
-        # get selected items
-        selected_items = self._configurations_list.selectedItems()
-        if selected_items:
-            # show the first and only item
-            self._show_list_item_configuration(selected_items[0])
-
-    def _show_list_item_configuration(self, list_item):
-        """Open view page for the selected/clicked configuration."""
-        # get selected configuration name
-        configuration_name = list_item.data(0)
+        configuration_name = self._configurations_list.selected_name()
+        if configuration_name is not None:
+            self._show_configuration(configuration_name)
+
+    def _show_list_item_configuration(self, list_index):
+        """Open view page for the clicked configuration."""
+        self._show_configuration(list_index.data())
+
+    def _show_configuration(self, configuration_name):
+        """Open view page for the configuration with the given name."""
 
         # find configuration in DB
         configuration = self._db_session.query(Configuration) \
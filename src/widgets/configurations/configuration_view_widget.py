@@ -3,6 +3,7 @@ from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QCheckBox, QMessageBox
 
+from src.models.layout import layout_cache
 from src.widgets.sensors.sensor_index_widget import SensorIndexWidget
 from src.widgets.tabs.tab_index_widget import TabIndexWidget
 
@@ -43,6 +44,9 @@ class ConfigurationViewWidget(QWidget):
         self._show_unknown_sensors = QCheckBox()
         self._show_unknown_sensors.setChecked(self._configuration.show_unknown_sensors)
 
+        self._scalable_rendering = QCheckBox()
+        self._scalable_rendering.setChecked(self._configuration.scalable_rendering)
+
         # create sensors and tabs display
         self._sensors_and_tabs_layout = QHBoxLayout()
 
@@ -87,6 +91,7 @@ class ConfigurationViewWidget(QWidget):
         self._form_layout.addRow(self._title)
         self._form_layout.addRow("Name:", self._name_line)
         self._form_layout.addRow("Show unknown sensors:", self._show_unknown_sensors)
+        self._form_layout.addRow("Scalable rendering:", self._scalable_rendering)
 
         self._layout.addLayout(self._form_layout)
         self._layout.addLayout(self._sensors_and_tabs_layout)
@@ -113,6 +118,7 @@ class ConfigurationViewWidget(QWidget):
         # if confirmed, remove configuration and return to configurations
         if confirmation == QMessageBox.Yes:
             self._db_session.delete(self._configuration)
+            layout_cache.invalidate(self._configuration.id)
 
             self._return_to_configurations()
 
@@ -1,79 +1,59 @@
-from PySide6.QtWidgets import QWidget, QGridLayout, QHBoxLayout, QScrollArea, QSizePolicy
+from PySide6.QtWidgets import QWidget, QHBoxLayout
 
-from src.widgets.graphs.graph_widget import GraphWidget
+from src.widgets.graphs.virtual_graph_grid import VirtualGraphGrid
 
 
 class GraphPageWidget(QWidget):
     """Visual representation of a tab."""
 
-    def __init__(self, tab):
-        """Create graph page (tab)."""
+    def __init__(self, tab, series_store, statistics, alarms, scalable=False):
+        """Create graph page (tab).
+        A scalable page draws all graphs on one canvas
+        instead of creating a plot widget for every graph.
+        """
         super().__init__()
 
         self._tab = tab
+        self._series_store = series_store
+        self._statistics = statistics
+        self._alarms = alarms
+        self._scalable = scalable
 
         self.init_ui()
 
     def init_ui(self):
         """Initialize UI."""
-
-        self._scroll_area = QScrollArea()
         main_layout = QHBoxLayout(self)
         self.setLayout(main_layout)
-        main_layout.addWidget(self._scroll_area)
-        self._grid_layout = QGridLayout()
-        widget = QWidget()
-        widget.setLayout(self._grid_layout)
-        self._scroll_area.setWidget(widget)
-        self._scroll_area.setWidgetResizable(True)
+
+        # graphs are created only when they are scrolled to
+        self._grid = VirtualGraphGrid(self._series_store, self._statistics, self._alarms,
+                                      scalable=self._scalable)
+        main_layout.addWidget(self._grid)
 
         self._fill_grid()
 
     def _fill_grid(self):
-        """Fill grid with graph widgets."""
-        self._graph_widgets = []
+        """Fill grid with places for graphs."""
+        self._grid.set_grid_size(self._tab.grid_width, self._tab.grid_height)
         for cell in self._tab.cells:
-            # if cell contains sensors create graph widget
-            # otherwise use a placeholder
-            if cell.cell_sensors:
-                widget = GraphWidget(cell)
-                size_policy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-                size_policy.setHeightForWidth(True)
-                widget.setSizePolicy(size_policy)
-                self._graph_widgets.append(widget)
-            else:
-                widget = QWidget()
-                widget.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding))
-
-            self._grid_layout.addWidget(widget, cell.row, cell.column, cell.rowspan, cell.colspan)
-
-        # set minimum height for rows
-        for row in range(self._grid_layout.rowCount()):
-            self._grid_layout.setRowMinimumHeight(row, 250)
-            self._grid_layout.setRowStretch(row, 1)
+            # if cell contains sensors it gets a graph,
+            # otherwise it stays blank
+            self._grid.add_slot(cell.row, cell.column, cell.rowspan, cell.colspan,
+                                cell=cell if cell.sensors else None)
 
-        # set minimum width for columns
-        for column in range(self._grid_layout.columnCount()):
-            self._grid_layout.setColumnMinimumWidth(column, 375)
-            self._grid_layout.setColumnStretch(column, 1)
+    def get_sensors(self):
+        """Get names of sensors shown on the page."""
+        return {str(sensor) for cell in self._tab.cells for sensor in cell.sensors}
 
-    def get_graphs(self):
-        """Get list of graph widgets for sensors."""
-        graphs = {}
-        for graph_widget in self._graph_widgets:
-            sensors = graph_widget.get_sensor_list()
-            for sensor in sensors:
-                if str(sensor) in graphs:
-                    graphs[str(sensor)].append(graph_widget)
-                else:
-                    graphs[str(sensor)] = [graph_widget]
-        return graphs
+    def update_graphs(self):
+        """Redraw visible graphs with new points."""
+        self._grid.update_graphs()
 
-    def _clear_grid(self):
-        """Delete all elements from grid layout."""
-        for i in range(self._grid_layout.count() - 1, -1, -1):
-            self._grid_layout.takeAt(i).widget().deleteLater()
+    def show_statistics(self, window):
+        """Show statistics of a window on the graphs, window None hides them."""
+        self._grid.show_statistics(window)
 
     def close(self):
         """Clear grid on closing."""
-        self._clear_grid()
+        self._grid.clear()
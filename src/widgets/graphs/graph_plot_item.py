@@ -0,0 +1,239 @@
+import re
+
+from pyqtgraph import PlotItem, mkPen, LegendItem, LabelItem
+
+
+class GraphPlotItem(PlotItem):
+    """Plot of sensor measurements of a cell.
+    It is shown either by its own GraphWidget or
+    together with other plots on a shared canvas.
+    """
+
+    # define size constants
+    # width can be grater than 1000, but
+    # all labels will be scaled as if width is 1000 in such case
+    # same for height
+    MINIMAL_WIDTH = 375
+    MAXIMAL_WIDTH = 1500
+
+    MINIMAL_HEIGHT = 250
+    MAXIMAL_HEIGHT = 1000
+
+    TITLE_MIN_SIZE = 14
+    TITLE_MAX_SIZE = 22
+
+    LABEL_MIN_SIZE = 10
+    LABEL_MAX_SIZE = 18
+
+    BOTTOM_LABEL = "Time, s"
+
+    def __init__(self, cell, unknown_sensor=None, *args, **kwargs):
+        """Create graph plot."""
+        super().__init__(*args, **kwargs)
+
+        self._cell = cell
+
+        # set title and time axis
+        if unknown_sensor:
+            self._title = unknown_sensor
+        else:
+            self._title = cell.title
+        self.setTitle(self._title, color='#444444', size='18pt')
+        self.setLabel('bottom', self.BOTTOM_LABEL, **{'color': '#444444', 'font-size': '14pt'})
+        self._text_sizes = None  # title and label sizes set on the last resize
+
+        if not unknown_sensor:
+            self.colspan = self._cell.colspan
+            # get sensors of the cell and set left label
+            self._sensors = list(cell.sensors)
+
+            value, unit = self._sensors[0].physical_value, self._sensors[0].physical_unit
+            if value == "-":
+                value = ""
+            if unit == "-" or unit == "":
+                unit = ""
+            else:
+                unit = ", " + unit
+
+            self._left_label_text = value + unit
+            if len(self._left_label_text) > 30:
+                self._split_left_label()
+
+            self.setLabel('left', self._left_label_text, **{'color': '#444444', 'font-size': '14pt',
+                                                            'overflow-wrap': 'break-word'})
+        else:
+            self._left_label_text = None
+            self.colspan = 1
+        # set grid and autorange
+        self.showGrid(x=True, y=True)
+        self.getViewBox().enableAutoRange()
+
+        # disable ViewBox menu
+        self.setMenuEnabled(enableMenu=False)  # disable viewBox menu
+        self.setMenuEnabled(enableMenu=True, enableViewBoxMenu=None)
+
+        colors = ["#2f4b7c", "#a05195", "#d45087", "#f95d6a", "#ff7c43",
+                  "#ffa600", "#003f5c", "#2f4b7c", "#4fa511", "#006aff"]
+
+        # set data lines
+        self._data_lines = {}
+        self._shown_lengths = {}  # number of points of each line shown
+        if not unknown_sensor:
+            sensor_number = 0
+            if len(self._sensors) > 1:
+                legend = LegendItem(offset=(60, 30), brush="eeeeee70")
+                legend.setParentItem(self)
+            for sensor in self._sensors:
+                color = colors[sensor_number]
+                self._data_lines[sensor.short_name] = self.plot(name=sensor.name,
+                                                                pen=mkPen(color, width=2))
+
+                if len(self._sensors) > 1:
+                    legend.addItem(self._data_lines[sensor.short_name], sensor.name)
+                self._shown_lengths[sensor.short_name] = 0
+
+                sensor_number += 1
+        else:
+            self._sensors = None
+            self._data_lines[unknown_sensor] = self.plot(name=unknown_sensor, pen=mkPen(colors[0], width=2))
+            self._shown_lengths[unknown_sensor] = 0
+
+        # statistics overlay is created when it is shown the first time
+        self._statistics_label = None
+        self._shown_statistics = None  # window and line lengths of shown statistics
+
+        # plot is highlighted while a sensor of it has an active alarm
+        self._alarm_revision = None  # revision of alarm states last checked
+        self._alarmed = False
+
+    def show_series(self, series_store):
+        """Redraw lines which got new points in the series store."""
+        for line, data_line in self._data_lines.items():
+            length = series_store.length(line)
+            if length != self._shown_lengths[line]:
+                self._shown_lengths[line] = length
+
+                # lines are broken at NaN values marking gaps in data
+                data_line.setData(*series_store.series(line), connect="finite")
+
+    def show_statistics(self, statistics, window=None):
+        """Show statistics of the lines for a window in the corner of the plot.
+        Statistics are hidden if window is None.
+        """
+        # statistics change only with new points
+        shown_statistics = None if window is None else (window, tuple(self._shown_lengths.values()))
+        if shown_statistics == self._shown_statistics:
+            return
+        self._shown_statistics = shown_statistics
+
+        if window is None:
+            self._statistics_label.setVisible(False)
+            return
+
+        if self._statistics_label is None:
+            self._statistics_label = LabelItem(justify="right")
+            self._statistics_label.setParentItem(self.getViewBox())
+            self._statistics_label.anchor(itemPos=(1, 0), parentPos=(1, 0), offset=(-10, 10))
+
+        rows = []
+        for line in self._data_lines:
+            line_statistics = statistics.get(line, window)
+            if line_statistics is None or line_statistics.count == 0:
+                row = "no data"
+            else:
+                row = f"min {line_statistics.minimum:.4g}, max {line_statistics.maximum:.4g}, " \
+                      f"mean {line_statistics.mean:.4g}, std {line_statistics.std:.4g}"
+            if len(self._data_lines) > 1:
+                row = f"{line}: {row}"
+            rows.append(row)
+
+        self._statistics_label.setText("<br>".join(rows), color="#444444", size="9pt")
+        self._statistics_label.setVisible(True)
+
+    def show_alarms(self, alarms):
+        """Highlight the plot while a sensor of it has an active alarm."""
+        if alarms.revision == self._alarm_revision:
+            return
+        self._alarm_revision = alarms.revision
+
+        alarmed = not alarms.active_sensors.isdisjoint(self._data_lines)
+        if alarmed != self._alarmed:
+            self._alarmed = alarmed
+            self.getViewBox().setBorder(mkPen("#d62728", width=4) if alarmed else None)
+
+    def _split_left_label(self):
+        """Splits left label on space or '_' closer to the middle"""
+        # find potential best split places
+        split_places = [m.start() for m in re.finditer('[_ ]', self._left_label_text)]
+
+        middle = len(self._left_label_text) / 2
+
+        # if potential split places exist
+        if split_places:
+            # find the one closer to the middle
+            best_place = split_places[0]
+            for place in split_places:
+                if abs(middle - place) < abs(best_place - middle):
+                    best_place = place
+
+        if not split_places or abs(middle - best_place) > len(self._left_label_text) / 6:
+            best_place = middle
+
+        self._left_label_text = self._left_label_text[:best_place] + "<br>" \
+                                + self._left_label_text[best_place:]
+
+    def _change_text_size(self):
+        """Change label text size to match with plot size."""
+        width = self.size().width()
+        height = self.size().height()
+
+        # calculate new title size
+        # minimal width - minimal size
+        # width 1000 and more - maximal size
+        # everything in between - proportionally
+        title_size = round(width * (self.TITLE_MAX_SIZE - self.TITLE_MIN_SIZE)
+                           / (self.MAXIMAL_WIDTH - self.MINIMAL_WIDTH) + self.TITLE_MIN_SIZE)
+        title_size = min(title_size, self.TITLE_MAX_SIZE)
+        title_size = max(title_size, self.TITLE_MIN_SIZE)
+
+        # calculate new axis labels size
+        bottom_label_size = round(
+            width * (self.LABEL_MAX_SIZE - self.LABEL_MIN_SIZE)
+            / (self.MAXIMAL_WIDTH - self.MINIMAL_WIDTH) + self.LABEL_MIN_SIZE)
+        bottom_label_size = min(bottom_label_size, self.LABEL_MAX_SIZE)
+        bottom_label_size = max(bottom_label_size, self.LABEL_MIN_SIZE)
+
+        left_label_size = round(
+            height * (self.LABEL_MAX_SIZE - self.LABEL_MIN_SIZE)
+            / (self.MAXIMAL_HEIGHT - self.MINIMAL_HEIGHT) + self.LABEL_MIN_SIZE)
+        left_label_size = min(left_label_size, self.LABEL_MAX_SIZE)
+        left_label_size = max(left_label_size, self.LABEL_MIN_SIZE)
+
+        title = self._title
+        if len(title) > 20:
+            title_size = max(self.TITLE_MIN_SIZE, title_size - 2)
+        if len(title) > 25:
+            title = title[:25] + "..."
+
+        # setting labels is slow, skip it if sizes did not change
+        text_sizes = (title_size, left_label_size, bottom_label_size)
+        if text_sizes == self._text_sizes:
+            return
+        self._text_sizes = text_sizes
+
+        self.setTitle(title, size=f'{title_size}pt')
+        self.setLabel('left', self._left_label_text,
+                      **{'color': '#444444', 'font-size': f'{left_label_size}pt',
+                         'word-break': 'break-all'})
+        self.setLabel('bottom', self.BOTTOM_LABEL,
+                      **{'color': '#444444', 'font-size': f'{bottom_label_size}pt'})
+
+    def resizeEvent(self, ev):
+        """Resize text when plot gets resized."""
+        if ev is not None:
+            self._change_text_size()
+        super().resizeEvent(ev)
+
+    def get_sensor_list(self):
+        """Return list of sensors in this graph."""
+        return self._sensors
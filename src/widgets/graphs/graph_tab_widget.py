@@ -1,5 +1,6 @@
 from PySide6.QtWidgets import QTabWidget
 
+from src.models.limits import configuration_limits
 from src.widgets.graphs.graph_page_widget import GraphPageWidget
 from src.widgets.graphs.unknown_graph_page_widget import UnknownGraphPageWidget
 
@@ -7,48 +8,60 @@ from src.widgets.graphs.unknown_graph_page_widget import UnknownGraphPageWidget
 class GraphTabWidget(QTabWidget):
     """Widget for tabs of graphs."""
 
-    def __init__(self, configuration, *args, **kwargs):
+    def __init__(self, configuration, series_store, statistics, alarms, *args, **kwargs):
         """Create tabs for graphs."""
         super().__init__(*args, **kwargs)
 
         self._configuration = configuration
+        self._series_store = series_store
+        self._statistics = statistics
+        self._alarms = alarms
         self._tabs = []
 
+        # names of sensors shown on configured tabs
+        self.sensors = set()
+
         self._init_ui()
 
     def _init_ui(self):
         """Initialize UI."""
         for tab in self._configuration.tabs:
-            new_tab = GraphPageWidget(tab)
+            new_tab = GraphPageWidget(tab, self._series_store, self._statistics, self._alarms,
+                                      scalable=self._configuration.scalable_rendering)
+            self.sensors |= new_tab.get_sensors()
 
             self._tabs.append(new_tab)
             self.addTab(new_tab, tab.name)
 
         if self._configuration.show_unknown_sensors:
-            self._unknown_tab = UnknownGraphPageWidget()
+            self._unknown_tab = UnknownGraphPageWidget(
+                self._series_store, self._statistics, self._alarms,
+                limit=configuration_limits(self._configuration).unknown_sensors,
+                scalable=self._configuration.scalable_rendering)
 
             self._tabs.append(self._unknown_tab)
             self.addTab(self._unknown_tab, "Unknown")
 
-    def get_graphs(self):
-        """Get list of graph widgets for sensors."""
-        graphs = {}
-        for tab in self._tabs:
-            tab_graphs = tab.get_graphs()
-            for sensor in tab_graphs:
-                if sensor in graphs:
-                    graphs[sensor] += tab_graphs[sensor]
-                else:
-                    graphs[sensor] = tab_graphs[sensor]
-
-        return graphs
+    def update_graphs(self):
+        """Redraw graphs of the shown tab with new points.
+        Other tabs are redrawn when they are shown.
+        """
+        if self._tabs:
+            self.currentWidget().update_graphs()
 
     def add_unknown_sensor(self, sensor):
-        """Add a sensor graph to unknown sensor page."""
+        """Add a sensor graph to unknown sensor page.
+        :return: True if the sensor has a graph on the page
+        """
         if self._configuration.show_unknown_sensors:
             return self._unknown_tab.add_graph(sensor)
         else:
-            return None
+            return False
+
+    def show_statistics(self, window):
+        """Show statistics of a window on all graphs, window None hides them."""
+        for tab in self._tabs:
+            tab.show_statistics(window)
 
     def close(self):
         """Closes all tabs."""
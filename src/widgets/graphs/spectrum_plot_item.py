@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.data.spectrum import Spectrum
+from src.widgets.graphs.graph_plot_item import GraphPlotItem
+
+
+class SpectrumPlotItem(GraphPlotItem):
+    """Plot of power spectral densities of the recent measurements of a cell.
+    A spectrum is recalculated only when its sensor got new points,
+    so it is updated at the rate graphs are redrawn.
+    """
+
+    BOTTOM_LABEL = "Frequency, Hz"
+
+    def __init__(self, cell, welch=False, *args, **kwargs):
+        """Create spectrum plot, welch averages several overlapping segments."""
+        super().__init__(cell, None, *args, **kwargs)
+
+        if welch:
+            self._spectrum = Spectrum(segment_length=256, segments=8, overlap=0.5)
+        else:
+            self._spectrum = Spectrum(segment_length=1024, segments=1)
+
+        # density is in squared units of the sensors per hertz
+        unit = self._sensors[0].physical_unit
+        if unit in ("-", ""):
+            unit = ""
+        elif not unit.isalnum():
+            unit = f"({unit})²"
+        else:
+            unit = f"{unit}²"
+        self._left_label_text = f"PSD, {unit}/Hz" if unit else "PSD, 1/Hz"
+        self.setLabel('left', self._left_label_text, **{'color': '#444444', 'font-size': '14pt'})
+
+        self.setLogMode(y=True)
+
+    def show_series(self, series_store):
+        """Recalculate spectra of lines which got new points in the series store."""
+        for line, data_line in self._data_lines.items():
+            length = series_store.length(line)
+            if length != self._shown_lengths[line]:
+                self._shown_lengths[line] = length
+
+                frequencies, density = self._spectrum.calculate(*series_store.series(line))
+
+                # constant component is removed, zero density cannot be shown on the log scale
+                frequencies, density = frequencies[1:], density[1:]
+                np.maximum(density, np.finfo(float).tiny, out=density)
+                data_line.setData(frequencies, density)
@@ -1,65 +1,65 @@
-from PySide6.QtWidgets import QWidget, QGridLayout, QHBoxLayout, QScrollArea, QSizePolicy
+from PySide6.QtWidgets import QWidget, QHBoxLayout
 
-from src.widgets.graphs.graph_widget import GraphWidget
+from src.widgets.graphs.virtual_graph_grid import VirtualGraphGrid
 
 
 class UnknownGraphPageWidget(QWidget):
     """Visual representation of an unkown sensor tab."""
 
-    def __init__(self):
-        """Create unknown graph page (tab)."""
+    # number of graphs in a row
+    COLUMN_COUNT = 5
+
+    def __init__(self, series_store, statistics, alarms, limit=100, scalable=False):
+        """Create unknown graph page (tab).
+        At most limit graphs are shown, a scalable page draws them
+        on one canvas instead of creating a plot widget for every graph.
+        """
         super().__init__()
 
-        self._count = 0
+        self._series_store = series_store
+        self._statistics = statistics
+        self._alarms = alarms
+        self._sensors = set()
+        self._limit = limit
+        self._scalable = scalable
 
         self.init_ui()
 
     def init_ui(self):
         """Initialize UI."""
-
-        self._scroll_area = QScrollArea()
         main_layout = QHBoxLayout(self)
         self.setLayout(main_layout)
-        main_layout.addWidget(self._scroll_area)
-        self._grid_layout = QGridLayout()
-        widget = QWidget()
-        widget.setLayout(self._grid_layout)
-        self._scroll_area.setWidget(widget)
-        self._scroll_area.setWidgetResizable(True)
-
-    def add_graph(self, unknown_sensor):
-        """Add unknown sensor graph widget."""
-        if self._count < 100:
-            widget = GraphWidget(cell=None, unknown_sensor=unknown_sensor)
-            size_policy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-            size_policy.setHeightForWidth(True)
-            widget.setSizePolicy(size_policy)
-            row = self._count // 5
-            column = self._count % 5
-            self._grid_layout.addWidget(widget, row, column, 1, 1)
-
-            # set minimum height for the row
-            self._grid_layout.setRowMinimumHeight(row, 250)
-            self._grid_layout.setRowStretch(column, 1)
 
-            # set minimum width for the column
-            self._grid_layout.setColumnMinimumWidth(column, 375)
-            self._grid_layout.setColumnStretch(column, 1)
+        # graphs are created only when they are scrolled to
+        self._grid = VirtualGraphGrid(self._series_store, self._statistics, self._alarms,
+                                      scalable=self._scalable)
+        main_layout.addWidget(self._grid)
 
-            self._count += 1
-
-            return widget
-        else:
-            return None
-
-    def get_graphs(self):
-        return []
-
-    def _clear_grid(self):
-        """Delete all elements from grid layout."""
-        for i in range(self._grid_layout.count() - 1, -1, -1):
-            self._grid_layout.takeAt(i).widget().deleteLater()
+    def add_graph(self, unknown_sensor):
+        """Add unknown sensor graph.
+        :return: True if the sensor has a graph on the page
+        """
+        if unknown_sensor in self._sensors:
+            return True
+        if len(self._sensors) >= self._limit:
+            return False
+
+        row = len(self._sensors) // self.COLUMN_COUNT
+        column = len(self._sensors) % self.COLUMN_COUNT
+        self._grid.add_slot(row, column, unknown_sensor=unknown_sensor)
+        self._sensors.add(unknown_sensor)
+
+        self._grid.set_grid_size(min(len(self._sensors), self.COLUMN_COUNT), row + 1)
+        return True
+
+    def update_graphs(self):
+        """Redraw visible graphs with new points."""
+        self._grid.update_graphs()
+
+    def show_statistics(self, window):
+        """Show statistics of a window on the graphs, window None hides them."""
+        self._grid.show_statistics(window)
 
     def close(self):
         """Clear grid on closing."""
-        self._clear_grid()
+        self._grid.clear()
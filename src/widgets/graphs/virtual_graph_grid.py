@@ -0,0 +1,225 @@
+import math
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QWidget, QGridLayout, QScrollArea, QSizePolicy, QVBoxLayout
+from pyqtgraph import GraphicsLayoutWidget
+
+from src.widgets.graphs.graph_widget import GraphWidget, create_plot_item
+
+
+class _GraphSlot:
+    """Place of a graph in the grid, the graph is created when it gets close to the viewport."""
+    __slots__ = ("row", "column", "rowspan", "colspan", "cell", "unknown_sensor", "placeholder", "graph")
+
+    def __init__(self, row, column, rowspan, colspan, cell, unknown_sensor):
+        """Create an empty slot."""
+        self.row = row
+        self.column = column
+        self.rowspan = rowspan
+        self.colspan = colspan
+        self.cell = cell
+        self.unknown_sensor = unknown_sensor
+        self.placeholder = None
+        self.graph = None
+
+
+class _Placeholder(QWidget):
+    """Widget keeping the place of a graph widget in the grid layout."""
+
+    def __init__(self, colspan):
+        """Create a placeholder of a graph spanning colspan columns."""
+        super().__init__()
+        self._colspan = colspan
+
+        size_policy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        size_policy.setHeightForWidth(True)
+        self.setSizePolicy(size_policy)
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    def set_graph(self, graph):
+        """Show the graph in place of the placeholder."""
+        self._layout.addWidget(graph)
+
+    def heightForWidth(self, width):
+        """Calculate height for given width."""
+        return width // (1.5 * self._colspan)
+
+
+class VirtualGraphGrid(QScrollArea):
+    """Scrollable grid of graphs which creates graphs only near the viewport.
+    Graphs get their points from the series store and only graphs near
+    the viewport are redrawn, hidden ones catch up once they are scrolled to.
+    In scalable mode graphs are plot items of one canvas, otherwise
+    every graph is a separate plot widget.
+    """
+
+    ROW_HEIGHT = 250
+    COLUMN_WIDTH = 375
+
+    # part of the viewport size beyond its borders where graphs are prepared in advance
+    PRELOAD = 0.5
+
+    def __init__(self, series_store, statistics, alarms, scalable=False):
+        """Create an empty grid."""
+        super().__init__()
+        self._series_store = series_store
+        self._statistics = statistics
+        self._alarms = alarms
+        self._statistics_window = None  # window of statistics shown on graphs, None if hidden
+        self._scalable = scalable
+
+        self._slots = []
+        self._grid_width = 0
+        self._grid_height = 0
+        self._visible_slots = None  # slots near the viewport, found again after scrolling
+
+        self.setWidgetResizable(True)
+        if self._scalable:
+            self._canvas = GraphicsLayoutWidget()
+            self._canvas.setBackground("#ffffff")
+            self.setWidget(self._canvas)
+
+            # plots are added to the grid layout of the canvas directly,
+            # adding them to the canvas lays out all previous plots again
+            self._canvas_layout = self._canvas.ci.layout
+        else:
+            self._grid_layout = QGridLayout()
+            widget = QWidget()
+            widget.setLayout(self._grid_layout)
+            self.setWidget(widget)
+
+        # graphs are shown when they get close to the viewport
+        self.verticalScrollBar().valueChanged.connect(self._viewport_moved)
+        self.horizontalScrollBar().valueChanged.connect(self._viewport_moved)
+        self.widget().installEventFilter(self)
+
+    def add_slot(self, row, column, rowspan=1, colspan=1, cell=None, unknown_sensor=None):
+        """Add a place for a graph of a cell or an unknown sensor.
+        Slots without a cell or a sensor stay blank.
+        """
+        if cell is None and unknown_sensor is None:
+            if not self._scalable:
+                widget = QWidget()
+                widget.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding))
+                self._grid_layout.addWidget(widget, row, column, rowspan, colspan)
+            return
+
+        slot = _GraphSlot(row, column, rowspan, colspan, cell, unknown_sensor)
+        if not self._scalable:
+            slot.placeholder = _Placeholder(colspan)
+            self._grid_layout.addWidget(slot.placeholder, row, column, rowspan, colspan)
+        self._slots.append(slot)
+        self._visible_slots = None
+
+    def set_grid_size(self, width, height):
+        """Set number of columns and rows of the grid."""
+        if self._scalable:
+            for row in range(self._grid_height, height):
+                self._canvas_layout.setRowMinimumHeight(row, self.ROW_HEIGHT)
+                self._canvas_layout.setRowStretchFactor(row, 1)
+            for column in range(self._grid_width, width):
+                self._canvas_layout.setColumnMinimumWidth(column, self.COLUMN_WIDTH)
+                self._canvas_layout.setColumnStretchFactor(column, 1)
+
+            # let the scroll area know the size of the grid
+            self._canvas.setMinimumSize(width * self.COLUMN_WIDTH, height * self.ROW_HEIGHT)
+        else:
+            for row in range(self._grid_height, height):
+                self._grid_layout.setRowMinimumHeight(row, self.ROW_HEIGHT)
+                self._grid_layout.setRowStretch(row, 1)
+            for column in range(self._grid_width, width):
+                self._grid_layout.setColumnMinimumWidth(column, self.COLUMN_WIDTH)
+                self._grid_layout.setColumnStretch(column, 1)
+
+        self._grid_width = max(self._grid_width, width)
+        self._grid_height = max(self._grid_height, height)
+        self._visible_slots = None
+
+    def update_graphs(self):
+        """Create graphs near the viewport and redraw them with new points."""
+        if self._visible_slots is None:
+            self._visible_slots = self._find_visible_slots()
+
+        for slot in self._visible_slots:
+            if slot.graph is None:
+                self._create_graph(slot)
+            slot.graph.show_series(self._series_store)
+            slot.graph.show_alarms(self._alarms)
+            if self._statistics_window is not None:
+                slot.graph.show_statistics(self._statistics, self._statistics_window)
+
+    def show_statistics(self, window):
+        """Show statistics of a window on the graphs, window None hides them."""
+        self._statistics_window = window
+
+        if window is None:
+            for slot in self._slots:
+                if slot.graph is not None:
+                    slot.graph.show_statistics(self._statistics, None)
+        else:
+            # graphs away from the viewport get statistics when they are shown
+            self.update_graphs()
+
+    def _find_visible_slots(self):
+        """Find slots overlapping the viewport extended by the preload margin."""
+        content = self.widget()
+        if not self.isVisible() or not self._grid_width or not self._grid_height \
+                or content.width() <= 0 or content.height() <= 0:
+            return []
+
+        # rows and columns are stretched equally
+        row_height = content.height() / self._grid_height
+        column_width = content.width() / self._grid_width
+
+        viewport = self.viewport()
+        margin_y = viewport.height() * self.PRELOAD
+        margin_x = viewport.width() * self.PRELOAD
+        top = self.verticalScrollBar().value() - margin_y
+        bottom = self.verticalScrollBar().value() + viewport.height() + margin_y
+        left = self.horizontalScrollBar().value() - margin_x
+        right = self.horizontalScrollBar().value() + viewport.width() + margin_x
+
+        first_row, last_row = math.floor(top / row_height), math.ceil(bottom / row_height)
+        first_column, last_column = math.floor(left / column_width), math.ceil(right / column_width)
+
+        return [slot for slot in self._slots
+                if slot.row < last_row and slot.row + slot.rowspan > first_row
+                and slot.column < last_column and slot.column + slot.colspan > first_column]
+
+    def _create_graph(self, slot):
+        """Create the graph of a slot."""
+        if self._scalable:
+            slot.graph = create_plot_item(slot.cell, slot.unknown_sensor)
+            self._canvas_layout.addItem(slot.graph, slot.row, slot.column, slot.rowspan, slot.colspan)
+        else:
+            slot.graph = GraphWidget(slot.cell, slot.unknown_sensor)
+            slot.placeholder.set_graph(slot.graph)
+
+    def _viewport_moved(self):
+        """Show graphs which got close to the viewport."""
+        self._visible_slots = None
+        self.update_graphs()
+
+    def eventFilter(self, watched, event):
+        """Find visible graphs again when the grid gets resized."""
+        if event.type() == QEvent.Resize:
+            self._viewport_moved()
+        return super().eventFilter(watched, event)
+
+    def showEvent(self, event):
+        """Show graphs when the grid becomes visible."""
+        super().showEvent(event)
+        self._viewport_moved()
+
+    def resizeEvent(self, event):
+        """Show graphs which got close to the resized viewport."""
+        super().resizeEvent(event)
+        self._viewport_moved()
+
+    def clear(self):
+        """Delete all graphs."""
+        self._slots = []
+        self._visible_slots = None
+        self.widget().deleteLater()
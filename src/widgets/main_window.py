@@ -1,30 +1,64 @@
+import datetime
 import json
-import os
-import re
 
-from PySide6.QtGui import QAction
-from PySide6.QtNetwork import QTcpSocket, QHostAddress, QAbstractSocket
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QAction, QActionGroup
+from PySide6.QtNetwork import QAbstractSocket
 from PySide6.QtWidgets import QMainWindow, QMenuBar, QMenu, QStatusBar, QWidget, QMessageBox, \
-    QFileDialog
+    QFileDialog, QInputDialog
 
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.models.models import Configuration, Address
+from src.data.alarms import AlarmEngine, describe
+from src.data.data_source import DataSource
+from src.data.expressions import DerivedSensors
+from src.data.ingest_queue import IngestQueue, POLICIES
+from src.data.protocols import timestamp_to_seconds
+from src.data.recording import RecordWriter
+from src.data.resampling import MODES, align, export_csv
+from src.data.series_store import SeriesStore
+from src.data.statistics import StatisticsEngine, window_name
+from src.data.validation import parse_line, expand_delta, is_delta, full_line
+from src.models.layout import layout_cache
+from src.models.models import Configuration, Address, Alarm
 from src.widgets.address_window import AddressWindow
 from src.widgets.configuration_settings_window import ConfigurationSettingsWindow
 from src.widgets.console_widget import ConsoleWidget
 from src.widgets.graphs.graph_tab_widget import GraphTabWidget
+from src.widgets.statistics_widget import StatisticsWidget
 
 
 class MainWindow(QMainWindow):
     """Main window of the application."""
 
+    # interval between visualization updates in milliseconds
+    REDRAW_INTERVAL = 50
+    # maximal number of samples shown per visualization update
+    REDRAW_BUDGET = 2000
+
     def __init__(self, session_maker):
         """Create main window."""
         super().__init__()
 
         self._session_maker = session_maker
 
+        # queue of received samples waiting for visualization
+        self._ingest_queue = IngestQueue()
+
+        # measurements shown on the graphs
+        self._series_store = SeriesStore()
+
+        # running statistics of the measurements
+        self._statistics = StatisticsEngine()
+        self._statistics_overlay = None  # window of statistics shown on graphs, None if hidden
+
+        # sensors computed from other sensors, set up with the configuration
+        self._derived_sensors = DerivedSensors({})
+
+        # alarm thresholds of sensors, set up with the configuration
+        self._alarms = AlarmEngine({})
+        self._alarm_log = []  # alarm events waiting to be saved to the database
+
         # set window title
         self.setWindowTitle("Sensor Measurement Data Visualization")
 
@@ -34,9 +68,11 @@ class MainWindow(QMainWindow):
 
         self._init_ui()
         self._console = ConsoleWidget()
+        self._statistics_widget = StatisticsWidget(self._statistics)
 
         # load active configuration
         self._configuration = None
+        self._active_configuration_id = None
         self._load_configuration()
 
         # set up recording control
@@ -44,13 +80,24 @@ class MainWindow(QMainWindow):
         self._record_file = None
         self._action_record.setDisabled(True)
 
-        # set up TCP socket
-        self._socket = QTcpSocket(self)
-        self._socket.readyRead.connect(self._read_from_socket)
-        self._socket.errorOccurred.connect(self._show_socket_error)
-        self._socket.connected.connect(lambda:
-                                       QMessageBox.information(self, "Connected", "Successfully connected "
-                                                               "to the data source", QMessageBox.Ok, QMessageBox.Ok))
+        # set up data sources
+        self._sources = []
+
+        # show queued samples periodically
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.timeout.connect(self._update_visualization)
+        self._redraw_timer.start(self.REDRAW_INTERVAL)
+
+        # show data source counters in the status bar
+        self._status_timer = QTimer(self)
+        self._status_timer.timeout.connect(self._update_status)
+        self._status_timer.start(1000)
+
+        # save buffered recording data periodically
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._flush_record)
+        self._flush_timer.timeout.connect(self._flush_alarm_log)
+        self._flush_timer.start(1000)
 
         # set state
         self._active_session = False
@@ -83,6 +130,9 @@ class MainWindow(QMainWindow):
         self._action_record = QAction(self)
         self._action_record.setText("Start Recording")
 
+        self._action_export = QAction(self)
+        self._action_export.setText("Export CSV")
+
         self._action_configurations = QAction(self)
         self._action_configurations.setText("Configurations")
 
@@ -92,6 +142,33 @@ class MainWindow(QMainWindow):
         self._action_console = QAction(self)
         self._action_console.setText("Console")
 
+        self._action_statistics = QAction(self)
+        self._action_statistics.setText("Statistics")
+
+        # create overflow policy selection
+        self._menu_overflow = QMenu(self._menu_settings)
+        self._menu_overflow.setTitle("Overflow Policy")
+        self._overflow_policies = QActionGroup(self)
+        for policy, description in POLICIES.items():
+            action = self._overflow_policies.addAction(description)
+            action.setCheckable(True)
+            action.setChecked(policy == self._ingest_queue.policy)
+            action.triggered.connect((lambda selected_policy: lambda: self._set_overflow_policy(
+                selected_policy))(policy))
+        self._menu_overflow.addActions(self._overflow_policies.actions())
+
+        # create statistics overlay selection
+        self._menu_statistics_overlay = QMenu(self._menu_settings)
+        self._menu_statistics_overlay.setTitle("Statistics Overlay")
+        self._statistics_overlays = QActionGroup(self)
+        for window in (None,) + self._statistics.windows:
+            action = self._statistics_overlays.addAction("Off" if window is None else window_name(window))
+            action.setCheckable(True)
+            action.setChecked(window == self._statistics_overlay)
+            action.triggered.connect((lambda selected_window: lambda: self._set_statistics_overlay(
+                selected_window))(window))
+        self._menu_statistics_overlay.addActions(self._statistics_overlays.actions())
+
         # add actions to the menu
         self._menu_file.addActions(
             [self._action_new,
@@ -104,23 +181,29 @@ class MainWindow(QMainWindow):
         self._menu_file.addAction(self._action_close)
         self._menu_file.addSeparator()
         self._menu_file.addAction(self._action_record)
+        self._menu_file.addAction(self._action_export)
 
         self._menu_bar.addAction(self._menu_file.menuAction())
 
         self._menu_settings.addAction(self._action_configurations)
         self._menu_settings.addAction(self._action_data_source)
+        self._menu_settings.addAction(self._menu_overflow.menuAction())
+        self._menu_settings.addAction(self._menu_statistics_overlay.menuAction())
         self._menu_bar.addAction(self._menu_settings.menuAction())
 
         self._menu_bar.addAction(self._action_console)
+        self._menu_bar.addAction(self._action_statistics)
 
         # connect actions to methods
         self._action_new.triggered.connect(self._start_new_session)
         self._action_open.triggered.connect(self._open_record)
         self._action_close.triggered.connect(self._stop_session)
         self._action_record.triggered.connect(self._record)
+        self._action_export.triggered.connect(self._export_csv)
         self._action_configurations.triggered.connect(self._open_configurations)
         self._action_data_source.triggered.connect(self._open_data_source_settings)
         self._action_console.triggered.connect(self._open_console)
+        self._action_statistics.triggered.connect(self._open_statistics)
 
         self._tabs = QWidget()
         self.setCentralWidget(self._tabs)
@@ -130,12 +213,37 @@ class MainWindow(QMainWindow):
         # remove old widget
         self._tabs.deleteLater()
 
+        # derived sensors start without known values of their inputs
+        self._derived_sensors = DerivedSensors({sensor.short_name: sensor.expression
+                                                for sensor in configuration.derived_sensors})
+
+        # alarms start cleared
+        self._alarms = AlarmEngine({sensor.short_name: (sensor.low_threshold, sensor.high_threshold,
+                                                        sensor.rate_limit, sensor.hysteresis)
+                                    for sensor in configuration.alarm_sensors})
+
         # create new graph tabs page
-        self._tabs = GraphTabWidget(configuration)
-        self._graphs = self._tabs.get_graphs()
+        self._tabs = GraphTabWidget(configuration, self._series_store, self._statistics, self._alarms)
+        self._tabs.show_statistics(self._statistics_overlay)
 
         self.setCentralWidget(self._tabs)
 
+    def _set_overflow_policy(self, policy):
+        """Set what happens when visualization cannot keep up with data sources."""
+        self._ingest_queue.policy = policy
+        self._resume_sources()
+
+    def _set_statistics_overlay(self, window):
+        """Show statistics of a window on the graphs, window None hides them."""
+        self._statistics_overlay = window
+        self._tabs.show_statistics(window)
+
+    def _open_statistics(self):
+        """Opens statistics window."""
+        if not self._statistics_widget.isVisible():
+            self._statistics_widget.show()
+        self._statistics_widget.activateWindow()  # bring to front
+
     def _open_console(self):
         """Opens console window."""
         if not self._console.isVisible():
@@ -144,6 +252,14 @@ class MainWindow(QMainWindow):
 
     def _load_configuration(self, name=None):
         """Loads configuration and updates ui"""
+        # use cached layout of the active configuration if it did not change
+        if name is None and self._active_configuration_id is not None:
+            configuration = layout_cache.get(self._active_configuration_id)
+            if configuration:
+                self._configuration = configuration
+                self._init_visualization(configuration)
+                return
+
         db_session = self._session_maker()
         try:
             configuration = Configuration.load(db_session, name=name)
@@ -155,6 +271,9 @@ class MainWindow(QMainWindow):
             raise
 
         if configuration:
+            layout_cache.put(configuration)
+            if name is None:
+                self._active_configuration_id = configuration.id
             self._configuration = configuration
             self._init_visualization(configuration)
 
@@ -165,6 +284,7 @@ class MainWindow(QMainWindow):
         db_session = self._session_maker()
         Configuration.activate(db_session, configuration_name)
         db_session.close()
+        self._active_configuration_id = None  # active configuration changed
 
         self._stop_session()
         self._load_configuration()
@@ -198,7 +318,7 @@ class MainWindow(QMainWindow):
             if filename:
                 # open the file and handle possible exceptions
                 try:
-                    self._record_file = open(filename, 'w')
+                    self._record_file = RecordWriter(filename, self._configuration.name)
                 except (OSError, IOError):
                     QMessageBox.critical(self, "Error!", f'Unable to create file!',
                                          QMessageBox.Ok, QMessageBox.Ok)
@@ -208,8 +328,36 @@ class MainWindow(QMainWindow):
                 if self._record_file:
                     self._recording = True
                     self._action_record.setText("Stop Recording")
-                    self._record_file.write(
-                        '{"configuration": ' + f'"{self._configuration.name}"' + '}\n')
+
+    def _export_csv(self):
+        """Export measurements of the session resampled to a common time grid."""
+        sensors = sorted(self._series_store.sensors())
+        if not sensors:
+            QMessageBox.information(self, "Export CSV", "There are no measurements to export.",
+                                    QMessageBox.Ok, QMessageBox.Ok)
+            return
+
+        step, accepted = QInputDialog.getDouble(self, "Export CSV", "Time step, s:", 1.0, 0.001, 3600.0, 3)
+        if not accepted:
+            return
+        mode_name, accepted = QInputDialog.getItem(self, "Export CSV", "Values at grid times:",
+                                                   list(MODES.values()), 0, False)
+        if not accepted:
+            return
+        mode = next(mode for mode, name in MODES.items() if name == mode_name)
+
+        filename, _ = QFileDialog.getSaveFileName(self, filter="CSV files (*.csv)")
+        if not filename:
+            return
+
+        try:
+            grid, columns = align(self._series_store, sensors, step, mode)
+            export_csv(filename, grid, columns)
+        except ValueError as error:
+            QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok, QMessageBox.Ok)
+        except (OSError, IOError):
+            QMessageBox.critical(self, "Error!", f'Unable to write the file!',
+                                 QMessageBox.Ok, QMessageBox.Ok)
 
     def _open_record(self):
         """Open record file."""
@@ -269,10 +417,20 @@ class MainWindow(QMainWindow):
                 QMessageBox.Ok | QMessageBox.Cancel, QMessageBox.Ok
             )
             if confirmation == QMessageBox.Ok:
+                # alarms of a played back file are shown but not logged again
+                self._opened_file = True
+
                 # process the data in file
+                samples = []
+                last_values = {}
                 while line:
-                    self._process_data(line)
+                    sample = self._process_data(line, last_values)
+                    if sample:
+                        samples.append(sample)
                     line = file.readline()
+                self._derived_sensors.add_to(samples)
+                self._check_alarms(samples)
+                self._show_samples(samples)
 
                 QMessageBox.information(self, "File loaded", "File loaded!", QMessageBox.Yes, QMessageBox.Yes)
                 file.close()
@@ -283,13 +441,17 @@ class MainWindow(QMainWindow):
 
     def _stop_session(self):
         """Stop active session of file reading session."""
+        self._flush_alarm_log()  # alarms belong to the current configuration
         if self._active_session:
             # disconnect
-            self._socket.disconnectFromHost()
+            self._disconnect()
             self._active_session = False
             # stop recording
             if self._recording:
                 self._record()
+        self._ingest_queue.clear()
+        self._series_store.clear()
+        self._statistics.clear()
         self._load_configuration()
         self._opened_file = False
 
@@ -298,6 +460,7 @@ class MainWindow(QMainWindow):
         self._action_close.setDisabled(True)
 
         self._console.clear()
+        self._statistics_widget.clear()
 
     def _start_new_session(self):
         """Start new active session."""
@@ -309,52 +472,130 @@ class MainWindow(QMainWindow):
         self._connect()
 
     def _connect(self):
-        """Connect to data source."""
-        self._socket.abort()
+        """Connect to data sources."""
+        self._disconnect()
         db_session = self._session_maker()
-        address = db_session.query(Address).order_by(Address.use_datetime.desc()).first()
+        addresses = db_session.query(Address).filter(Address.active == True) \
+            .order_by(Address.use_datetime.desc()).all()
+        # use the most recently used address if no sources are selected
+        if not addresses:
+            addresses = db_session.query(Address).order_by(Address.use_datetime.desc()).limit(1).all()
         db_session.close()
-        ip, port = address.ip_port.split(':')
-        print("connecting to " + ip + ":" + str(port))
-        self._socket.connectToHost(ip, int(port))
-
-    def _read_from_socket(self):
-        """Reads data from socket when new data arrives."""
-        if self._socket.canReadLine():
-            # convert from QBytearray to str
-            line = str(self._socket.readLine())[2:-3].strip()
-            self._process_data(line)
-
-    def _process_data(self, line):
-        """Process the data in the given string."""
-
-        def check_correctness(data):
-            correct = True
-            # check if obligatory fields are in data
-            if correct and ("timestamp" not in data or "sensors" not in data
-                            or not isinstance(data["sensors"], dict)):
-                correct = False
-
-            # check if timestamp format is correct
-            if not re.match('^[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}$', data["timestamp"]):
-                correct = False
-
-            # check if values of sensors are numbers
-            if correct:
-                for sensor_value in data["sensors"].values():
-                    if not (isinstance(sensor_value, int) or isinstance(sensor_value, float)):
-                        correct = False
-                        break
-
-            return correct
 
-        # save to file if recording is enabled
+        for address in addresses:
+            source = DataSource(address, self)
+            source.received.connect(
+                (lambda data_source: lambda messages: self._process_messages(data_source, messages))(source)
+            )
+            source.malformed.connect(
+                lambda error: self._console.print("Wrong format: " + error, warning=True)
+            )
+            source.socket.errorOccurred.connect(
+                (lambda data_source: lambda error: self._show_socket_error(data_source, error))(source)
+            )
+            source.connected.connect(
+                (lambda data_source: lambda: QMessageBox.information(
+                    self, "Connected", f"Successfully connected to the data source {data_source}",
+                    QMessageBox.Ok, QMessageBox.Ok))(source)
+            )
+            source.connection_lost.connect(
+                (lambda data_source: lambda: self._mark_gap(data_source))(source)
+            )
+            source.reconnecting.connect(
+                (lambda data_source: lambda delay: self._console.print(
+                    f"Connection to {data_source} lost, reconnecting in {delay:.1f} s", warning=True))(source)
+            )
+            source.reconnected.connect(
+                (lambda data_source: lambda: self._console.print(
+                    f"Reconnected to {data_source}", warning=True))(source)
+            )
+            self._sources.append(source)
+            source.connect_to_host()
+
+    def _disconnect(self):
+        """Disconnect from all data sources."""
+        for source in self._sources:
+            source.disconnect_from_host()
+            source.deleteLater()
+        self._sources = []
+
+    def _process_messages(self, source, messages):
+        """Process messages received from a data source."""
+        samples = []
+        for message in messages:
+            if isinstance(message, str):
+                sample = self._process_data(message, source.last_values)
+            else:
+                sample = self._process_frame(message)
+
+            if sample:
+                samples.append(sample)
+                source.record_timestamp(sample[0])
+                source.sensors.update(sample[1])
+
+        # derived sensors are computed from all received samples, before the queue can drop any
+        self._derived_sensors.add_to(samples)
+
+        # alarms are checked on arrival, even if visualization drops samples
+        self._check_alarms(samples)
+        for sample in samples:
+            self._ingest_queue.put(sample)
+
+        # stop reading until visualization catches up
+        if self._ingest_queue.policy == "block" and self._ingest_queue.is_full():
+            for data_source in self._sources:
+                data_source.pause()
+
+    def _mark_gap(self, source):
+        """Break graph lines of the source's sensors where connection was lost."""
+        seconds = source.last_timestamp()
+        if seconds is not None:
+            gap = [(seconds, dict.fromkeys(source.sensors, float("nan")), None)]
+            self._derived_sensors.add_to(gap)
+            self._ingest_queue.put(gap[0])
+
+    def _resume_sources(self):
+        """Continue reading from paused data sources."""
+        for source in self._sources:
+            source.resume()
+
+    def _update_visualization(self):
+        """Show a limited number of queued samples."""
+        if len(self._ingest_queue):
+            self._show_samples(self._ingest_queue.take(self.REDRAW_BUDGET))
+
+        if not self._ingest_queue.is_full():
+            self._resume_sources()
+
+    def _update_status(self):
+        """Show data source counters in the status bar."""
+        if not self._sources:
+            self.statusBar().clearMessage()
+            return
+
+        for source in self._sources:
+            source.update_rate()
+        queue_status = f"queued {len(self._ingest_queue)}/{self._ingest_queue.capacity}, " \
+                       f"dropped {self._ingest_queue.dropped}"
+        self.statusBar().showMessage(" | ".join([source.status() for source in self._sources]
+                                                + [queue_status]))
+
+    def _write_record(self, line):
+        """Write a line to the recording file."""
+        try:
+            self._record_file.write(line)
+        except (OSError, IOError):
+            QMessageBox.critical(self, "Error!",
+                                 'Unable to write to file! Recording stopped!',
+                                 QMessageBox.Ok, QMessageBox.Ok)
+            # stop recording
+            self._record()
+
+    def _flush_record(self):
+        """Save buffered recording data to the file."""
         if self._recording:
             try:
-                self._record_file.write(line + "\n")
-                # save changes to the file
                 self._record_file.flush()
-                os.fsync(self._record_file.fileno())
             except (OSError, IOError):
                 QMessageBox.critical(self, "Error!",
                                      'Unable to write to file! Recording stopped!',
@@ -362,60 +603,127 @@ class MainWindow(QMainWindow):
                 # stop recording
                 self._record()
 
-        if len(line) > 6000:
-            self._console.print("Line is too long: " + line[:6000] + "...", warning=True)
-        else:
-            # check if data format is correct
-            correct_format = True
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                data = None
-                correct_format = False
+    def _process_data(self, line, last_values):
+        """Process the data in the given string.
+        Delta lines are completed with last values of the line's source.
+        Returns a sample (timestamp in seconds, sensor values, line)
+        or None if data format is wrong.
+        """
+        # check if data format is correct
+        try:
+            data = parse_line(line)
+        except ValueError as error:
+            # save to file if recording is enabled
+            if self._recording:
+                self._write_record(line)
+            self._console.print(str(error), warning=True)
+            return None
+
+        delta = is_delta(data)
+        data = expand_delta(data, last_values)
+
+        # recordings mix lines of all sources, so delta lines are saved completed
+        if self._recording:
+            self._write_record(full_line(data) if delta else line)
 
-            if correct_format:
-                correct_format = check_correctness(data)
+        return timestamp_to_seconds(data["timestamp"]), data["sensors"], line
+
+    def _process_frame(self, frame):
+        """Process the data in the given binary sample frame.
+        Returns a sample (timestamp in seconds, sensor values, None).
+        Frames are converted to JSON lines only for recording
+        and are not printed to the console.
+        """
+        # save to file if recording is enabled
+        if self._recording:
+            self._write_record(frame.to_line())
+
+        return frame.seconds, frame.sensors, None
+
+    def _check_alarms(self, samples):
+        """Check values of received samples against alarm thresholds."""
+        if not self._alarms.sensors:
+            return  # no thresholds are set
+
+        # group values by sensor to check each sensor once
+        points = {}
+        for seconds, sensors, _ in samples:
+            for sensor in self._alarms.sensors.intersection(sensors):
+                if sensor not in points:
+                    points[sensor] = ([], [])
+                points[sensor][0].append(seconds)
+                points[sensor][1].append(sensors[sensor])
+
+        for sensor, (x, y) in points.items():
+            self._report_alarms(self._alarms.check(sensor, x, y))
+
+    def _report_alarms(self, events):
+        """Show alarm events in the console and save them to the log.
+        Alarms of played back files were logged when they were recorded.
+        """
+        for event in events:
+            self._console.print(describe(event), warning=event.raised)
+        if not self._opened_file:
+            self._alarm_log.extend(events)
+
+    def _flush_alarm_log(self):
+        """Save alarm events to the database."""
+        if not self._alarm_log:
+            return
 
-            if correct_format:
-                # show new data on graphs and in the console
-                self._update_graphs(data)
+        db_session = self._session_maker()
+        try:
+            Alarm.log(db_session, self._configuration.id, self._alarm_log, datetime.datetime.now())
+            db_session.commit()
+        except SQLAlchemyError:
+            db_session.rollback()
+            self._console.print("Unable to save alarms to the database!", warning=True)
+        finally:
+            db_session.close()
+            self._alarm_log = []
+
+    def _show_samples(self, samples):
+        """Show samples on graphs and in the console."""
+        self._update_graphs(samples)
+        for _, _, line in samples:
+            if line is not None:  # gap markers and binary frames have no line
                 self._console.print(line)
-            else:
-                self._console.print("Wrong format: " + line, warning=True)
 
-    def _update_graphs(self, data):
+    def _update_graphs(self, samples):
         """Add new points to the graphs."""
-
-        def timestamp_to_seconds(timestamp):
-            """Turns string timestamp into seconds"""
-            # timestamp format:
-            # HH:MM:SS.mmm
-            h, m, s_and_ms = timestamp.split(":")
-            s, ms = s_and_ms.split(".")
-            return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
-
-        seconds = timestamp_to_seconds(data["timestamp"])
-        for sensor, value in data["sensors"].items():
-            if sensor in self._graphs:
-                for graph in self._graphs[sensor]:
-                    graph.update_data(seconds, value, line=sensor)
-            elif self._configuration.show_unknown_sensors:
-                graph = self._tabs.add_unknown_sensor(sensor)
-                if graph:
-                    self._graphs[sensor] = [graph]
-                    graph.update_data(seconds, value, line=sensor)
-
-    def _show_socket_error(self, error):
+        # group points by sensor to update each graph once
+        points = {}
+        for seconds, sensors, _ in samples:
+            for sensor, value in sensors.items():
+                if sensor not in points:
+                    points[sensor] = ([], [])
+                points[sensor][0].append(seconds)
+                points[sensor][1].append(value)
+
+        for sensor, (x, y) in points.items():
+            self._series_store.append(sensor, x, y)
+            self._statistics.add(sensor, x, y)
+            if sensor not in self._tabs.sensors and sensor not in self._derived_sensors:
+                self._tabs.add_unknown_sensor(sensor)
+
+        # only graphs on the screen are redrawn, others catch up when they are shown
+        self._tabs.update_graphs()
+
+    def _show_socket_error(self, source, error):
         """Show socket error when it occurs."""
+        if source.was_connected:
+            return  # lost connections are restored by the source
+
         if error is QAbstractSocket.SocketError.ConnectionRefusedError:
             QMessageBox.critical(self, "Error!",
-                                 'Connection failed!',
-                                 QMessageBox.Ok, QMessageBox.Ok)
-            self._stop_session()
-        elif error is QAbstractSocket.SocketError.RemoteHostClosedError:
-            QMessageBox.critical(self, "Error!",
-                                 'Connection interrupted!',
+                                 f'Connection to {source} failed!',
                                  QMessageBox.Ok, QMessageBox.Ok)
+            # other sources keep working, stop only if none is left
+            if source in self._sources:
+                self._sources.remove(source)
+                source.deleteLater()
+            if not self._sources:
+                self._stop_session()
         else:
             print(error)
 
@@ -0,0 +1,53 @@
+from PySide6.QtCore import QSortFilterProxyModel, QStringListModel
+from PySide6.QtWidgets import QListView, QAbstractItemView
+
+from src.models.search_index import PrefixSearchIndex
+
+
+class SearchFilterProxyModel(QSortFilterProxyModel):
+    """Proxy model showing only names found by a prefix search index."""
+
+    def __init__(self, search_index):
+        """Create a proxy model for a list of names of the search index."""
+        super().__init__()
+        self._search_index = search_index
+        self._found_rows = range(len(search_index.names))
+
+    def search(self, prefix):
+        """Show only names starting with the prefix."""
+        self._found_rows = self._search_index.search(prefix)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Check if a row was found by the last search."""
+        return source_row in self._found_rows
+
+
+class SearchListView(QListView):
+    """Read-only list of names with an incremental prefix search."""
+
+    def __init__(self, names):
+        """Create a list view of names."""
+        super().__init__()
+        search_index = PrefixSearchIndex(names)
+
+        # the proxy model relies on the order of names in the index
+        self._names_model = QStringListModel(search_index.names)
+        self._proxy_model = SearchFilterProxyModel(search_index)
+        self._proxy_model.setSourceModel(self._names_model)
+        self.setModel(self._proxy_model)
+
+        self.setAlternatingRowColors(True)
+        self.setUniformItemSizes(True)  # avoid measuring every row of long lists
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+    def search(self, prefix):
+        """Show only names starting with the prefix."""
+        self._proxy_model.search(prefix)
+
+    def selected_name(self):
+        """Get selected name or None if nothing is selected."""
+        selected_indexes = self.selectedIndexes()
+        if selected_indexes:
+            return selected_indexes[0].data()
+        return None
@@ -3,6 +3,7 @@ from PySide6.QtGui import QFont, QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QComboBox, QMessageBox
 
+from src.models.layout import layout_cache
 from src.models.models import Sensor
 
 
@@ -14,6 +15,10 @@ class SensorCreateEditWidget(QWidget):
         super().__init__()
         self._db_session = db_session
 
+        # all changes are made in a savepoint,
+        # which is released on saving and rolled back on cancelling
+        self._transaction = self._db_session.begin_nested()
+
         # define mode - edit or create
         if sensor:
             self._edit_mode = True
@@ -102,6 +107,25 @@ class SensorCreateEditWidget(QWidget):
             QRegularExpressionValidator(QRegularExpression(r'.{0,10}'))
         )
 
+        # create expression field display, sensors without an expression are measured
+        self._expression_line = QLineEdit()
+        self._expression_line.setText(self._sensor.expression or "")
+        self._expression_line.setPlaceholderText("e.g. U * I, empty for a measured sensor")
+
+        # create alarm threshold field displays, empty thresholds are not checked
+        self._threshold_lines = {}
+        for field in ("low_threshold", "high_threshold", "rate_limit", "hysteresis"):
+            line = QLineEdit()
+            value = getattr(self._sensor, field)
+            line.setText("" if value is None else f"{value:.12g}")
+            line.setPlaceholderText("not set")
+
+            # set validation rules to decimal numbers
+            line.setValidator(
+                QRegularExpressionValidator(QRegularExpression(r'-?[0-9]{0,12}(\.[0-9]{0,12})?'))
+            )
+            self._threshold_lines[field] = line
+
         # section of buttons
         self._buttons_layout = QHBoxLayout()
         self._buttons_layout.setContentsMargins(QMargins(10, 0, 10, 0))
@@ -109,7 +133,7 @@ class SensorCreateEditWidget(QWidget):
         self._save_button = QPushButton("Save")
         self._save_button.clicked.connect(self._save)
         self._cancel_button = QPushButton("Cancel")
-        self._cancel_button.clicked.connect(self._return_to_configuration)
+        self._cancel_button.clicked.connect(self._cancel)
 
         self._buttons_layout.addWidget(self._save_button)
 
@@ -126,6 +150,11 @@ class SensorCreateEditWidget(QWidget):
         self._form_layout.addRow("Name:", self._name_line)
         self._form_layout.addRow("Physical Value:", self._physical_value_line)
         self._form_layout.addRow("Physical Unit:", self._physical_unit_line)
+        self._form_layout.addRow("Expression:", self._expression_line)
+        self._form_layout.addRow("Low Threshold:", self._threshold_lines["low_threshold"])
+        self._form_layout.addRow("High Threshold:", self._threshold_lines["high_threshold"])
+        self._form_layout.addRow("Rate Limit, 1/s:", self._threshold_lines["rate_limit"])
+        self._form_layout.addRow("Hysteresis:", self._threshold_lines["hysteresis"])
         self._layout.addLayout(self._form_layout)
 
         self._layout.addStretch(1)  # move buttons to the bottom
@@ -168,6 +197,7 @@ class SensorCreateEditWidget(QWidget):
         name = self._name_line.text()
         physical_value = self._physical_value_line.currentText()
         physical_unit = self._physical_unit_line.currentText()
+        expression = self._expression_line.text().strip() or None
 
         if physical_value == "-":
             physical_value = ""
@@ -180,9 +210,12 @@ class SensorCreateEditWidget(QWidget):
         # check if data is valid
         validation_passed = False
         try:
+            thresholds = {field: self._read_number(line) for field, line in self._threshold_lines.items()}
+            Sensor.validate_thresholds(**thresholds)
+            Sensor.validate_dependents(self._db_session, self._sensor, short_name, expression)
             validation_passed = Sensor.validate(self._sensor.configuration, short_name, name, physical_value,
                                                 physical_unit, check_for_duplicates=check_for_duplicates,
-                                                db_session=self._db_session)
+                                                db_session=self._db_session, expression=expression)
         except ValueError as error:
             # show error message
             QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok,
@@ -194,6 +227,12 @@ class SensorCreateEditWidget(QWidget):
             self._sensor.name = name
             self._sensor.physical_value = physical_value
             self._sensor.physical_unit = physical_unit
+            self._sensor.expression = expression
+            for field, value in thresholds.items():
+                setattr(self._sensor, field, value)
+
+            self._transaction.commit()
+            layout_cache.invalidate(self._sensor.configuration.id)
 
             # show success message
             if self._edit_mode:
@@ -205,11 +244,30 @@ class SensorCreateEditWidget(QWidget):
             # redirect to configuration
             self._return_to_configuration()
 
+    @staticmethod
+    def _read_number(line):
+        """Get number from a line or None if it is empty.
+        throws ValueError if the text is not a number
+        """
+        text = line.text()
+        if not text:
+            return None
+        try:
+            return float(text)
+        except ValueError:
+            raise ValueError("Thresholds should be numbers!")
+
+    def _cancel(self):
+        """Revert changes and open back the configuration page."""
+        self._transaction.rollback()
+
+        self._return_to_configuration()
+
     def _return_to_configuration(self):
         """Open back the configuration creation/editing/view page."""
         if self._configuration_page == "edit":
-            self.parentWidget().edit_configuration(self._sensor.configuration)
+            self.parentWidget().edit_configuration(self._configuration)
         elif self._configuration_page == "create":
-            self.parentWidget().create_configuration(self._sensor.configuration)
+            self.parentWidget().create_configuration(self._configuration)
         else:
-            self.parentWidget().view_configuration(self._sensor.configuration)
+            self.parentWidget().view_configuration(self._configuration)
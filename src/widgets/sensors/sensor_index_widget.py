@@ -1,9 +1,11 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLineEdit, \
-    QLabel, QHBoxLayout, QPushButton, QMessageBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QHBoxLayout, QPushButton, \
+    QMessageBox
 
+from src.models.limits import configuration_limits
 from src.models.models import Sensor
+from src.widgets.search_list_view import SearchListView
 
 
 class SensorIndexWidget(QWidget):
@@ -39,21 +41,13 @@ class SensorIndexWidget(QWidget):
         self._search_line_edit.setPlaceholderText("Search")
         self._search_line_edit.textChanged.connect(self._search)
 
-        # create a list widget for sensors
-        self._sensors_list = QListWidget()
-        self._sensors_list.setAlternatingRowColors(True)
-
-        # get all configuration sensors from DB
-        all_sensors = self._db_session.query(Sensor).filter(
-            Sensor.configuration == self._configuration) \
-            .order_by(Sensor.short_name).all()
-
-        # add sensors to the list widget
-        for sensor in all_sensors:
-            QListWidgetItem(str(sensor), self._sensors_list)
+        # create a list of names of all configuration sensors from DB
+        sensor_names = [name for name, in self._db_session.query(Sensor.short_name)
+                        .filter(Sensor.configuration == self._configuration)]
+        self._sensors_list = SearchListView(sensor_names)
 
         # show selected sensor on double click
-        self._sensors_list.itemDoubleClicked.connect(self._show_list_item_sensor)
+        self._sensors_list.doubleClicked.connect(self._show_list_item_sensor)
 
         # section of buttons
         self._buttons_layout = QHBoxLayout()
@@ -80,37 +74,25 @@ class SensorIndexWidget(QWidget):
 
     def _search(self, search_string):
         """Filter sensors by the search string."""
-        # get sensors which name starts with
-        # the search_string from current configuration
-        search_string = "{}%".format(search_string)
-        filtered_sensors = self._db_session.query(Sensor) \
-            .filter(Sensor.configuration == self._configuration) \
-            .filter(Sensor.short_name.like(search_string)) \
-            .order_by(Sensor.short_name) \
-            .all()
-
-        # clear current list and fill it with filtered sensors
-        self._sensors_list.clear()
-        for sensor in filtered_sensors:
-            QListWidgetItem(str(sensor), self._sensors_list)
+        # show sensors which name starts with the search_string
+        self._sensors_list.search(search_string)
 
     def _show_selected_sensor(self):
         """Open view page for the selected sensor."""
-        # get selected items
-        selected_items = self._sensors_list.selectedItems()
-        if selected_items:
-            # show the first and only item
-            self._show_list_item_sensor(selected_items[0])
+        sensor_name = self._sensors_list.selected_name()
+        if sensor_name is not None:
+            self._show_sensor(sensor_name)
 
-    def _show_list_item_sensor(self, list_item):
-        """Open view page for the selected/clicked sensor."""
-        # get selected sensor short name
-        sensor_short_name = list_item.data(0)
+    def _show_list_item_sensor(self, list_index):
+        """Open view page for the clicked sensor."""
+        self._show_sensor(list_index.data())
 
+    def _show_sensor(self, sensor_name):
+        """Open view page for the sensor with the given name."""
         # find sensor in DB
         sensor = self._db_session.query(Sensor) \
             .where(Sensor.configuration == self._configuration) \
-            .where(Sensor.short_name == sensor_short_name) \
+            .where(Sensor.short_name == sensor_name) \
             .one_or_none()
 
         if sensor is not None:  # if sensor found
@@ -118,9 +100,11 @@ class SensorIndexWidget(QWidget):
 
     def _create_sensor(self):
         """Open a sensor creating page."""
-        sensors = self._db_session.query(Sensor).filter(Sensor.configuration == self._configuration).all()
-        if len(sensors) == 100:
-            QMessageBox.critical(self, "Error!", "Sensor limit of 100 sensors is reached for this configuration!",
+        sensor_limit = configuration_limits(self._configuration).sensors
+        sensor_count = self._db_session.query(Sensor).filter(Sensor.configuration == self._configuration).count()
+        if sensor_count >= sensor_limit:
+            QMessageBox.critical(self, "Error!",
+                                 f"Sensor limit of {sensor_limit} sensors is reached for this configuration!",
                                  QMessageBox.Ok, QMessageBox.Ok)
         else:
             self.parentWidget().parentWidget().create_sensor(self._configuration,
@@ -3,6 +3,10 @@ from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QMessageBox
 
+from src.models.layout import layout_cache
+from src.models.models import Sensor
+
+
 class SensorViewWidget(QWidget):
     """Widget for viewing a certain sensor."""
 
@@ -53,6 +57,19 @@ class SensorViewWidget(QWidget):
         self._physical_unit_line.setText(self._sensor.physical_unit)
         self._physical_unit_line.setReadOnly(True)
 
+        # create expression field display
+        self._expression_line = QLineEdit()
+        self._expression_line.setText(self._sensor.expression or "- (measured sensor)")
+        self._expression_line.setReadOnly(True)
+
+        # create alarm threshold field displays
+        self._threshold_lines = {}
+        for field in ("low_threshold", "high_threshold", "rate_limit", "hysteresis"):
+            value = getattr(self._sensor, field)
+            self._threshold_lines[field] = QLineEdit()
+            self._threshold_lines[field].setText("-" if value is None else f"{value:.12g}")
+            self._threshold_lines[field].setReadOnly(True)
+
         # section of buttons
         self._buttons_layout = QHBoxLayout()
         self._buttons_layout.setContentsMargins(10, 0, 10, 0)
@@ -82,6 +99,11 @@ class SensorViewWidget(QWidget):
         self._form_layout.addRow("Name:", self._name_line)
         self._form_layout.addRow("Physical Value:", self._physical_value_line)
         self._form_layout.addRow("Physical Unit:", self._physical_unit_line)
+        self._form_layout.addRow("Expression:", self._expression_line)
+        self._form_layout.addRow("Low Threshold:", self._threshold_lines["low_threshold"])
+        self._form_layout.addRow("High Threshold:", self._threshold_lines["high_threshold"])
+        self._form_layout.addRow("Rate Limit, 1/s:", self._threshold_lines["rate_limit"])
+        self._form_layout.addRow("Hysteresis:", self._threshold_lines["hysteresis"])
         self._layout.addLayout(self._form_layout)
 
         self._layout.addStretch(1)  # move buttons to the bottom
@@ -99,7 +121,15 @@ class SensorViewWidget(QWidget):
 
         # if confirmed, remove sensor and redirect to configuration
         if confirmation == QMessageBox.Yes:
+            # derived sensors cannot lose their inputs
+            try:
+                Sensor.validate_dependents(self._db_session, self._sensor)
+            except ValueError as error:
+                QMessageBox.critical(self, "Error!", str(error), QMessageBox.Ok, QMessageBox.Ok)
+                return
+
             self._db_session.delete(self._sensor)
+            layout_cache.invalidate(self._sensor.configuration.id)
 
             self._return_to_configuration()
 
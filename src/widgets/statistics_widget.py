@@ -0,0 +1,140 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QTimer
+from PySide6.QtWidgets import QWidget, QGridLayout, QTableView, QComboBox, QLabel, QHeaderView
+
+from src.data.statistics import window_name
+
+
+class StatisticsTableModel(QAbstractTableModel):
+    """Table model reading statistics of all sensors from the statistics engine."""
+
+    HEADERS = ("Sensor", "Count", "Minimum", "Maximum", "Mean", "Std. deviation", "Rate, 1/s")
+
+    def __init__(self, statistics):
+        """Create a model of the statistics engine."""
+        super().__init__()
+        self._statistics = statistics
+        self._sensors = []
+        self.window = 0
+
+    def refresh(self):
+        """Show current statistics, rows are reset only when sensors change."""
+        sensors = self._statistics.sensors()
+        if sensors != self._sensors:
+            self.beginResetModel()
+            self._sensors = sensors
+            self.endResetModel()
+        elif sensors:
+            self.dataChanged.emit(self.index(0, 1), self.index(len(sensors) - 1, len(self.HEADERS) - 1))
+
+    def set_window(self, window):
+        """Show statistics of a window."""
+        self.window = window
+        self.refresh()
+
+    def rowCount(self, parent=None):
+        """Get number of sensors."""
+        return 0 if parent is not None and parent.isValid() else len(self._sensors)
+
+    def columnCount(self, parent=None):
+        """Get number of columns."""
+        return 0 if parent is not None and parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Get column titles."""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Get a statistic as text for display or as a number for sorting."""
+        if role not in (Qt.DisplayRole, Qt.UserRole) or not index.isValid():
+            return None
+
+        sensor = self._sensors[index.row()]
+        if index.column() == 0:
+            return sensor
+
+        statistics = self._statistics.get(sensor, self.window)
+        if statistics.count == 0:
+            values = (0, None, None, None, None, 0.0)
+        else:
+            values = (statistics.count, statistics.minimum, statistics.maximum,
+                      statistics.mean, statistics.std, statistics.rate)
+        value = values[index.column() - 1]
+
+        if role == Qt.UserRole:
+            return value if value is not None else float("-inf")
+        if value is None:
+            return "-"
+        if isinstance(value, int):
+            return str(value)
+        return f"{value:.4g}"
+
+
+class StatisticsWidget(QWidget):
+    """Window with a sortable table of sensor statistics."""
+
+    # interval between table updates in milliseconds
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self, statistics):
+        """Create statistics window."""
+        super().__init__()
+        self._statistics = statistics
+
+        # set window title and size
+        self.setWindowTitle("Statistics")
+        self.resize(800, 600)
+
+        self._init_ui()
+
+        # statistics are refreshed only while the window is shown
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self._model.refresh)
+
+    def _init_ui(self):
+        """Initialize UI."""
+        self.grid_layout = QGridLayout(self)
+
+        self.grid_layout.addWidget(QLabel("Window:"), 0, 0, 1, 1)
+        self._window_combo_box = QComboBox()
+        for window in self._statistics.windows:
+            self._window_combo_box.addItem(window_name(window), window)
+        self._window_combo_box.currentIndexChanged.connect(self._update_window)
+        self.grid_layout.addWidget(self._window_combo_box, 0, 1, 1, 1)
+        self.grid_layout.setColumnStretch(2, 1)
+
+        self._model = StatisticsTableModel(self._statistics)
+
+        # sort by numbers, not by their text
+        self._proxy_model = QSortFilterProxyModel()
+        self._proxy_model.setSourceModel(self._model)
+        self._proxy_model.setSortRole(Qt.UserRole)
+
+        self._table = QTableView()
+        self._table.setModel(self._proxy_model)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(0, Qt.AscendingOrder)
+        self._table.setAlternatingRowColors(True)
+        self._table.verticalHeader().hide()
+        self._table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.grid_layout.addWidget(self._table, 1, 0, 1, 3)
+
+    def _update_window(self):
+        """Show statistics of the selected window."""
+        self._model.set_window(self._window_combo_box.currentData())
+
+    def clear(self):
+        """Remove statistics of the previous session from the table."""
+        self._model.refresh()
+
+    def showEvent(self, event):
+        """Start refreshing statistics when the window is shown."""
+        super().showEvent(event)
+        self._model.refresh()
+        self._refresh_timer.start(self.REFRESH_INTERVAL)
+
+    def hideEvent(self, event):
+        """Stop refreshing statistics when the window is hidden."""
+        super().hideEvent(event)
+        self._refresh_timer.stop()
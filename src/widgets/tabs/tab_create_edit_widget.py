@@ -3,7 +3,9 @@ from PySide6.QtGui import QFont, QRegularExpressionValidator
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QComboBox, QMessageBox
 
-from src.models.models import Tab, Cell, SensorCell
+from src.models.layout import layout_cache
+from src.models.limits import configuration_limits
+from src.models.models import Tab
 from src.widgets.cells.cell_grid_management_widget import CellGridManagementWidget
 from src.widgets.cells.cell_grid_view_widget import CellGridViewWidget
 
@@ -19,18 +21,24 @@ class TabCreateEditWidget(QWidget):
         # from what page this page was open (where to return later)
         self._configuration_page = configuration_page
 
+        # all changes are made in a savepoint,
+        # which is released on saving and rolled back on cancelling
+        self._transaction = self._db_session.begin_nested()
+
         # define if tab is being created or edited
         if tab:
             self._tab = tab
             self._configuration = tab.configuration
             self._edit_mode = True
-            self._create_backup()
         else:
             # create a new tab to edit it later
             self._tab = Tab(configuration=configuration, name="", grid_width=2, grid_height=5)
             self._configuration = configuration
             self._edit_mode = False
 
+        # grid size depends on the rendering mode of the configuration
+        self._limits = configuration_limits(self._configuration)
+
         self._init_ui()  # initialize UI
 
     def _init_ui(self):
@@ -66,14 +74,14 @@ class TabCreateEditWidget(QWidget):
 
         # if a new tab is created, set grid to default
         if not self._edit_mode:
-            self._resize(0, 0, 2, 5)
+            self._resize(2, 5)
 
         # create grid width field display
         self._grid_width_line = QComboBox()
 
-        # fill it with width from 1 to 10
+        # fill it with width from 1 to the limit of the configuration
         self._grid_width_line.addItems(
-            [str(number) for number in range(1, 11)]
+            [str(number) for number in range(1, self._limits.grid_width + 1)]
         )
         self._grid_width_line.setCurrentText(str(self._tab.grid_width))
 
@@ -84,9 +92,9 @@ class TabCreateEditWidget(QWidget):
         # create grid height field display
         self._grid_height_line = QComboBox()
 
-        # fill it with height from 1 to 20
+        # fill it with height from 1 to the limit of the configuration
         self._grid_height_line.addItems(
-            [str(number) for number in range(1, 21)]
+            [str(number) for number in range(1, self._limits.grid_height + 1)]
         )
 
         self._grid_height_line.setCurrentText(str(self._tab.grid_height))
@@ -138,8 +146,8 @@ class TabCreateEditWidget(QWidget):
         self._grid_height_line.currentTextChanged.disconnect(self._update_height)
         self._grid_height_line.clear()  # clear all units
 
-        # maximal cell count per tab is 100 and maximal height is 20
-        maximal_height = min(20, 100 // width)
+        # cell count and height of a tab are limited
+        maximal_height = min(self._limits.grid_height, self._limits.cells // width)
 
         # add height values for chosen width
         self._grid_height_line.addItems(
@@ -157,94 +165,26 @@ class TabCreateEditWidget(QWidget):
         self._grid_height_line.currentTextChanged.connect(self._update_height)
 
         # resize grid
-        self._resize(self._tab.grid_width, self._tab.grid_height, width, self._tab.grid_height)
+        self._resize(width, self._tab.grid_height)
 
     def _update_height(self):
         """Resize the grid on height change."""
         # get chosen value
         height = int(self._grid_height_line.currentText())
 
-        self._resize(self._tab.grid_width, self._tab.grid_height, self._tab.grid_width,
-                     height)  # resize the grid
+        self._resize(self._tab.grid_width, height)  # resize the grid
 
-    def _resize(self, old_width, old_height, new_width, new_height):
+    def _resize(self, new_width, new_height):
         """Resize the grid.
-        Resize the grid by deleting old cells if new height
-        or new width are smaller than the old ones. Create new
-        cells if new width or new height are greater than the old ones.
-        If resizing splits a cell in half -
-        split this cell into atomic cells.
+        Cells outside of the new grid size are deleted, cells split
+        in half by the new border are split into atomic cells and
+        the new space is filled with atomic cells.
         """
-        def split_cell(cell):
-            """Split cell into atomic cells."""
-            # create all others atomic cells
-            for row in range(cell.row, cell.row + cell.rowspan):
-                for column in range(cell.column, cell.column + cell.colspan):
-                    if row != cell.row or column != cell.column:
-                        # create an atomic cell
-                        Cell(tab=self._tab, row=row, column=column)
-
-            # set upper left cell's rowspan and colspan to 1
-            cell.rowspan = 1
-            cell.colspan = 1
-
-        cells = self._db_session.query(Cell).filter(Cell.tab == self._tab).all()
-        for cell in cells:
-            if cell.row < new_height < cell.row + cell.rowspan \
-                    or cell.column < new_width < cell.column + cell.colspan:
-                split_cell(cell)
-
-        # delete cells that are beyond new grid size
-        self._db_session.query(Cell).filter(Cell.tab == self._tab) \
-            .filter(Cell.column >= new_width).delete(synchronize_session=False)
-
-        self._db_session.query(Cell).filter(Cell.tab == self._tab) \
-            .filter(Cell.row >= new_height).delete(synchronize_session=False)
-
-        # create new cells to fill grid up to the new size
-        for column in range(old_width, new_width):
-            for row in range(new_height):
-                Cell(tab=self._tab, row=row, column=column)
-
-        for row in range(old_height, new_height):
-            for column in range(min(new_width, old_width)):
-                Cell(tab=self._tab, row=row, column=column)
+        self._grid.resize(new_width, new_height)
 
         # update the tab data
         self._tab.grid_width = new_width
         self._tab.grid_height = new_height
-        self._grid.update_grid()
-
-    def _create_backup(self):
-        """Create a backup for reverting changes later if needed."""
-        # create a backup tab
-        self._backup_tab = Tab(configuration=self._configuration, name="",
-                               grid_width=self._tab.grid_width,
-                               grid_height=self._tab.grid_height)
-
-        # get all the cells of the tab and create their backups
-        cells = self._db_session.query(Cell).filter(Cell.tab == self._tab).all()
-        for cell in cells:
-            Cell(tab=self._backup_tab, row=cell.row, column=cell.column, rowspan=cell.rowspan,
-                 colspan=cell.colspan,
-                 title=cell.title)
-
-        # get all the sensor-cell records and create their backups
-        sensor_cells = self._db_session.query(SensorCell) \
-            .join(Cell) \
-            .filter(Cell.tab == self._tab) \
-            .all()
-
-        for sensor_cell in sensor_cells:
-            # find the backup of the cell
-            cell = self._db_session.query(Cell) \
-                .filter(Cell.tab == self._backup_tab) \
-                .filter(Cell.row == sensor_cell.cell.row) \
-                .filter(Cell.column == sensor_cell.cell.column) \
-                .one_or_none()
-
-            if cell:
-                SensorCell(cell=cell, sensor=sensor_cell.sensor)
 
     def _save(self):
         """Save tab from data in the form."""
@@ -274,9 +214,8 @@ class TabCreateEditWidget(QWidget):
             self._tab.grid_width = grid_width
             self._tab.grid_height = grid_height
 
-            # remove the backup tab if in editing mode
-            if self._edit_mode:
-                self._db_session.delete(self._backup_tab)
+            self._transaction.commit()
+            layout_cache.invalidate(self._configuration.id)
 
             # set message according to selected mode (create or edit)
             if self._edit_mode:
@@ -295,12 +234,7 @@ class TabCreateEditWidget(QWidget):
         """Revert changes and open back
         the configurations creation/editing page."""
         # revert changes
-        if self._edit_mode:
-            tab_name = self._tab.name
-            self._db_session.delete(self._tab)
-            self._backup_tab.name = tab_name
-        else:
-            self._db_session.delete(self._tab)  # remove created tab
+        self._transaction.rollback()
 
         self._return_to_configuration()
 
@@ -1,9 +1,10 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLineEdit, \
-    QLabel, QHBoxLayout, QPushButton, QMessageBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QLabel, QHBoxLayout, QPushButton, \
+    QMessageBox
 
 from src.models.models import Tab
+from src.widgets.search_list_view import SearchListView
 
 
 class TabIndexWidget(QWidget):
@@ -39,20 +40,13 @@ class TabIndexWidget(QWidget):
         self._search_line_edit.setPlaceholderText("Search")
         self._search_line_edit.textChanged.connect(self._search)
 
-        # create a list widget for tabs
-        self._tabs_list = QListWidget()
-        self._tabs_list.setAlternatingRowColors(True)
-
-        # get all configurations tabs from DB
-        all_tabs = self._db_session.query(Tab).filter(
-            Tab.configuration == self._configuration).order_by(Tab.name).all()
-
-        # add tabs to the list widget
-        for tab in all_tabs:
-            QListWidgetItem(str(tab), self._tabs_list)
+        # create a list of names of all configurations tabs from DB
+        tab_names = [name for name, in self._db_session.query(Tab.name)
+                     .filter(Tab.configuration == self._configuration)]
+        self._tabs_list = SearchListView(tab_names)
 
         # show selected tab on double click
-        self._tabs_list.itemDoubleClicked.connect(self._show_list_item_tab)
+        self._tabs_list.doubleClicked.connect(self._show_list_item_tab)
 
         # section of buttons
         self._buttons_layout = QHBoxLayout()
@@ -79,32 +73,21 @@ class TabIndexWidget(QWidget):
 
     def _search(self, search_string):
         """Filter tab by the search string."""
-        # get tabs which name starts with the
-        # search_string from current configurations
-        search_string = "{}%".format(search_string)
-        filtered_tabs = self._db_session.query(Tab) \
-            .filter(Tab.configuration == self._configuration) \
-            .filter(Tab.name.like(search_string)) \
-            .order_by(Tab.name) \
-            .all()
-
-        # clear current list and fill it with filtered tabs
-        self._tabs_list.clear()
-        for tab in filtered_tabs:
-            QListWidgetItem(str(tab), self._tabs_list)
+        # show tabs which name starts with the search_string
+        self._tabs_list.search(search_string)
 
     def _show_selected_tab(self):
         """Open view page for the selected tab."""
-        # get selected items
-        selected_items = self._tabs_list.selectedItems()
-        if selected_items:
-            # show the first and only item
-            self._show_list_item_tab(selected_items[0])
+        tab_name = self._tabs_list.selected_name()
+        if tab_name is not None:
+            self._show_tab(tab_name)
 
-    def _show_list_item_tab(self, list_item):
-        """Open view page for the selected/clicked tab."""
-        tab_name = list_item.data(0)  # get selected tab short name
+    def _show_list_item_tab(self, list_index):
+        """Open view page for the clicked tab."""
+        self._show_tab(list_index.data())
 
+    def _show_tab(self, tab_name):
+        """Open view page for the tab with the given name."""
         # find tab in DB
         tab = self._db_session.query(Tab) \
             .where(Tab.configuration == self._configuration) \
@@ -3,6 +3,7 @@ from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QWidget, QLabel, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, \
     QVBoxLayout, QMessageBox
 
+from src.models.layout import layout_cache
 from src.widgets.cells.cell_grid_view_widget import CellGridViewWidget
 
 
@@ -97,6 +98,7 @@ class TabViewWidget(QWidget):
         # if confirmed, remove sensor and redirect to configurations
         if confirmation == QMessageBox.Yes:
             self._db_session.delete(self._tab)
+            layout_cache.invalidate(self._tab.configuration.id)
 
             self._return_to_configuration()
 